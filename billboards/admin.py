@@ -1,6 +1,45 @@
 from django.contrib import admin
 from django.utils import timezone
-from .models import Billboard, Wishlist, Lead, View, OohMediaType, OohMediaTypeAttribute
+from core.exports import FORMAT_CSV, streaming_export
+from .models import (
+    Billboard, BillboardImportJob, SavedSearch, Wishlist, Lead, View, OohMediaType, OohMediaTypeAttribute,
+)
+
+def _apply_tracking_retention(modeladmin, request, table, label):
+    """Admin action body: the same retention the daily task applies, refused while it is off."""
+    from django.conf import settings
+    from django.contrib import messages
+    from django.db import connection
+    from .partitions import RETENTION_DETACH, RETENTION_OFF, apply_partition_retention, is_partitioned, retention_mode
+
+    mode = retention_mode()
+    if mode == RETENTION_OFF:
+        modeladmin.message_user(
+            request,
+            f'Retention is off (TRACKING_PARTITION_RETENTION); no {label}s were removed. '
+            f'Unique view/lead counting relies on the full history.',
+            level=messages.ERROR,
+        )
+        return
+    if not is_partitioned(connection, table):
+        modeladmin.message_user(
+            request, f'{table} is not partitioned; retention only removes whole partitions.', level=messages.WARNING,
+        )
+        return
+
+    handled = apply_partition_retention(tables=[table])
+    action = 'Detached' if mode == RETENTION_DETACH else 'Dropped'
+    modeladmin.message_user(
+        request,
+        f'{action} {len(handled)} {label} partitions older than {settings.TRACKING_RETENTION_MONTHS} months '
+        f'(whole table; the selection is not used).',
+    )
+
+
+_ADMIN_INTERACTION_EXPORT_COLUMNS = [
+    ('id', 'ID'), ('billboard__city', 'Billboard City'), ('billboard__company_name', 'Billboard Company'),
+    ('user_ip', 'User IP'), ('created_at', 'Created At'),
+]
 
 
 class OohMediaTypeAttributeInline(admin.TabularInline):
@@ -169,6 +208,36 @@ class BillboardAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('user', 'media_type')
 
 
+@admin.register(BillboardImportJob)
+class BillboardImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'owner', 'original_filename', 'file_format', 'status',
+        'processed_rows', 'created_count', 'error_count', 'created_at',
+    )
+    list_filter = ('status', 'file_format', 'created_at')
+    search_fields = ('owner__email', 'original_filename')
+    readonly_fields = (
+        'owner', 'file', 'original_filename', 'file_format', 'status', 'processed_rows',
+        'created_count', 'error_count', 'errors', 'message', 'created_at', 'started_at', 'finished_at',
+    )
+    list_per_page = 25
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('owner')
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'name', 'media_type', 'board_type', 'radius_km', 'notify', 'last_notified_at', 'created_at')
+    list_filter = ('notify', 'created_at')
+    search_fields = ('user__email', 'name')
+    readonly_fields = ('area', 'last_notified_at', 'created_at')
+    list_per_page = 25
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'media_type')
+
+
 @admin.register(Wishlist)
 class WishlistAdmin(admin.ModelAdmin):
     list_display = ('id', 'user_email', 'billboard_city', 'billboard_type', 'created_at')
@@ -239,41 +308,14 @@ class LeadAdmin(admin.ModelAdmin):
     actions = ['export_leads_csv', 'delete_old_leads']
     
     def export_leads_csv(self, request, queryset):
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="leads_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Billboard City', 'Billboard Company', 'User IP', 'Created At'
-        ])
-        
-        for lead in queryset.select_related('billboard'):
-            writer.writerow([
-                lead.id,
-                lead.billboard.city,
-                lead.billboard.company_name,
-                lead.user_ip,
-                lead.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
+        return streaming_export(
+            queryset.order_by('id'), _ADMIN_INTERACTION_EXPORT_COLUMNS, FORMAT_CSV, 'leads_export'
+        )
     export_leads_csv.short_description = "Export selected leads to CSV"
     
     def delete_old_leads(self, request, queryset):
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        # Delete leads older than 90 days
-        cutoff_date = timezone.now() - timedelta(days=90)
-        old_leads = queryset.filter(created_at__lt=cutoff_date)
-        count = old_leads.count()
-        old_leads.delete()
-        
-        self.message_user(request, f'{count} leads older than 90 days have been deleted.')
-    delete_old_leads.short_description = "Delete leads older than 90 days"
+        _apply_tracking_retention(self, request, 'billboards_lead', 'lead')
+    delete_old_leads.short_description = "Apply partition retention to all leads (ignores selection)"
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('billboard')
@@ -321,41 +363,14 @@ class ViewAdmin(admin.ModelAdmin):
     actions = ['export_views_csv', 'delete_old_views']
     
     def export_views_csv(self, request, queryset):
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="views_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Billboard City', 'Billboard Company', 'User IP', 'Created At'
-        ])
-        
-        for view in queryset.select_related('billboard'):
-            writer.writerow([
-                view.id,
-                view.billboard.city,
-                view.billboard.company_name,
-                view.user_ip,
-                view.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
+        return streaming_export(
+            queryset.order_by('id'), _ADMIN_INTERACTION_EXPORT_COLUMNS, FORMAT_CSV, 'views_export'
+        )
     export_views_csv.short_description = "Export selected views to CSV"
     
     def delete_old_views(self, request, queryset):
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        # Delete views older than 90 days
-        cutoff_date = timezone.now() - timedelta(days=90)
-        old_views = queryset.filter(created_at__lt=cutoff_date)
-        count = old_views.count()
-        old_views.delete()
-        
-        self.message_user(request, f'{count} views older than 90 days have been deleted.')
-    delete_old_views.short_description = "Delete views older than 90 days"
+        _apply_tracking_retention(self, request, 'billboards_view', 'view')
+    delete_old_views.short_description = "Apply partition retention to all views (ignores selection)"
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('billboard')
\ No newline at end of file
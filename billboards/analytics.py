@@ -0,0 +1,229 @@
+"""
+Time-bucketed analytics rollups for views, leads and wishlist adds.
+
+A beat-scheduled Celery task folds new raw `View` / `Lead` / `Wishlist` rows into
+`BillboardStatsHourly` and `BillboardStatsDaily`. Each source keeps a
+`created_at` high-water mark in `AnalyticsRollupCursor`, so every run only
+range-scans the `created_at` index for rows it has not counted yet. The owner
+analytics endpoint reads the rollup tables only.
+
+Hourly buckets are UTC hours; a daily bucket is the TIME_ZONE date of its hours
+(exact for whole-hour UTC offsets). Changing TIME_ZONE needs a rebuild of
+BillboardStatsDaily.
+
+A row can commit after the cursor has passed its `created_at` (long
+transactions, buffered tracking events stamped with their event time). Each
+window therefore recounts whole hours from ROLLUP_RESCAN behind the cursor and
+adds only what the hourly rows do not have yet; rows later than that are lost.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import (
+    AnalyticsRollupCursor,
+    BillboardStatsDaily,
+    BillboardStatsHourly,
+    Lead,
+    View,
+    Wishlist,
+)
+
+logger = logging.getLogger(__name__)
+
+# source -> (raw model, rollup counter field)
+ROLLUP_SOURCES = {
+    'view': (View, 'views'),
+    'lead': (Lead, 'leads'),
+    'wishlist': (Wishlist, 'wishlists'),
+}
+ROLLUP_FIELDS = ('views', 'leads', 'wishlists')
+
+# Rows younger than this are left for the next run so in-flight transactions
+# (and the tracking buffer drain) have committed before we move the cursor.
+ROLLUP_LAG = timedelta(minutes=2)
+# Upper bound on the created_at span scanned per source per window.
+ROLLUP_WINDOW = timedelta(hours=6)
+# How far behind the cursor each window recounts, for rows that committed late.
+ROLLUP_RESCAN = timedelta(hours=1)
+ROLLUP_MAX_WINDOWS = 8
+HOURLY_RETENTION_DAYS = 90
+
+GRANULARITY_HOUR = 'hour'
+GRANULARITY_DAY = 'day'
+MAX_HOURLY_RANGE_DAYS = 31
+MAX_DAILY_RANGE_DAYS = 366
+
+
+def _merge_counts(model, key_field, field, counts):
+    """Add `counts` ({(billboard_id, key): n}) onto `field` of existing rollup rows."""
+    if not counts:
+        return
+    billboard_ids = {billboard_id for billboard_id, _ in counts}
+    keys = {key for _, key in counts}
+    existing = {
+        (row.billboard_id, getattr(row, key_field)): row
+        for row in model.objects.filter(
+            billboard_id__in=billboard_ids, **{f'{key_field}__in': keys}
+        )
+    }
+    to_update = []
+    to_create = []
+    for (billboard_id, key), n in counts.items():
+        row = existing.get((billboard_id, key))
+        if row is not None:
+            setattr(row, field, getattr(row, field) + n)
+            to_update.append(row)
+        else:
+            to_create.append(model(billboard_id=billboard_id, **{key_field: key, field: n}))
+    if to_update:
+        model.objects.bulk_update(to_update, [field], batch_size=500)
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=500)
+
+
+def _hour_start(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _rollup_window(source, cursor, now):
+    """Fold one window of raw rows for `source`; returns the number of raw rows counted."""
+    raw_model, field = ROLLUP_SOURCES[source]
+    start = cursor.last_created_at
+    if start is None:
+        first = raw_model.objects.aggregate(first=Min('created_at'))['first']
+        if first is None:
+            return 0
+        start = first - timedelta(microseconds=1)
+
+    end = min(start + ROLLUP_WINDOW, now - ROLLUP_LAG)
+    if end <= start:
+        return 0
+
+    # Whole UTC hours, so each recounted hour compares like for like with its rollup row.
+    rescan_from = _hour_start((start - ROLLUP_RESCAN).astimezone(dt_timezone.utc))
+    rows = list(
+        raw_model.objects.filter(created_at__gte=rescan_from, created_at__lte=end)
+        .annotate(bucket=TruncHour('created_at', tzinfo=dt_timezone.utc))
+        .values('billboard_id', 'bucket')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    counted = {
+        (stat.billboard_id, stat.bucket): getattr(stat, field)
+        for stat in BillboardStatsHourly.objects.filter(
+            billboard_id__in={row['billboard_id'] for row in rows},
+            bucket__gte=rescan_from,
+            bucket__lte=end,
+        ).only('billboard_id', 'bucket', field)
+    } if rows else {}
+    hourly = {}
+    daily = defaultdict(int)
+    total = 0
+    for row in rows:
+        key = (row['billboard_id'], row['bucket'])
+        # Only additions: rows deleted since (un-wishlisted) keep their count.
+        added = row['n'] - counted.get(key, 0)
+        if added <= 0:
+            continue
+        hourly[key] = added
+        daily[(row['billboard_id'], timezone.localtime(row['bucket']).date())] += added
+        total += added
+
+    _merge_counts(BillboardStatsHourly, 'bucket', field, hourly)
+    _merge_counts(BillboardStatsDaily, 'day', field, daily)
+
+    cursor.last_created_at = end
+    cursor.save(update_fields=['last_created_at', 'updated_at'])
+    return total
+
+
+def rollup_billboard_analytics(max_windows=ROLLUP_MAX_WINDOWS):
+    """
+    Advance every source cursor by up to `max_windows` windows.
+
+    All cursor rows are locked for the duration, so concurrent runs serialize
+    instead of double-counting. Returns {source: raw rows counted}.
+    """
+    for source in ROLLUP_SOURCES:
+        AnalyticsRollupCursor.objects.get_or_create(source=source)
+
+    processed = {}
+    with transaction.atomic():
+        cursors = {
+            cursor.source: cursor
+            for cursor in AnalyticsRollupCursor.objects.select_for_update().filter(
+                source__in=list(ROLLUP_SOURCES)
+            ).order_by('source')
+        }
+        now = timezone.now()
+        for source in ROLLUP_SOURCES:
+            cursor = cursors[source]
+            counted = 0
+            for _ in range(max_windows):
+                before = cursor.last_created_at
+                counted += _rollup_window(source, cursor, now)
+                if cursor.last_created_at == before or cursor.last_created_at >= now - ROLLUP_LAG:
+                    break
+            processed[source] = counted
+
+        cutoff = now - timedelta(days=HOURLY_RETENTION_DAYS)
+        BillboardStatsHourly.objects.filter(bucket__lt=cutoff).delete()
+    return processed
+
+
+def rolled_up_until():
+    """Oldest source cursor — the point up to which every rollup counter is complete."""
+    return AnalyticsRollupCursor.objects.filter(
+        source__in=list(ROLLUP_SOURCES)
+    ).aggregate(until=Min('last_created_at'))['until']
+
+
+def _period(value):
+    """Dates as-is; hour buckets in TIME_ZONE (with offset), matching the daily buckets."""
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat()
+    return value.isoformat()
+
+
+def get_owner_analytics(owner, from_date, to_date, granularity, billboard_id=None):
+    """
+    Series + totals for an owner's billboards between two TIME_ZONE dates
+    (inclusive), read from the rollup tables only.
+    """
+    if granularity == GRANULARITY_HOUR:
+        queryset = BillboardStatsHourly.objects.filter(
+            billboard__user=owner,
+            bucket__gte=timezone.make_aware(datetime.combine(from_date, time.min)),
+            bucket__lt=timezone.make_aware(datetime.combine(to_date + timedelta(days=1), time.min)),
+        )
+        key_field = 'bucket'
+    else:
+        queryset = BillboardStatsDaily.objects.filter(
+            billboard__user=owner,
+            day__gte=from_date,
+            day__lte=to_date,
+        )
+        key_field = 'day'
+    if billboard_id is not None:
+        queryset = queryset.filter(billboard_id=billboard_id)
+
+    sums = {f'sum_{f}': Sum(f) for f in ROLLUP_FIELDS}
+    series = [
+        {
+            'period': _period(row[key_field]),
+            **{f: row[f'sum_{f}'] or 0 for f in ROLLUP_FIELDS},
+        }
+        for row in queryset.values(key_field).annotate(**sums).order_by(key_field)
+    ]
+    totals = {f: sum(point[f] for point in series) for f in ROLLUP_FIELDS}
+    totals['lead_rate'] = round(totals['leads'] / totals['views'], 4) if totals['views'] else 0.0
+    return series, totals
@@ -1,8 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 
+from django.db.models import Exists, OuterRef, Q
+
 DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
 
+# Upper bound for "free between dates" searches (owner blocks are matched per day).
+MAX_AVAILABILITY_WINDOW_DAYS = 366
+
 
 def parse_date_param(value):
     if not value:
@@ -46,6 +51,48 @@ def filter_booked_dates(booked_dates, from_date=None, to_date=None):
     return dates
 
 
+def iter_date_strings(from_date, to_date):
+    """Yield YYYY-MM-DD strings for every day in [from_date, to_date] (date objects)."""
+    day = from_date
+    while day <= to_date:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+# Query parameters of the availability filter. Responses using them are not cached:
+# bookings change availability without bumping the map cache version.
+AVAILABILITY_PARAMS = ('available_from', 'available_to')
+
+
+def has_availability_filter(params):
+    return any(params.get(name) for name in AVAILABILITY_PARAMS)
+
+
+def apply_availability_filter(queryset, from_date, to_date):
+    """
+    Keep only billboards free on every day in [from_date, to_date].
+
+    Blocking bookings are excluded with one NOT EXISTS anti-join served by the
+    (billboard, status, start_date, end_date) index; owner day blocks use a
+    jsonb `?|` match against `unavailable_dates`. Pending requests past their
+    expiry no longer block, even before the lifecycle sweep cancels them.
+    """
+    from bookings.models import Booking
+    from bookings.services import effective_status_q
+
+    blocking_bookings = Booking.objects.filter(
+        billboard_id=OuterRef('pk'),
+        status__in=Booking.BLOCKING_STATUSES,
+        start_date__lte=to_date,
+        end_date__gte=from_date,
+    ).exclude(effective_status_q(Booking.STATUS_CANCELLED))
+    days = list(iter_date_strings(from_date, to_date))
+    return queryset.filter(
+        ~Exists(blocking_bookings),
+        ~Q(unavailable_dates__has_any_keys=days),
+    )
+
+
 def build_availability_payload(billboard, from_date=None, to_date=None):
     booked_dates = filter_booked_dates(
         billboard.unavailable_dates or [],
@@ -0,0 +1,505 @@
+"""
+Streaming bulk billboard import (CSV / XLSX / NDJSON) for media owners.
+
+`POST /api/billboards/import/` stores the upload as a BillboardImportJob and
+queues `import_billboards_task`. The task streams rows from the file (never
+loading it whole), validates each row with BillboardImportRowSerializer using
+per-job media type / spec attribute caches, fetches remote images for a chunk
+concurrently, and bulk_creates the chunk. Progress and per-row errors are
+written to the job after every chunk; poll `GET /api/billboards/import/{id}/`.
+A job still RUNNING IMPORT_JOB_STALE_AFTER after it started lost its worker
+(crash, OOM kill, deploy) and is marked failed by `fail_stale_import_jobs`, run
+from beat and whenever jobs are fetched.
+
+Row columns are the billboard create fields (`city`, `type`, `media_type_id` or
+`ooh_media_type`, `latitude`, `longitude`, …). Specifications are a JSON
+`specifications` column and/or `spec.<key>` columns; `images` is a JSON list
+or `|`-separated URLs.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import ipaddress
+import json
+import logging
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urljoin, urlparse
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .geo_utils import sync_billboard_locations
+from .media_store import acquire_blobs, blob_names_from_urls, release_blobs, store_blob
+from .models import Billboard, BillboardImportJob, OohMediaType
+from .numeric_utils import sync_billboard_numbers
+from .serializers import BillboardImportRowSerializer
+from .signals import increment_cache_version
+from .similar import cells_around, mark_cells
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 200
+MAX_IMPORT_ROWS = 10_000
+MAX_IMPORT_FILE_BYTES = 25 * 1024 * 1024
+MAX_REPORTED_ERRORS = 500
+MAX_IMAGES_PER_ROW = 10
+# Far above a full 10,000-row run; a RUNNING job older than this has no worker left.
+IMPORT_JOB_STALE_AFTER = timedelta(hours=2)
+
+IMAGE_FETCH_WORKERS = 8
+IMAGE_FETCH_TIMEOUT = 15
+MAX_IMAGE_REDIRECTS = 3
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+IMAGE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+SPEC_COLUMN_PREFIX = 'spec.'
+FORMAT_EXTENSIONS = {
+    '.csv': BillboardImportJob.FORMAT_CSV,
+    '.xlsx': BillboardImportJob.FORMAT_XLSX,
+    '.ndjson': BillboardImportJob.FORMAT_NDJSON,
+    '.jsonl': BillboardImportJob.FORMAT_NDJSON,
+}
+
+
+class ImportRowError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def detect_format(filename, explicit=None):
+    """Import format from an explicit `format` value or the file extension; None if unknown."""
+    if explicit:
+        explicit = explicit.strip().lower()
+        return explicit if explicit in dict(BillboardImportJob.FORMAT_CHOICES) else None
+    return FORMAT_EXTENSIONS.get(os.path.splitext(filename or '')[1].lower())
+
+
+# ── Streaming readers: yield (row_dict | None, parse_error | None) ─────────
+
+def _iter_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    for row in csv.DictReader(text):
+        yield {key: value for key, value in row.items() if key is not None}, None
+
+
+def _iter_ndjson(fileobj):
+    for line in io.TextIOWrapper(fileobj, encoding='utf-8'):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield None, f'Invalid JSON: {exc.msg}'
+            continue
+        if not isinstance(row, dict):
+            yield None, 'Each line must be a JSON object.'
+            continue
+        yield row, None
+
+
+def _iter_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise RuntimeError('XLSX import requires openpyxl to be installed.') from exc
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+        header = [str(h).strip() if h is not None else None for h in header]
+        for values in rows:
+            if all(v is None or v == '' for v in values):
+                continue
+            yield {h: v for h, v in zip(header, values) if h}, None
+    finally:
+        workbook.close()
+
+
+READERS = {
+    BillboardImportJob.FORMAT_CSV: _iter_csv,
+    BillboardImportJob.FORMAT_NDJSON: _iter_ndjson,
+    BillboardImportJob.FORMAT_XLSX: _iter_xlsx,
+}
+
+
+# ── Row normalization ───────────────────────────────────────────────────────
+
+def _parse_cell_json(value):
+    """Spec cells from CSV/XLSX: '60' → 60, 'true' → True, '[10, 20]' → list; else the raw value."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def _parse_image_urls(value):
+    if value in (None, ''):
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                raise ImportRowError({'images': 'images must be a JSON list or |-separated URLs.'})
+        else:
+            value = [u.strip() for u in value.split('|')]
+    if not isinstance(value, list) or not all(isinstance(u, str) for u in value):
+        raise ImportRowError({'images': 'images must be a list of URLs.'})
+    urls = [u for u in value if u]
+    if len(urls) > MAX_IMAGES_PER_ROW:
+        raise ImportRowError({'images': f'At most {MAX_IMAGES_PER_ROW} images per billboard.'})
+    return urls
+
+
+def _normalize_row(raw, media_types_by_name):
+    """Split a raw row into a serializer payload and its image URLs."""
+    payload = {}
+    specs = {}
+    for key, value in raw.items():
+        key = str(key).strip()
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            continue
+        if key.startswith(SPEC_COLUMN_PREFIX):
+            specs[key[len(SPEC_COLUMN_PREFIX):]] = _parse_cell_json(value)
+        else:
+            payload[key] = value
+
+    image_urls = _parse_image_urls(payload.pop('images', None))
+
+    if specs:
+        base = payload.get('specifications') or {}
+        if isinstance(base, str):
+            try:
+                base = json.loads(base)
+            except json.JSONDecodeError:
+                raise ImportRowError({'specifications': 'specifications must be valid JSON.'})
+        if not isinstance(base, dict):
+            raise ImportRowError({'specifications': 'specifications must be a JSON object.'})
+        payload['specifications'] = {**base, **specs}
+
+    # Resolve media type names up front so validation never queries by name.
+    type_name = payload.pop('ooh_media_type', None)
+    if 'media_type_id' not in payload and type_name is not None:
+        media_type = media_types_by_name.get(str(type_name).strip().lower())
+        if media_type is None:
+            raise ImportRowError({'ooh_media_type': f'Unknown media type "{type_name}".'})
+        payload['media_type_id'] = media_type.id
+
+    return payload, image_urls
+
+
+# ── Concurrent image fetch ──────────────────────────────────────────────────
+
+def _media_url(path):
+    return f'{settings.PUBLIC_BASE_URL}{settings.MEDIA_URL}{path}'
+
+
+def _is_local_media(url):
+    return url.startswith(f'{settings.PUBLIC_BASE_URL}{settings.MEDIA_URL}')
+
+
+def _image_host_error(url):
+    """
+    Why `url` must not be fetched, or None. Blocks server-side request forgery:
+    the host must resolve only to public addresses (no loopback, RFC1918,
+    link-local / cloud metadata, reserved or multicast), and must be on
+    settings.BILLBOARD_IMPORT_IMAGE_HOSTS when that allow-list is set.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        return f'Unsupported image URL: {url}'
+    host = parsed.hostname.rstrip('.').lower()
+
+    allowed_hosts = getattr(settings, 'BILLBOARD_IMPORT_IMAGE_HOSTS', None) or ()
+    if allowed_hosts and not any(host == h or host.endswith(f'.{h}') for h in allowed_hosts):
+        return f'Image host not allowed: {url}'
+
+    try:
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)}
+    except (OSError, ValueError):
+        return f'Image host could not be resolved: {url}'
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            return f'Image host not allowed: {url}'
+    return None
+
+
+def _fetch_image(url):
+    """Download one remote image into media_store (one reference held); returns (stored_path, error)."""
+    # Redirects are followed by hand so every hop passes the same host checks.
+    # (DNS could still change between the check and the connect; the allow-list closes that.)
+    try:
+        for _ in range(MAX_IMAGE_REDIRECTS + 1):
+            host_error = _image_host_error(url)
+            if host_error:
+                return None, host_error
+            resp = requests.get(url, timeout=IMAGE_FETCH_TIMEOUT, stream=True, allow_redirects=False)
+            if not resp.is_redirect:
+                break
+            location = resp.headers.get('Location', '')
+            resp.close()
+            url = urljoin(url, location)
+        else:
+            return None, f'Too many redirects: {url}'
+
+        with resp:
+            if resp.status_code != 200:
+                return None, f'Image fetch failed ({resp.status_code}): {url}'
+            content_type = (resp.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+            extension = IMAGE_EXTENSIONS.get(content_type)
+            if extension is None:
+                return None, f'Invalid image type {content_type or "unknown"}: {url}'
+            body = bytearray()
+            for block in resp.iter_content(64 * 1024):
+                body.extend(block)
+                if len(body) > MAX_IMAGE_BYTES:
+                    return None, f'Image too large (max 10MB): {url}'
+    except requests.RequestException as exc:
+        return None, f'Image fetch failed: {url} ({exc.__class__.__name__})'
+
+    try:
+        return store_blob(ContentFile(bytes(body)), name_hint=extension), None
+    finally:
+        connections.close_all()  # pool threads open their own DB connection
+
+
+def _fetch_images(urls):
+    """{url: (stored_path, error)} for every remote URL, fetched on a bounded thread pool."""
+    remote = sorted({url for url in urls if not _is_local_media(url)})
+    if not remote:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(IMAGE_FETCH_WORKERS, len(remote))) as pool:
+        return dict(zip(remote, pool.map(_fetch_image, remote)))
+
+
+# ── Job runner ──────────────────────────────────────────────────────────────
+
+class _ImportRun:
+    def __init__(self, job):
+        self.job = job
+        self.owner = job.owner
+        self.currency = (getattr(self.owner, 'preferred_currency', None) or '').strip().upper()
+        self.auto_approve = getattr(settings, 'BYPASS_BILLBOARD_APPROVAL', False)
+        media_types = list(OohMediaType.objects.filter(is_active=True, is_selectable=True))
+        self.context = {
+            'media_types': {mt.id: mt for mt in media_types},
+            'spec_attributes_cache': {},
+        }
+        self.media_types_by_name = {mt.name.strip().lower(): mt for mt in media_types}
+        self.processed = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def save_progress(self, **extra):
+        # Only while RUNNING: a job already failed as stale stays failed.
+        BillboardImportJob.objects.filter(
+            pk=self.job.pk, status=BillboardImportJob.STATUS_RUNNING
+        ).update(
+            processed_rows=self.processed,
+            created_count=self.created,
+            error_count=self.error_count,
+            errors=self.errors,
+            **extra,
+        )
+
+    def validate(self, row_number, raw, parse_error):
+        """Returns (validated_data, image_urls) or None after recording the row's errors."""
+        if parse_error:
+            self.add_error(row_number, {'row': parse_error})
+            return None
+        try:
+            payload, image_urls = _normalize_row(raw, self.media_types_by_name)
+        except ImportRowError as exc:
+            self.add_error(row_number, exc.errors)
+            return None
+        serializer = BillboardImportRowSerializer(data=payload, context=self.context)
+        if not serializer.is_valid():
+            self.add_error(row_number, serializer.errors)
+            return None
+        return serializer.validated_data, image_urls
+
+    def build(self, validated_data, images):
+        billboard = Billboard(
+            **validated_data,
+            user=self.owner,
+            currency=self.currency,
+            images=images,
+        )
+        if billboard.media_type_id:
+            billboard.ooh_media_type = billboard.media_type.name
+        if self.auto_approve:
+            billboard.approval_status = 'approved'
+            billboard.approved_at = timezone.now()
+        else:
+            billboard.approval_status = 'pending'
+        return billboard
+
+    def flush(self, chunk):
+        """Fetch the chunk's images concurrently, then bulk_create its valid rows."""
+        fetched = _fetch_images(url for _, _, urls in chunk for url in urls)
+        # Each fetched blob carries one reference for this chunk; created boards take their own below.
+        fetch_refs = [path for path, _ in fetched.values() if path]
+        billboards = []
+        built_rows = []
+        for row_number, validated_data, urls in chunk:
+            failures = [fetched[u][1] for u in urls if u in fetched and fetched[u][1]]
+            if failures:
+                self.add_error(row_number, {'images': failures})
+                continue
+            images = [_media_url(fetched[u][0]) if u in fetched else u for u in urls]
+            billboards.append(self.build(validated_data, images))
+            built_rows.append(row_number)
+
+        if billboards:
+            sync_billboard_locations(billboards)
+            for billboard in billboards:
+                sync_billboard_numbers(billboard)
+            try:
+                with transaction.atomic():
+                    Billboard.objects.bulk_create(billboards, batch_size=IMPORT_CHUNK_SIZE)
+                    # bulk_create skips the signals that reference image blobs.
+                    acquire_blobs(name for b in billboards for name in blob_names_from_urls(b.images))
+            except Exception as exc:
+                logger.exception('Billboard import %s: chunk insert failed', self.job.pk)
+                for row_number in built_rows:
+                    self.add_error(row_number, {'row': f'Insert failed: {exc.__class__.__name__}'})
+                billboards = []
+        release_blobs(fetch_refs)
+        if billboards:
+            self.queue_image_variants(billboards)
+        if billboards and self.auto_approve:
+            self.queue_saved_search_alerts(billboards)
+            # New boards appear in no list yet, so only the cells around them need a refresh.
+            mark_cells(cell for billboard in billboards if billboard.is_active for cell in cells_around(billboard))
+        self.created += len(billboards)
+        self.save_progress()
+
+    def queue_image_variants(self, billboards):
+        """bulk_create skips the post_save signal that builds resized image derivatives."""
+        from .tasks import generate_billboard_image_variants_task
+
+        for billboard in billboards:
+            if billboard.images:
+                generate_billboard_image_variants_task.delay(billboard.pk)
+
+    def queue_saved_search_alerts(self, billboards):
+        """bulk_create skips the post_save approval signal; queue the alerts it would have."""
+        from .tasks import notify_saved_search_matches_task
+
+        for billboard in billboards:
+            if billboard.is_active:
+                notify_saved_search_matches_task.delay(billboard.pk)
+
+    def run(self):
+        reader = READERS[self.job.file_format]
+        chunk = []
+        truncated = False
+        with self.job.file.open('rb') as fileobj:
+            for row_number, (raw, parse_error) in enumerate(reader(fileobj), start=1):
+                if row_number > MAX_IMPORT_ROWS:
+                    truncated = True
+                    break
+                self.processed = row_number
+                result = self.validate(row_number, raw, parse_error)
+                if result is not None:
+                    chunk.append((row_number, *result))
+                if row_number % IMPORT_CHUNK_SIZE == 0:
+                    self.flush(chunk)
+                    chunk = []
+        self.flush(chunk)
+
+        if self.created and self.auto_approve:
+            increment_cache_version()  # bulk_create skips the post_save map-cache signal
+
+        message = f'Imported {self.created} of {self.processed} rows.'
+        if truncated:
+            message += f' Stopped after {MAX_IMPORT_ROWS} rows; split the file to import the rest.'
+        return message
+
+
+def fail_stale_import_jobs(jobs=None):
+    """
+    Mark RUNNING jobs started over IMPORT_JOB_STALE_AFTER ago as failed; returns
+    how many. Not requeued: rows created before the worker died would be
+    imported twice.
+    """
+    jobs = BillboardImportJob.objects.all() if jobs is None else jobs
+    now = timezone.now()
+    return jobs.filter(
+        status=BillboardImportJob.STATUS_RUNNING,
+        started_at__lt=now - IMPORT_JOB_STALE_AFTER,
+    ).update(
+        status=BillboardImportJob.STATUS_FAILED,
+        message='Import stopped: the import worker stopped responding. '
+                'Rows created before it stopped are kept; re-upload the remaining rows.',
+        finished_at=now,
+    )
+
+
+def run_import_job(job_id):
+    """Process one pending BillboardImportJob end to end; duplicate deliveries are no-ops."""
+    claimed = BillboardImportJob.objects.filter(
+        pk=job_id, status=BillboardImportJob.STATUS_PENDING
+    ).update(status=BillboardImportJob.STATUS_RUNNING, started_at=timezone.now())
+    if not claimed:
+        return None
+
+    job = BillboardImportJob.objects.select_related('owner').get(pk=job_id)
+    run = _ImportRun(job)
+    if not run.currency:
+        run.save_progress(
+            status=BillboardImportJob.STATUS_FAILED,
+            message='Set your currency in profile before importing billboards.',
+            finished_at=timezone.now(),
+        )
+        return job.pk
+
+    try:
+        message = run.run()
+    except Exception as exc:
+        logger.exception('Billboard import %s failed', job.pk)
+        run.save_progress(
+            status=BillboardImportJob.STATUS_FAILED,
+            message=f'Import stopped: {exc}',
+            finished_at=timezone.now(),
+        )
+        return job.pk
+
+    run.save_progress(
+        status=BillboardImportJob.STATUS_COMPLETED,
+        message=message,
+        finished_at=timezone.now(),
+    )
+    return job.pk
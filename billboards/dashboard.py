@@ -0,0 +1,163 @@
+"""
+Media owner dashboard — one precomputed OwnerDashboardStats row per owner.
+
+Writers keep the row current instead of the dashboard aggregating on request:
+- tracking (record_billboard_view / _lead, record_tracking_batch) adds view/lead deltas,
+- wishlist post_save / post_delete signals add or remove one wishlist,
+- booking services refresh the owner's booking counts after commit.
+If a row is missing (new owner, or never built) the first write rebuilds it
+from source tables; `rebuild_owner_dashboards` repairs drift in bulk.
+
+Top boards are not maintained: they are read live (one LIMITed query on the
+owner's boards) and cached per owner for TOP_BILLBOARDS_CACHE_TIMEOUT seconds,
+so polling the dashboard does not repeat the query.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Billboard, OwnerDashboardStats, Wishlist
+
+logger = logging.getLogger(__name__)
+
+TOP_BILLBOARDS_LIMIT = 5
+TOP_BILLBOARDS_CACHE_TIMEOUT = 60
+
+
+def _booking_counts(owner_id):
+    """Indexed COUNTs over Booking(media_owner, status); effective status so expiry/live agree with lists."""
+    from bookings.models import Booking
+    from bookings.services import effective_status_q
+
+    booked = (
+        Booking.STATUS_ACCEPTED,
+        Booking.STATUS_PAID,
+        Booking.STATUS_CONFIRMED,
+        Booking.STATUS_LIVE,
+        Booking.STATUS_COMPLETED,
+    )
+    return Booking.objects.filter(media_owner_id=owner_id).aggregate(
+        booking_requests=Count('id'),
+        pending_bookings=Count('id', filter=effective_status_q(Booking.STATUS_PENDING)),
+        live_bookings=Count('id', filter=effective_status_q(Booking.STATUS_LIVE)),
+        booked_bookings=Count('id', filter=Q(status__in=booked)),
+    )
+
+
+def rebuild_owner_stats(owner_id):
+    """Recompute an owner's row from source tables (also creates it)."""
+    counters = Billboard.objects.filter(user_id=owner_id).aggregate(
+        total_views=Sum('views'), total_leads=Sum('leads')
+    )
+    values = {
+        'views': counters['total_views'] or 0,
+        'leads': counters['total_leads'] or 0,
+        'wishlists': Wishlist.objects.filter(billboard__user_id=owner_id).count(),
+        **_booking_counts(owner_id),
+    }
+    stats, _ = OwnerDashboardStats.objects.update_or_create(owner_id=owner_id, defaults=values)
+    return stats
+
+
+def add_owner_counters(deltas):
+    """
+    Apply {owner_id: {'views'|'leads'|'wishlists': n}} as F() increments.
+    Call after the underlying rows are written: a missing summary row is rebuilt
+    from source tables, which already include this delta.
+    """
+    now = timezone.now()
+    for owner_id, fields in deltas.items():
+        fields = {f: n for f, n in fields.items() if n}
+        if not owner_id or not fields:
+            continue
+        updated = OwnerDashboardStats.objects.filter(owner_id=owner_id).update(
+            updated_at=now,
+            **{f: Greatest(F(f) + n, 0) for f, n in fields.items()},
+        )
+        if not updated:
+            rebuild_owner_stats(owner_id)
+
+
+def add_tracking_counts(field, counts, owners):
+    """Roll per-billboard view/lead counts ({billboard_id: n}) up to their owners."""
+    per_owner = Counter()
+    for billboard_id, n in counts.items():
+        owner_id = owners.get(billboard_id)
+        if owner_id:
+            per_owner[owner_id] += n
+    add_owner_counters({owner_id: {field: n} for owner_id, n in per_owner.items()})
+
+
+def refresh_owner_booking_counts(owner_ids):
+    """Recount booking statuses for owners once the booking transaction commits."""
+    owner_ids = {owner_id for owner_id in owner_ids if owner_id}
+    if not owner_ids:
+        return
+
+    def _refresh():
+        for owner_id in owner_ids:
+            try:
+                values = _booking_counts(owner_id)
+                updated = OwnerDashboardStats.objects.filter(owner_id=owner_id).update(
+                    updated_at=timezone.now(), **values
+                )
+                if not updated:
+                    rebuild_owner_stats(owner_id)
+            except Exception as exc:
+                logger.error('Dashboard booking refresh failed for owner %s: %s', owner_id, exc)
+
+    transaction.on_commit(_refresh)
+
+
+def _rate(numerator, denominator):
+    return round(numerator / denominator, 4) if denominator else 0.0
+
+
+def _top_billboards(owner_id):
+    """The owner's most viewed boards, computed live and cached briefly."""
+    cache_key = f'owner_top_billboards_{owner_id}'
+    top = cache.get(cache_key)
+    if top is None:
+        top = list(
+            Billboard.objects.filter(user_id=owner_id)
+            .order_by('-views', '-leads', '-id')
+            .values('id', 'city', 'road_name', 'views', 'leads', 'approval_status', 'is_active')
+            [:TOP_BILLBOARDS_LIMIT]
+        )
+        cache.set(cache_key, top, TOP_BILLBOARDS_CACHE_TIMEOUT)
+    return top
+
+
+def get_owner_dashboard(owner):
+    """Dashboard payload from the summary row plus the cached top boards."""
+    stats = OwnerDashboardStats.objects.filter(owner=owner).first()
+    if stats is None:
+        stats = rebuild_owner_stats(owner.id)
+
+    top_billboards = _top_billboards(owner.id)
+    return {
+        'totals': {
+            'views': stats.views,
+            'leads': stats.leads,
+            'wishlists': stats.wishlists,
+            'booking_requests': stats.booking_requests,
+            'pending_bookings': stats.pending_bookings,
+            'live_bookings': stats.live_bookings,
+            'booked_bookings': stats.booked_bookings,
+        },
+        'conversion': {
+            'view_to_lead': _rate(stats.leads, stats.views),
+            'view_to_wishlist': _rate(stats.wishlists, stats.views),
+            'request_to_booking': _rate(stats.booked_bookings, stats.booking_requests),
+        },
+        'top_billboards': top_billboards,
+        'updated_at': stats.updated_at,
+    }
@@ -0,0 +1,106 @@
+"""
+Facet counts (media type, board tier, city) for the map endpoint's `facets=true`.
+
+Counts reflect the viewport and every active filter. On PostgreSQL the three
+facets come from one `GROUP BY GROUPING SETS` over the filtered queryset's SQL;
+other databases run one GROUP BY per facet.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count
+
+from .models import OohMediaType
+from .signals import get_cache_version
+
+FACET_FIELDS = ('media_type_id', 'type', 'city')
+MAX_CITY_FACETS = 50
+FACETS_CACHE_TIMEOUT = 120
+
+
+def _grouping_sets_counts(queryset):
+    """{field: {value: count}} from a single GROUPING SETS query."""
+    connection = connections[queryset.db]
+    sql, params = queryset.values(*FACET_FIELDS).query.sql_with_params()
+    quoted = [connection.ops.quote_name(field) for field in FACET_FIELDS]
+    columns = ', '.join(quoted)
+    grouping = ', '.join(f'GROUPING({column})' for column in quoted)
+    sets = ', '.join(f'({column})' for column in quoted)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {columns}, {grouping}, COUNT(*) FROM ({sql}) facet_rows '
+            f'GROUP BY GROUPING SETS ({sets})',
+            params,
+        )
+        rows = cursor.fetchall()
+
+    counts = {field: {} for field in FACET_FIELDS}
+    width = len(FACET_FIELDS)
+    for row in rows:
+        values, grouped, total = row[:width], row[width:2 * width], row[-1]
+        for field, value, is_rolled_up in zip(FACET_FIELDS, values, grouped):
+            # GROUPING() is 0 for the column this row is grouped by.
+            if not is_rolled_up:
+                counts[field][value] = total
+    return counts
+
+
+def _per_field_counts(queryset):
+    return {
+        field: {
+            row[field]: row['n']
+            for row in queryset.values(field).annotate(n=Count('id')).order_by()
+        }
+        for field in FACET_FIELDS
+    }
+
+
+def _as_buckets(counts, limit=None):
+    buckets = [
+        {'value': value, 'count': count}
+        for value, count in counts.items()
+        if value not in (None, '')
+    ]
+    buckets.sort(key=lambda bucket: (-bucket['count'], str(bucket['value'])))
+    return buckets[:limit] if limit else buckets
+
+
+def compute_facets(queryset):
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor == 'postgresql':
+        counts = _grouping_sets_counts(queryset)
+    else:
+        counts = _per_field_counts(queryset)
+
+    media_types = _as_buckets(counts['media_type_id'])
+    names = dict(
+        OohMediaType.objects.filter(id__in=[b['value'] for b in media_types]).values_list('id', 'name')
+    )
+    for bucket in media_types:
+        bucket['label'] = names.get(bucket['value'], '')
+
+    return {
+        'media_type_id': media_types,
+        'type': _as_buckets(counts['type']),
+        'city': _as_buckets(counts['city'], limit=MAX_CITY_FACETS),
+    }
+
+
+def get_facets(queryset, bounds, filter_params, use_cache=True):
+    """
+    Cached compute_facets(). Keyed like the map response (cache version, bounds,
+    filters) but not by zoom/cluster, so zooming within one viewport reuses it.
+    """
+    if not use_cache:
+        return compute_facets(queryset)
+    raw = f'{bounds}_{filter_params}'
+    cache_key = f'bb_facets_v{get_cache_version()}_{hashlib.md5(raw.encode()).hexdigest()}'
+    facets = cache.get(cache_key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(cache_key, facets, FACETS_CACHE_TIMEOUT)
+    return facets
@@ -1,12 +1,24 @@
 import django_filters
+from django.db.models import F, Q
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
 
+from .availability_utils import MAX_AVAILABILITY_WINDOW_DAYS, apply_availability_filter
 from .geo_utils import apply_map_bounds_filter, apply_radius_filter
-from .models import Billboard, OohMediaType
+from .models import Billboard, OohMediaType, OohMediaTypeAttribute
+from .specifications_utils import SPEC_FILTER_PREFIX, build_spec_filter_values
 
 
 class BillboardFilter(filters.FilterSet):
-    """Billboard list filters: media type, city, tier, and PostGIS location."""
+    """
+    Billboard list filters: media type, city, tier, and PostGIS location.
+
+    `spec__<key>=<value>[,<value>...]` filters on specifications for any key defined
+    by an active OohMediaTypeAttribute (of the selected media type, when one is given).
+    Values are checked against the attribute type and matched with JSONB containment
+    (@>), which the jsonb_path_ops GIN index on specifications serves.
+    """
 
     ooh_media_type = filters.CharFilter(
         lookup_expr='iexact',
@@ -30,13 +42,94 @@ class BillboardFilter(filters.FilterSet):
         lookup_expr='iexact',
         help_text='Board tier: Premium, Standard, etc.',
     )
+    min_price = filters.NumberFilter(
+        field_name='price_max',
+        lookup_expr='gte',
+        help_text='Boards whose price range reaches at least this amount.',
+    )
+    max_price = filters.NumberFilter(
+        field_name='price_min',
+        lookup_expr='lte',
+        help_text='Boards whose price range starts at or below this amount.',
+    )
+    min_daily_views = filters.NumberFilter(field_name='daily_views', lookup_expr='gte')
+    max_daily_views = filters.NumberFilter(field_name='daily_views', lookup_expr='lte')
+    min_width_m = filters.NumberFilter(field_name='width_m', lookup_expr='gte')
+    max_width_m = filters.NumberFilter(field_name='width_m', lookup_expr='lte')
+    min_height_m = filters.NumberFilter(field_name='height_m', lookup_expr='gte')
+    max_height_m = filters.NumberFilter(field_name='height_m', lookup_expr='lte')
+    available_from = filters.DateFilter(
+        method='filter_availability_window',
+        help_text='YYYY-MM-DD. Only boards with no booking or owner block from this day.',
+    )
+    available_to = filters.DateFilter(
+        method='filter_availability_window',
+        help_text='YYYY-MM-DD. End of the free window (inclusive; defaults to available_from).',
+    )
 
     class Meta:
         model = Billboard
-        fields = ['ooh_media_type', 'media_type_id', 'media_type', 'city', 'type']
+        fields = [
+            'ooh_media_type', 'media_type_id', 'media_type', 'city', 'type',
+            'min_price', 'max_price', 'min_daily_views', 'max_daily_views',
+            'min_width_m', 'max_width_m', 'min_height_m', 'max_height_m',
+            'available_from', 'available_to',
+        ]
+
+    def filter_availability_window(self, queryset, name, value):
+        # Both bounds are applied together in filter_queryset().
+        return queryset
+
+    def _apply_availability(self, queryset):
+        available_from = self.form.cleaned_data.get('available_from')
+        available_to = self.form.cleaned_data.get('available_to')
+        if not available_from and not available_to:
+            return queryset
+
+        available_from = available_from or available_to
+        available_to = available_to or available_from
+        if available_to < available_from:
+            raise ValidationError(
+                {'available_to': 'available_to must be on or after available_from.'}
+            )
+        if (available_to - available_from).days >= MAX_AVAILABILITY_WINDOW_DAYS:
+            raise ValidationError(
+                {'available_to': f'Date window cannot exceed {MAX_AVAILABILITY_WINDOW_DAYS} days.'}
+            )
+        return apply_availability_filter(queryset, available_from, available_to)
+
+    def _apply_spec_filters(self, queryset):
+        if not any(name.startswith(SPEC_FILTER_PREFIX) for name in self.data):
+            return queryset
+
+        media_type = self.form.cleaned_data.get('media_type')
+        media_type_id = self.form.cleaned_data.get('media_type_id')
+        attributes = OohMediaTypeAttribute.objects.filter(is_active=True)
+        if media_type is not None:
+            attributes = attributes.filter(media_type=media_type)
+        elif media_type_id is not None:
+            attributes = attributes.filter(media_type_id=int(media_type_id))
+
+        keys = [name[len(SPEC_FILTER_PREFIX):] for name in self.data if name.startswith(SPEC_FILTER_PREFIX)]
+        parsed, errors = build_spec_filter_values(
+            self.data, attributes.filter(key__in=keys).only('key', 'field_type', 'options')
+        )
+        if errors:
+            raise ValidationError(errors)
+
+        for key, values in parsed.items():
+            condition = Q()
+            for field_type, value in values:
+                # Multi-select specs are stored as lists: containment matches any one element.
+                stored = [value] if field_type == OohMediaTypeAttribute.FIELD_MULTISELECT else value
+                condition |= Q(specifications__contains={key: stored})
+            queryset = queryset.filter(condition)
+        return queryset
 
     def filter_queryset(self, queryset):
         queryset = super().filter_queryset(queryset)
+        queryset = self._apply_availability(queryset)
+        queryset = self._apply_spec_filters(queryset)
 
         ne_lat = self.data.get('ne_lat')
         ne_lng = self.data.get('ne_lng')
@@ -54,3 +147,42 @@ class BillboardFilter(filters.FilterSet):
             return apply_radius_filter(queryset, lat, lng, radius)
 
         return queryset
+
+
+class BillboardOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that sorts `price_range` by its numeric price_min column (it used
+    to sort lexically), supports `trending` (decayed score, hottest first) and
+    puts NULL numeric values last in either direction.
+    """
+
+    NUMERIC_ORDERING = {
+        'price_range': 'price_min',
+        'price_min': 'price_min',
+        'price_max': 'price_max',
+        'daily_views': 'daily_views',
+        'width_m': 'width_m',
+        'height_m': 'height_m',
+    }
+    # `trending` lists the hottest boards first (`-trending` reverses it).
+    TRENDING = 'trending'
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        expressions = []
+        for term in ordering:
+            descending = term.startswith('-')
+            name = term.lstrip('-')
+            if name == self.TRENDING:
+                descending, column = not descending, 'trending_log'
+            else:
+                column = self.NUMERIC_ORDERING.get(name)
+            if column is None:
+                expressions.append(term)
+            elif descending:
+                expressions.append(F(column).desc(nulls_last=True))
+            else:
+                expressions.append(F(column).asc(nulls_last=True))
+        return queryset.order_by(*expressions, '-id')
@@ -1,5 +1,7 @@
 """PostGIS helpers for billboard map search and radius filters."""
 
+import math
+
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos import Point, Polygon
 from django.contrib.gis.measure import D
@@ -10,12 +12,94 @@ def point_from_lat_lng(lat, lng, srid=4326):
     return Point(float(lng), float(lat), srid=srid)
 
 
+# Spatial bucket keys stored on Billboard (B-tree indexed; a prefix is a coarser cell).
+GEOHASH_PRECISION = 9   # ~5 m cells
+QUADKEY_LEVEL = 18      # web-map tile zoom 18, ~150 m at the equator
+LOCATION_FIELDS = ('location', 'geohash', 'quadkey')
+
+_GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_MERCATOR_MAX_LAT = 85.05112878
+
+
+def encode_geohash(lat, lng, precision=GEOHASH_PRECISION):
+    """Standard base32 geohash of (lat, lng)."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        target, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            target[0] = mid
+        else:
+            target[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_cells_around(lat, lng, precision):
+    """The geohash cell containing (lat, lng) at `precision` plus its eight neighbours."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    cell_w = 360.0 / 2 ** lng_bits
+    cell_h = 180.0 / 2 ** lat_bits
+    cells = set()
+    for dy in (-1, 0, 1):
+        y = max(-90.0, min(90.0, lat + dy * cell_h))
+        for dx in (-1, 0, 1):
+            x = (lng + dx * cell_w + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(y, x, precision))
+    return cells
+
+
+def tile_xy(lat, lng, zoom):
+    """Web-Mercator (slippy map) tile x/y containing (lat, lng) at `zoom`."""
+    lat = max(-_MERCATOR_MAX_LAT, min(_MERCATOR_MAX_LAT, lat))
+    n = 2 ** zoom
+    sin_lat = math.sin(math.radians(lat))
+    x = (lng + 180.0) / 360.0
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(n - 1, max(0, int(x * n))), min(n - 1, max(0, int(y * n)))
+
+
+def encode_quadkey(lat, lng, level=QUADKEY_LEVEL):
+    """Bing-style quadkey; its first `z` digits are the zoom-z tile containing the point."""
+    tile_x, tile_y = tile_xy(lat, lng, level)
+    digits = []
+    for i in range(level, 0, -1):
+        mask = 1 << (i - 1)
+        digit = (1 if tile_x & mask else 0) + (2 if tile_y & mask else 0)
+        digits.append(str(digit))
+    return ''.join(digits)
+
+
 def sync_billboard_location(billboard):
-    """Set `location` from latitude/longitude when both are present."""
+    """Set `location`, `geohash` and `quadkey` from latitude/longitude when both are present."""
     if billboard.latitude is not None and billboard.longitude is not None:
-        billboard.location = point_from_lat_lng(billboard.latitude, billboard.longitude)
+        lat, lng = float(billboard.latitude), float(billboard.longitude)
+        billboard.location = point_from_lat_lng(lat, lng)
+        billboard.geohash = encode_geohash(lat, lng)
+        billboard.quadkey = encode_quadkey(lat, lng)
     else:
         billboard.location = None
+        billboard.geohash = None
+        billboard.quadkey = None
+
+
+def sync_billboard_locations(billboards):
+    """sync_billboard_location for unsaved instances headed for bulk_create (save() is bypassed)."""
+    for billboard in billboards:
+        sync_billboard_location(billboard)
 
 
 def apply_map_bounds_filter(queryset, ne_lat, ne_lng, sw_lat, sw_lng):
@@ -66,3 +150,22 @@ def backfill_billboard_locations(Billboard):
             batch.clear()
     if batch:
         Billboard.objects.bulk_update(batch, ['location'])
+
+
+def backfill_billboard_spatial_keys(Billboard, chunk_size=500):
+    """Migration helper: populate geohash/quadkey for rows with coordinates, id-ordered chunks."""
+    qs = (
+        Billboard.objects.exclude(latitude__isnull=True).exclude(longitude__isnull=True)
+        .only('id', 'latitude', 'longitude').order_by('id')
+    )
+    last_id = 0
+    while True:
+        batch = list(qs.filter(id__gt=last_id)[:chunk_size])
+        if not batch:
+            break
+        for billboard in batch:
+            lat, lng = float(billboard.latitude), float(billboard.longitude)
+            billboard.geohash = encode_geohash(lat, lng)
+            billboard.quadkey = encode_quadkey(lat, lng)
+        Billboard.objects.bulk_update(batch, ['geohash', 'quadkey'])
+        last_id = batch[-1].id
@@ -0,0 +1,189 @@
+"""
+Viewport heatmap: billboards aggregated into a zoom-dependent lat/lng grid.
+
+The grid is `HEATMAP_CELLS_PER_TILE` cells across one web-map tile at the
+requested zoom, so cells stay roughly the same on-screen size at every zoom.
+The viewport is snapped outward to whole cells. The GROUP BY is done in SQL on
+the indexed latitude/longitude columns: FLOOR(coord / cell) gives the integer
+cell index.
+
+Results are cached per tile (a fixed block of HEATMAP_CELLS_PER_TILE x
+HEATMAP_CELLS_PER_TILE cells at the zoom), not per viewport: pans and
+overlapping viewports reuse the tiles they share, and only the missing tiles
+are aggregated, in one query over their bounding box. Tile entries carry the
+map cache version, so any billboard change (which bumps it) invalidates every
+cached tile at once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+
+from django.core.cache import cache
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Floor
+
+from .geo_utils import apply_map_bounds_filter
+from .signals import get_cache_version
+
+HEATMAP_CELLS_PER_TILE = 8
+HEATMAP_MIN_ZOOM = 0
+HEATMAP_MAX_ZOOM = 18
+HEATMAP_CACHE_TIMEOUT = 120
+# Viewports spanning more tiles than this are aggregated directly, uncached.
+HEATMAP_MAX_CACHED_TILES = 64
+
+METRIC_SUPPLY = 'supply'
+METRIC_VIEWS = 'views'
+METRIC_LEADS = 'leads'
+HEATMAP_METRICS = (METRIC_SUPPLY, METRIC_VIEWS, METRIC_LEADS)
+
+
+def parse_bbox(raw):
+    """'west,south,east,north' → (west, south, east, north) floats; raises ValueError."""
+    try:
+        west, south, east, north = (float(part) for part in (raw or '').split(','))
+    except ValueError as exc:
+        raise ValueError('bbox must be "west,south,east,north" in degrees.') from exc
+    if west > east:
+        west, east = east, west
+    if south > north:
+        south, north = north, south
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= 90 and -90 <= north <= 90):
+        raise ValueError('bbox is out of range.')
+    return west, south, east, north
+
+
+def cell_size_for_zoom(zoom):
+    """Cell edge in degrees: one tile spans 360 / 2**zoom degrees of longitude."""
+    return 360.0 / (2 ** zoom) / HEATMAP_CELLS_PER_TILE
+
+
+def snap_bbox(bbox, cell):
+    west, south, east, north = bbox
+    return (
+        max(-180.0, math.floor(west / cell) * cell),
+        max(-90.0, math.floor(south / cell) * cell),
+        min(180.0, math.ceil(east / cell) * cell),
+        min(90.0, math.ceil(north / cell) * cell),
+    )
+
+
+def heatmap_tile_key(version, zoom, tile, metric, filter_params):
+    digest = hashlib.md5(f'{metric}_{filter_params}'.encode()).hexdigest()
+    return f'bb_heatmap_v{version}_{zoom}_{tile[0]}_{tile[1]}_{digest}'
+
+
+def _cell_range(bbox, cell):
+    """Integer cell indices [x0, x1) x [y0, y1) covered by a snapped bbox."""
+    west, south, east, north = bbox
+    x0, y0 = round(west / cell), round(south / cell)
+    return x0, y0, max(round(east / cell), x0 + 1), max(round(north / cell), y0 + 1)
+
+
+def _grid_rows(queryset, bbox, cell, metric):
+    """[(cx, cy, count, value)] for boards of `queryset` inside `bbox`."""
+    west, south, east, north = bbox
+    queryset = apply_map_bounds_filter(queryset, north, east, south, west)
+
+    aggregates = {'count': Count('id')}
+    if metric != METRIC_SUPPLY:
+        aggregates['value'] = Sum(metric)
+
+    rows = (
+        queryset.order_by()
+        .annotate(cx=Floor(F('longitude') / cell), cy=Floor(F('latitude') / cell))
+        .values('cx', 'cy')
+        .annotate(**aggregates)
+    )
+    return [
+        (int(row['cx']), int(row['cy']), row['count'],
+         row['count'] if metric == METRIC_SUPPLY else (row['value'] or 0))
+        for row in rows
+    ]
+
+
+def _response(zoom, metric, cell, bbox, rows):
+    """
+    Response payload. Each cell: {lat, lng} of its centre, `count` of boards,
+    `value` of the metric.
+    """
+    cells = [
+        {
+            'lat': round((cy + 0.5) * cell, 6),
+            'lng': round((cx + 0.5) * cell, 6),
+            'count': count,
+            'value': value,
+        }
+        for cx, cy, count, value in rows
+    ]
+    return {
+        'zoom': zoom,
+        'metric': metric,
+        'cell_size': cell,
+        'bbox': list(bbox),
+        'max_value': max((c['value'] for c in cells), default=0),
+        'cells': cells,
+    }
+
+
+def aggregate_heatmap(queryset, bbox, zoom, metric):
+    """Grid cells for `queryset` (already filtered) inside `bbox` (already snapped), uncached."""
+    cell = cell_size_for_zoom(zoom)
+    return _response(zoom, metric, cell, bbox, _grid_rows(queryset, bbox, cell, metric))
+
+
+def _aggregate_tiles(queryset, tiles, cell, metric):
+    """{tile: [(cx, cy, count, value)]} for `tiles`, from one query over their bounding box."""
+    size = HEATMAP_CELLS_PER_TILE
+    xs = [tx for tx, _ in tiles]
+    ys = [ty for _, ty in tiles]
+    bbox = (
+        max(-180.0, min(xs) * size * cell),
+        max(-90.0, min(ys) * size * cell),
+        min(180.0, (max(xs) + 1) * size * cell),
+        min(90.0, (max(ys) + 1) * size * cell),
+    )
+    by_tile = {tile: [] for tile in tiles}
+    for row in _grid_rows(queryset, bbox, cell, metric):
+        tile_rows = by_tile.get((row[0] // size, row[1] // size))
+        if tile_rows is not None:
+            tile_rows.append(row)
+    return by_tile
+
+
+def get_heatmap(queryset, bbox, zoom, metric, filter_params='', use_cache=True):
+    """Tile-cached aggregate_heatmap(); `filter_params` must identify any filters applied to queryset."""
+    cell = cell_size_for_zoom(zoom)
+    bbox = snap_bbox(bbox, cell)
+    if not use_cache:
+        return aggregate_heatmap(queryset, bbox, zoom, metric)
+    x0, y0, x1, y1 = _cell_range(bbox, cell)
+    size = HEATMAP_CELLS_PER_TILE
+    tiles = [
+        (tx, ty)
+        for tx in range(x0 // size, (x1 - 1) // size + 1)
+        for ty in range(y0 // size, (y1 - 1) // size + 1)
+    ]
+    if len(tiles) > HEATMAP_MAX_CACHED_TILES:
+        # A viewport this large at this zoom is rarely repeated; skip filling the cache with it.
+        return aggregate_heatmap(queryset, bbox, zoom, metric)
+
+    version = get_cache_version()
+    keys = {tile: heatmap_tile_key(version, zoom, tile, metric, filter_params) for tile in tiles}
+    cached = cache.get_many(list(keys.values()))
+    tile_rows = {tile: cached[key] for tile, key in keys.items() if key in cached}
+    missing = [tile for tile in tiles if tile not in tile_rows]
+    if missing:
+        fresh = _aggregate_tiles(queryset, missing, cell, metric)
+        cache.set_many({keys[tile]: rows for tile, rows in fresh.items()}, HEATMAP_CACHE_TIMEOUT)
+        tile_rows.update(fresh)
+
+    rows = [
+        row
+        for tile in tiles
+        for row in tile_rows[tile]
+        if x0 <= row[0] < x1 and y0 <= row[1] < y1
+    ]
+    return _response(zoom, metric, cell, bbox, rows)
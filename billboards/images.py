@@ -0,0 +1,209 @@
+"""
+Resized WebP/JPEG derivatives of billboard images.
+
+Originals (up to 10 MB) stay in `Billboard.images`. After a save adds images,
+`generate_billboard_image_variants` (Celery, after commit) writes each one at
+256 / 768 / 1600 px on the longest edge in both formats through media_store
+(content-addressed and reference-counted), and records them in
+`Billboard.image_variants`:
+
+    {original_url: {'256': {'webp': url, 'jpeg': url}, '768': {...}, '1600': {...}}}
+
+Each URL in that map holds one blob reference. `save_variants` drops and
+releases entries whose original left `images`; deleting the board releases the
+rest (signals.release_image_blobs).
+
+Serializers call `image_url` with the size for their surface (thumbnails in
+lists, tiles and chat; cards in previews; full size on detail) and fall back to
+the original until the derivatives exist. WebP is served unless the request
+asks for `image_format=jpeg`.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .media_store import blob_names_from_urls, release_blobs, storage_name_from_url, store_blob
+from .models import Billboard
+
+logger = logging.getLogger(__name__)
+
+SIZE_THUMB = 256
+SIZE_CARD = 768
+SIZE_FULL = 1600
+IMAGE_SIZES = (SIZE_THUMB, SIZE_CARD, SIZE_FULL)
+
+FORMAT_WEBP = 'webp'
+FORMAT_JPEG = 'jpeg'
+IMAGE_FORMATS = (FORMAT_WEBP, FORMAT_JPEG)
+IMAGE_FORMAT_PARAM = 'image_format'
+
+_QUALITY = {FORMAT_WEBP: 80, FORMAT_JPEG: 82}
+_EXTENSIONS = {FORMAT_WEBP: 'webp', FORMAT_JPEG: 'jpg'}
+
+
+def _encode(image, image_format):
+    buffer = io.BytesIO()
+    if image_format == FORMAT_JPEG:
+        image.convert('RGB').save(buffer, 'JPEG', quality=_QUALITY[FORMAT_JPEG], optimize=True, progressive=True)
+    else:
+        image.save(buffer, 'WEBP', quality=_QUALITY[FORMAT_WEBP], method=4)
+    return buffer.getvalue()
+
+
+def _store_variant(data, image_format):
+    """Save one derivative through media_store; the board's image_variants entry owns the reference."""
+    name = store_blob(ContentFile(data), name_hint=f'.{_EXTENSIONS[image_format]}')
+    return default_storage.url(name)
+
+
+def variant_blob_names(entries):
+    """Blob names referenced by image_variants entries ({size: {format: url}} each)."""
+    return blob_names_from_urls(
+        url for entry in entries for formats in (entry or {}).values() for url in formats.values()
+    )
+
+
+def release_variants(entries):
+    release_blobs(variant_blob_names(entries))
+
+
+class UndecodableImage(Exception):
+    """The stored original is not an image Pillow can read; retrying will not help."""
+
+
+def _encode_variants(data):
+    """{size: {format: bytes}} for one original's bytes. Raises UndecodableImage."""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            source = ImageOps.exif_transpose(source)
+            if source.mode not in ('RGB', 'RGBA'):
+                source = source.convert('RGBA' if 'A' in source.getbands() else 'RGB')
+            encoded = {}
+            for size in IMAGE_SIZES:
+                resized = source.copy()
+                # Never upscales: small originals produce same-sized (deduplicated) files.
+                resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+                encoded[str(size)] = {image_format: _encode(resized, image_format) for image_format in IMAGE_FORMATS}
+    except (Image.UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError) as exc:
+        # Everything here works on in-memory bytes, so these are decode failures, not storage errors.
+        raise UndecodableImage(str(exc)) from exc
+    return encoded
+
+
+def build_variants(name):
+    """
+    {size: {format: url}} for one stored original. Raises UndecodableImage for
+    unreadable images; storage errors propagate so the task retries.
+    """
+    with default_storage.open(name, 'rb') as handle:
+        data = handle.read()
+    return {
+        size: {image_format: _store_variant(body, image_format) for image_format, body in formats.items()}
+        for size, formats in _encode_variants(data).items()
+    }
+
+
+def missing_variant_urls(billboard):
+    """Image URLs on `billboard` with no recorded derivatives yet."""
+    done = billboard.image_variants or {}
+    return [url for url in (billboard.images or []) if url not in done]
+
+
+def generate_billboard_image_variants(billboard_id):
+    """Create derivatives for images that lack them; prune entries for removed images. Returns images processed."""
+    billboard = Billboard.objects.filter(pk=billboard_id).only('id', 'images', 'image_variants').first()
+    if billboard is None:
+        return 0
+    built = {}
+    failure = None
+    for url in missing_variant_urls(billboard):
+        name = storage_name_from_url(url)
+        try:
+            # External or undecodable images get an empty entry so they are not retried.
+            built[url] = build_variants(name) if name else {}
+        except UndecodableImage as exc:
+            logger.warning('image variants skipped billboard=%s image=%s: %s', billboard_id, url, exc)
+            built[url] = {}
+        except Exception as exc:
+            # Storage/IO trouble is transient: keep the images done so far and let the task retry.
+            failure = exc
+            break
+    save_variants(billboard_id, built)
+    if failure is not None:
+        raise failure
+    return len(built)
+
+
+def save_variants(billboard_id, built=None):
+    """
+    Merge freshly built entries into image_variants under the row lock and drop
+    entries whose image is gone. References of dropped or unused entries are
+    released, so derivative blobs live exactly as long as their entry.
+    """
+    built = built or {}
+    with transaction.atomic():
+        billboard = (
+            Billboard.objects.select_for_update().filter(pk=billboard_id)
+            .only('id', 'images', 'image_variants').first()
+        )
+        if billboard is None:
+            release_variants(built.values())
+            return
+        images = set(billboard.images or [])
+        current = billboard.image_variants or {}
+        variants = {url: entry for url, entry in current.items() if url in images}
+        unused = [entry for url, entry in current.items() if url not in images]
+        for url, entry in built.items():
+            if url in images and url not in variants:
+                variants[url] = entry
+            else:
+                unused.append(entry)  # image removed meanwhile, or a concurrent run got there first
+        if variants != current:
+            Billboard.objects.filter(pk=billboard_id).update(image_variants=variants)
+        release_variants(unused)
+
+
+def preferred_format(request):
+    params = getattr(request, 'query_params', None) or getattr(request, 'GET', None) or {}
+    if params.get(IMAGE_FORMAT_PARAM, '').lower() in ('jpeg', 'jpg'):
+        return FORMAT_JPEG
+    return FORMAT_WEBP
+
+
+def image_url(billboard, url, size, request=None):
+    """The `size` derivative of `url` in the request's format, else the original."""
+    if not url:
+        return None
+    variant = ((billboard.image_variants or {}).get(url) or {}).get(str(size)) or {}
+    sized = variant.get(preferred_format(request))
+    if not sized:
+        return url
+    if request is not None and sized.startswith('/'):
+        return request.build_absolute_uri(sized)
+    return sized
+
+
+def primary_image_url(billboard, size, request=None):
+    """image_url for the board's first image (None without images)."""
+    images = billboard.images or []
+    return image_url(billboard, images[0], size, request) if images else None
+
+
+def image_sizes(billboard, request=None):
+    """Per image, in `images` order: {'thumb', 'card', 'full'} URLs."""
+    return [
+        {
+            'thumb': image_url(billboard, url, SIZE_THUMB, request),
+            'card': image_url(billboard, url, SIZE_CARD, request),
+            'full': image_url(billboard, url, SIZE_FULL, request),
+        }
+        for url in (billboard.images or [])
+    ]
@@ -0,0 +1,62 @@
+"""
+Fill the typed numeric columns (price_min, price_max, daily_views, width_m,
+height_m) from the billboard text fields, in id-ordered chunks.
+
+Run once after migrating, and after any raw/bulk edit of the text fields:
+
+  python manage.py backfill_billboard_numbers
+  python manage.py backfill_billboard_numbers --chunk-size 500 --only-missing
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from billboards.models import Billboard
+from billboards.numeric_utils import NUMERIC_FIELDS, NUMERIC_SOURCE_FIELDS, sync_billboard_numbers
+from billboards.signals import increment_cache_version
+
+
+class Command(BaseCommand):
+    help = 'Backfill billboard numeric price/audience/size columns from their text fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Rows per UPDATE batch (default 1000)',
+        )
+        parser.add_argument(
+            '--only-missing',
+            action='store_true',
+            help='Skip rows whose numeric columns are already all set',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        queryset = Billboard.objects.only('id', *NUMERIC_SOURCE_FIELDS, *NUMERIC_FIELDS).order_by('id')
+        if options['only_missing']:
+            missing = Q()
+            for field in NUMERIC_FIELDS:
+                missing |= Q(**{f'{field}__isnull': True})
+            queryset = queryset.filter(missing)
+
+        last_id = 0
+        updated = 0
+        while True:
+            chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            for billboard in chunk:
+                sync_billboard_numbers(billboard)
+            # bulk_update skips save() and signals; the map cache is bumped once at the end.
+            with transaction.atomic():
+                Billboard.objects.bulk_update(chunk, NUMERIC_FIELDS)
+            updated += len(chunk)
+            last_id = chunk[-1].id
+            self.stdout.write(f'  {updated} rows (last id {last_id})')
+
+        if updated:
+            increment_cache_version()
+        self.stdout.write(self.style.SUCCESS(f'Backfilled numeric columns on {updated} billboards'))
@@ -0,0 +1,78 @@
+"""
+Create upcoming monthly View/Lead partitions and apply partition retention.
+
+The daily beat task creates partitions too, but only removes old ones when
+settings.TRACKING_PARTITION_RETENTION opts in. Use this after deploying
+migration 0022, or to archive old partitions by hand (--drop-expired):
+
+  python manage.py manage_tracking_partitions
+  python manage.py manage_tracking_partitions --months-ahead 6
+  python manage.py manage_tracking_partitions --drop-expired --retention-months 12
+  python manage.py manage_tracking_partitions --drop-expired --detach-only
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from billboards.partitions import (
+    DEFAULT_MONTHS_AHEAD,
+    drop_expired_partitions,
+    ensure_future_partitions,
+    expired_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create future monthly partitions for View/Lead and drop/detach expired ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=DEFAULT_MONTHS_AHEAD,
+            help='Ensure partitions exist from this month through N months ahead',
+        )
+        parser.add_argument(
+            '--drop-expired',
+            action='store_true',
+            help='Also remove partitions older than the retention window',
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=settings.TRACKING_RETENTION_MONTHS,
+            help='Full months of raw View/Lead rows to keep',
+        )
+        parser.add_argument(
+            '--detach-only',
+            action='store_true',
+            help='Detach expired partitions but keep them as standalone tables',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List expired partitions without touching them',
+        )
+
+    def handle(self, *args, **options):
+        created = ensure_future_partitions(months_ahead=options['months_ahead'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(created)} partitions' + (f': {", ".join(created)}' if created else '')
+        ))
+
+        if not options['drop_expired']:
+            return
+
+        if options['dry_run']:
+            expired = expired_partitions(options['retention_months'])
+            for table, partition in expired:
+                self.stdout.write(f'Would remove {partition.name} (upper bound {partition.upper})')
+            self.stdout.write(self.style.SUCCESS(f'{len(expired)} partitions past retention'))
+            return
+
+        handled = drop_expired_partitions(
+            retention_months=options['retention_months'],
+            detach_only=options['detach_only'],
+        )
+        action = 'Detached' if options['detach_only'] else 'Dropped'
+        self.stdout.write(self.style.SUCCESS(f'{action} {len(handled)} expired partitions'))
@@ -0,0 +1,38 @@
+"""
+Rebuild OwnerDashboardStats rows from source tables.
+
+Run once after deploying, and whenever dashboard totals look out of step:
+
+  python manage.py rebuild_owner_dashboards
+  python manage.py rebuild_owner_dashboards --owner-id 42
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from billboards.dashboard import rebuild_owner_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-owner dashboard summary rows (views, leads, wishlists, bookings)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--owner-id',
+            type=int,
+            help='Rebuild a single owner only',
+        )
+
+    def handle(self, *args, **options):
+        if options['owner_id']:
+            owner_ids = [options['owner_id']]
+        else:
+            owner_ids = (
+                get_user_model().objects.filter(user_type='media_owner')
+                .values_list('id', flat=True).iterator()
+            )
+        rebuilt = 0
+        for owner_id in owner_ids:
+            rebuild_owner_stats(owner_id)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} owner dashboard rows'))
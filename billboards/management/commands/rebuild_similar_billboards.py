@@ -0,0 +1,49 @@
+"""
+Rebuild "similar nearby" neighbour lists (BillboardNeighbour) from scratch.
+
+Run once after deploying; afterwards the refresh task keeps touched cells current:
+
+  python manage.py rebuild_similar_billboards
+  python manage.py rebuild_similar_billboards --billboard-id 42
+"""
+
+from django.core.management.base import BaseCommand
+
+from billboards.models import Billboard, SimilarRefreshCell
+from billboards.similar import rebuild_neighbours
+
+
+class Command(BaseCommand):
+    help = 'Recompute precomputed similar-nearby billboard lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--billboard-id',
+            type=int,
+            help='Rebuild a single billboard only',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Boards rebuilt per transaction (default 500)',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Billboard.objects.order_by('id')
+        if options['billboard_id']:
+            queryset = queryset.filter(id=options['billboard_id'])
+        else:
+            SimilarRefreshCell.objects.all().delete()
+
+        chunk_size = max(1, options['chunk_size'])
+        boards = links = 0
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not batch:
+                break
+            links += rebuild_neighbours(batch)
+            boards += len(batch)
+            last_id = batch[-1].id
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt similar lists for {boards} billboards ({links} entries)'))
@@ -0,0 +1,38 @@
+"""
+Rebuild the per-billboard view/lead dedup Bloom filters from history.
+
+Run once after deploying, and again after a Redis flush:
+
+  python manage.py rebuild_tracking_filters
+  python manage.py rebuild_tracking_filters --only view
+"""
+
+from django.core.management.base import BaseCommand
+
+from billboards.models import Lead, View
+from billboards.tracking_dedup import rebuild_filters
+
+MODELS = {'view': View, 'lead': Lead}
+
+
+class Command(BaseCommand):
+    help = 'Rebuild Redis Bloom filters used to skip View/Lead dedup queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            choices=sorted(MODELS),
+            help='Rebuild filters for one interaction type only',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows fetched per server-side cursor chunk',
+        )
+
+    def handle(self, *args, **options):
+        kinds = [options['only']] if options['only'] else sorted(MODELS)
+        for kind in kinds:
+            loaded = rebuild_filters(MODELS[kind], chunk_size=options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {kind} filters from {loaded} rows'))
@@ -0,0 +1,155 @@
+"""
+Content-addressed, reference-counted media storage.
+
+Billboard images, chat attachments and booking creatives are stored once per
+distinct content under `blobs/<aa>/<sha256><ext>`, so the same poster uploaded
+to several boards, chats and bookings takes disk space once, and a file name
+never changes meaning (safe to cache forever on a CDN).
+
+`store_blob` hashes the upload while copying it to a temporary file, then saves
+it only if no blob with that digest exists. It returns the storage name with
+one reference held by the caller. Owners of references:
+- billboards: one per occurrence in `Billboard.images` (signals diff old/new lists),
+  and one per derivative URL in `Billboard.image_variants` (see images.py),
+- chat: one per ChatAttachment, booking creatives: one per BookingContent.media_file,
+- uploads in flight: the request's own reference, released once the owner row
+  holds its own (or the request fails).
+When the last reference goes the row is kept at ref_count 0 and, after commit,
+`_delete_unreferenced` drops file and row under a row lock, only if nothing
+re-referenced the blob meanwhile. `store_blob` takes its reference before
+checking the file, and rewrites it when missing, so it never hands out a name
+whose file a concurrent release is removing.
+Names outside `blobs/` (files stored before this layer) are ignored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+from collections import Counter
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import MediaBlob
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = 'blobs'
+_MAX_EXTENSION_LENGTH = 10
+# Uploads below this stay in memory while being hashed.
+_SPOOL_BYTES = 1024 * 1024
+
+
+def storage_name_from_url(url):
+    """Storage name for a URL under MEDIA_URL; None for external or malformed URLs."""
+    if not isinstance(url, str) or not url:
+        return None
+    path = urlparse(url).path
+    if not path.startswith(settings.MEDIA_URL):
+        return None
+    return path[len(settings.MEDIA_URL):] or None
+
+
+def _extension(name_hint):
+    ext = os.path.splitext(name_hint or '')[1].lower()
+    return ext if 1 < len(ext) <= _MAX_EXTENSION_LENGTH else ''
+
+
+def blob_name(digest, extension=''):
+    return f'{BLOB_DIR}/{digest[:2]}/{digest}{extension}'
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(f'{BLOB_DIR}/')
+
+
+def store_blob(file_obj, name_hint=''):
+    """Store `file_obj` by content digest (or reuse the stored copy). Returns its storage name; caller holds one reference."""
+    hasher = hashlib.sha256()
+    size = 0
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES) as spool:
+        if hasattr(file_obj, 'seek'):
+            file_obj.seek(0)
+        chunks = file_obj.chunks() if hasattr(file_obj, 'chunks') else iter(lambda: file_obj.read(64 * 1024), b'')
+        for chunk in chunks:
+            hasher.update(chunk)
+            spool.write(chunk)
+            size += len(chunk)
+        digest = hasher.hexdigest()
+
+        if MediaBlob.objects.filter(digest=digest).update(ref_count=F('ref_count') + 1):
+            name = MediaBlob.objects.filter(digest=digest).values_list('name', flat=True).first()
+            _ensure_file(name, spool)
+            return name
+
+        name = blob_name(digest, _extension(name_hint or getattr(file_obj, 'name', '')))
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(digest=digest, name=name, size=size, ref_count=1)
+        except IntegrityError:
+            # A concurrent upload of the same content registered it first.
+            MediaBlob.objects.filter(digest=digest).update(ref_count=F('ref_count') + 1)
+            name = MediaBlob.objects.filter(digest=digest).values_list('name', flat=True).first() or name
+        _ensure_file(name, spool)
+    return name
+
+
+def _ensure_file(name, spool):
+    """Write the spooled content to `name` unless the file is already there (reference already held)."""
+    if default_storage.exists(name):
+        return
+    spool.seek(0)
+    saved = default_storage.save(name, File(spool, name=os.path.basename(name)))
+    if saved != name:
+        # Someone wrote the same content at the same moment; theirs is identical.
+        default_storage.delete(saved)
+
+
+def acquire_blobs(names):
+    """Take one reference per occurrence of each blob name (other names are ignored)."""
+    for name, count in Counter(n for n in names if is_blob_name(n)).items():
+        MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + count)
+
+
+def _delete_unreferenced(names):
+    """Drop file and row of each blob still at zero references (re-acquired blobs are kept)."""
+    for name in names:
+        try:
+            with transaction.atomic():
+                blob = MediaBlob.objects.select_for_update().filter(name=name, ref_count__lte=0).first()
+                if blob is None:
+                    continue
+                # The lock makes a concurrent store_blob wait, then find no row and rewrite the file.
+                default_storage.delete(name)
+                blob.delete()
+        except Exception as exc:
+            logger.warning('Could not delete blob %s: %s', name, exc)
+
+
+def release_blobs(names):
+    """Drop one reference per occurrence; blobs left unreferenced are deleted after commit."""
+    counts = Counter(n for n in names if is_blob_name(n))
+    if not counts:
+        return
+    orphaned = []
+    with transaction.atomic():
+        for blob in MediaBlob.objects.select_for_update().filter(name__in=list(counts)):
+            remaining = max(blob.ref_count - counts[blob.name], 0)
+            MediaBlob.objects.filter(pk=blob.pk).update(ref_count=remaining)
+            if not remaining:
+                orphaned.append(blob.name)
+    if orphaned:
+        transaction.on_commit(lambda: _delete_unreferenced(orphaned))
+
+
+def blob_names_from_urls(urls):
+    """Storage names of the blob-backed URLs in `urls` (one entry per occurrence)."""
+    names = (storage_name_from_url(url) for url in urls or [])
+    return [name for name in names if is_blob_name(name)]
@@ -0,0 +1,65 @@
+# Hourly / daily analytics rollups for views, leads and wishlist adds.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0019_oohmediatypeattribute_placeholder'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='wishlist',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='AnalyticsRollupCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=20, unique=True)),
+                ('last_created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BillboardStatsHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Start of the hour (UTC)')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('leads', models.PositiveIntegerField(default=0)),
+                ('wishlists', models.PositiveIntegerField(default=0)),
+                ('billboard', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='stats_hourly',
+                    to='billboards.billboard',
+                )),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket'], name='billboards__bucket_900505_idx')],
+                'unique_together': {('billboard', 'bucket')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BillboardStatsDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='UTC day')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('leads', models.PositiveIntegerField(default=0)),
+                ('wishlists', models.PositiveIntegerField(default=0)),
+                ('billboard', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='stats_daily',
+                    to='billboards.billboard',
+                )),
+            ],
+            options={
+                'unique_together': {('billboard', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Per-owner dashboard summary row.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0020_billboard_stats_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='billboard',
+            index=models.Index(fields=['user', 'views'], name='billboards__user_id_9dfdf4_idx'),
+        ),
+        migrations.CreateModel(
+            name='OwnerDashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('leads', models.PositiveIntegerField(default=0)),
+                ('wishlists', models.PositiveIntegerField(default=0, help_text="Current wishlist entries on the owner's boards")),
+                ('booking_requests', models.PositiveIntegerField(default=0, help_text='All booking requests ever received')),
+                ('pending_bookings', models.PositiveIntegerField(default=0)),
+                ('live_bookings', models.PositiveIntegerField(default=0)),
+                ('booked_bookings', models.PositiveIntegerField(default=0, help_text='Requests accepted (accepted through completed)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='dashboard_stats',
+                    to=settings.AUTH_USER_MODEL,
+                )),
+            ],
+        ),
+    ]
@@ -0,0 +1,129 @@
+# Monthly range partitioning on created_at for billboards_view / billboards_lead.
+#
+# PostgreSQL only; on SQLite dev databases this is a no-op. Existing rows are not
+# copied: the old table is attached as a single `<table>_legacy` partition covering
+# everything before next month, so it is dropped by retention once it ages out.
+# The primary key becomes (id, created_at) — Postgres requires the partition key in
+# every unique constraint — while Django keeps treating `id` as the pk.
+# The Django model state does not change.
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import migrations
+
+TABLES = ('billboards_view', 'billboards_lead')
+FUTURE_MONTHS = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _partition_table(cursor, table, next_month):
+    legacy = f'{table}_legacy'
+
+    cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [table])
+    row = cursor.fetchone()
+    if row is None or row[0] == 'p':
+        return
+
+    cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+    max_id = cursor.fetchone()[0]
+    cursor.execute(
+        """
+        SELECT attidentity FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attname = 'id'
+        """,
+        [table],
+    )
+    identity = cursor.fetchone()[0]
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+    serial_seq = cursor.fetchone()[0]
+    cursor.execute(
+        """
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = %s::regclass AND NOT x.indisprimary
+        """,
+        [table],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+        [table],
+    )
+    pkey = cursor.fetchone()[0]
+
+    # Old table becomes the legacy partition: free the index names for the parent,
+    # drop its own id sequence and widen its pk to include the partition key.
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    for name, _ in indexes:
+        cursor.execute(f'ALTER INDEX {name} RENAME TO {name}_legacy')
+    if identity:
+        cursor.execute(f'ALTER TABLE {legacy} ALTER COLUMN id DROP IDENTITY')
+    else:
+        cursor.execute(f'ALTER TABLE {legacy} ALTER COLUMN id DROP DEFAULT')
+        if serial_seq:
+            cursor.execute(f'DROP SEQUENCE IF EXISTS {serial_seq}')
+    cursor.execute(f'ALTER TABLE {legacy} DROP CONSTRAINT {pkey}')
+    cursor.execute(f'ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_pkey PRIMARY KEY (id, created_at)')
+
+    # Partitioned parent with the original name, sequence, pk, FKs and indexes.
+    cursor.execute(
+        f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE (created_at)'
+    )
+    cursor.execute(f'CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    cursor.execute(f"SELECT setval('{table}_id_seq', %s, false)", [max_id + 1])
+    cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+    cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {pkey} PRIMARY KEY (id, created_at)')
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for _, definition in indexes:
+        # Captured before the rename, so it still names the original index and table.
+        cursor.execute(definition)
+
+    cursor.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{next_month.isoformat()}')"
+    )
+    for offset in range(FUTURE_MONTHS):
+        start = _add_months(next_month, offset)
+        end = _add_months(start, 1)
+        cursor.execute(
+            f"CREATE TABLE {table}_p{start:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+
+def partition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    now = datetime.now(dt_timezone.utc)
+    next_month = _add_months(datetime(now.year, now.month, 1, tzinfo=dt_timezone.utc), 1)
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            _partition_table(cursor, table, next_month)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0021_ownerdashboardstats'),
+    ]
+
+    operations = [
+        # Reverse is a no-op: the partitioned tables are transparent to the ORM.
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
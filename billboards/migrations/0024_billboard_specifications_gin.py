@@ -0,0 +1,40 @@
+# jsonb_path_ops GIN index on Billboard.specifications for spec__<key> filters.
+#
+# jsonb_path_ops only supports @> (containment), which is all the filters use, and
+# is smaller and faster than the default jsonb_ops. PostgreSQL only; SQLite dev
+# databases get the model state without the index.
+
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations
+
+INDEX = GinIndex(fields=['specifications'], opclasses=['jsonb_path_ops'], name='billboards_specs_path_gin')
+
+
+def add_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('billboards', 'Billboard'), INDEX)
+
+
+def remove_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('billboards', 'Billboard'), INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0023_billboardimportjob'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='billboard', index=INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(add_index, remove_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Typed numeric mirrors of price_range / average_daily_views / display_width /
+# display_height. Populated by Billboard.save(); existing rows are filled with
+# `python manage.py backfill_billboard_numbers`.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0024_billboard_specifications_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billboard',
+            name='price_min',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='billboard',
+            name='price_max',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='billboard',
+            name='daily_views',
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='billboard',
+            name='width_m',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True),
+        ),
+        migrations.AddField(
+            model_name='billboard',
+            name='height_m',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Indexed geohash / quadkey bucket keys on Billboard, maintained by
+# sync_billboard_location. On PostgreSQL db_index on a CharField also creates a
+# varchar_pattern_ops index, so `startswith` prefix queries use a B-tree too.
+
+from django.db import migrations, models
+
+from billboards.geo_utils import backfill_billboard_spatial_keys
+
+
+def forwards(apps, schema_editor):
+    Billboard = apps.get_model('billboards', 'Billboard')
+    backfill_billboard_spatial_keys(Billboard)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0025_billboard_numeric_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billboard',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='billboard',
+            name='quadkey',
+            field=models.CharField(blank=True, db_index=True, max_length=24, null=True),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
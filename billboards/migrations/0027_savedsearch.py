@@ -0,0 +1,40 @@
+# Saved map searches with a GiST-indexed area polygon for reverse matching.
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0026_billboard_geohash_quadkey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('area', django.contrib.gis.db.models.fields.PolygonField(srid=4326)),
+                ('center_latitude', models.FloatField(blank=True, null=True)),
+                ('center_longitude', models.FloatField(blank=True, null=True)),
+                ('radius_km', models.FloatField(blank=True, null=True)),
+                ('board_type', models.CharField(blank=True, default='', help_text='Board tier filter (blank = any)', max_length=50)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('notify', models.BooleanField(db_index=True, default=True)),
+                ('last_notified_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('media_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='billboards.oohmediatype')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at'], name='billboards__user_id_fcf768_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Time-decayed trending score, maintained by the tracking pipeline (billboards/trending.py).
+# Existing boards start unscored (NULL) and sort after scored ones.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0027_savedsearch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billboard',
+            name='trending_log',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+    ]
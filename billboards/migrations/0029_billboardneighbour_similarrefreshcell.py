@@ -0,0 +1,37 @@
+# Precomputed "similar nearby" neighbour lists and the dirty-cell refresh queue.
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0028_billboard_trending_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillboardNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('distance_m', models.FloatField()),
+                ('billboard', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbour_links', to='billboards.billboard')),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='billboards.billboard')),
+            ],
+            options={
+                'ordering': ['billboard', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('billboard', 'rank'), name='billboards_neighbour_rank_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SimilarRefreshCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.CharField(max_length=12, unique=True)),
+                ('marked_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Resized WebP/JPEG derivatives of billboard images, keyed by original URL.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0029_billboardneighbour_similarrefreshcell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billboard',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
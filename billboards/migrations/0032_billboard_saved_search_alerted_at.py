@@ -0,0 +1,18 @@
+# Shared (DB) once-only guard for saved-search alerts; replaces the per-process cache key.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0031_mediablob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billboard',
+            name='saved_search_alerted_at',
+            field=models.DateTimeField(blank=True, help_text='When saved-search alerts went out for this billboard (sent once)', null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Buffered View/Lead rows carry the time of the event, not of the drain: created_at
+# takes a default instead of auto_now_add so the batch writer can set it. No schema change.
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billboards', '0032_billboard_saved_search_alerted_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lead',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='view',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
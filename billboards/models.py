@@ -1,10 +1,12 @@
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import F
 from django.conf import settings
 from django.utils import timezone
 
-from .geo_utils import sync_billboard_location
+from .geo_utils import LOCATION_FIELDS, sync_billboard_location
+from .numeric_utils import numeric_update_fields, sync_billboard_numbers
 
 
 class OohMediaType(models.Model):
@@ -119,6 +121,12 @@ class Billboard(models.Model):
     )
     display_height = models.CharField(max_length=20, blank=True, null=True)
     display_width = models.CharField(max_length=20, blank=True, null=True)
+    # Typed mirrors of the text fields above, set in save() (see numeric_utils).
+    price_min = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, db_index=True)
+    price_max = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, db_index=True)
+    daily_views = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    width_m = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    height_m = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
     advertiser_phone = models.CharField(max_length=20, blank=True, null=True)
     advertiser_whatsapp = models.CharField(max_length=100, blank=True, null=True)
     company_name = models.CharField(max_length=100, blank=True, null=True, db_index=True)  # Added index for filtering
@@ -134,6 +142,8 @@ class Billboard(models.Model):
     ooh_media_id = models.CharField(max_length=100, blank=True, null=True)
     type = models.CharField(max_length=50, db_index=True)  # Added index for filtering
     images = models.JSONField(default=list, blank=True)  # List of image URLs
+    # Resized WebP/JPEG derivatives keyed by original URL (see billboards.images)
+    image_variants = models.JSONField(default=dict, blank=True)
     specifications = models.JSONField(
         default=dict,
         blank=True,
@@ -150,8 +160,13 @@ class Billboard(models.Model):
         spatial_index=True,
         help_text='PostGIS geography point (synced from latitude/longitude)',
     )
+    # Spatial bucket keys (synced from latitude/longitude); prefixes are coarser cells.
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True)
+    quadkey = models.CharField(max_length=24, blank=True, null=True, db_index=True)
     views = models.IntegerField(default=0)  # NEW: View count field
     leads = models.IntegerField(default=0, db_index=True)  # NEW: Simple leads counter
+    # log2 of the time-decayed interaction score (billboards/trending.py); higher = hotter.
+    trending_log = models.FloatField(null=True, blank=True, db_index=True)
     is_active = models.BooleanField(default=True, db_index=True)  # NEW: Active/inactive toggle with index
     address = models.TextField(blank=True, null=True, help_text="Detailed address of the billboard location")
     generator_backup = models.CharField(
@@ -180,6 +195,11 @@ class Billboard(models.Model):
         blank=True,
         help_text="When the billboard was approved"
     )
+    saved_search_alerted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When saved-search alerts went out for this billboard (sent once)"
+    )
     
     rejected_at = models.DateTimeField(
         null=True, 
@@ -220,6 +240,20 @@ class Billboard(models.Model):
         if self.media_type_id:
             self.ooh_media_type = self.media_type.name
         sync_billboard_location(self)
+        sync_billboard_numbers(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = numeric_update_fields(update_fields)
+            if {'latitude', 'longitude'} & set(update_fields):
+                update_fields = list(dict.fromkeys([*update_fields, *LOCATION_FIELDS]))
+            kwargs['update_fields'] = update_fields
+        elif not self._state.adding and not kwargs.get('force_insert'):
+            # image_variants belongs to images.save_variants (row lock + blob references);
+            # a full save from an instance loaded earlier must not write an older map back.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'image_variants'
+            ]
         super().save(*args, **kwargs)
 
     def increment_views(self):
@@ -287,6 +321,9 @@ class Billboard(models.Model):
             models.Index(fields=['user', 'approval_status']),  # Composite index for user's billboards by status
             models.Index(fields=['latitude', 'longitude']),  # Index for map bounds queries (CRITICAL for performance)
             models.Index(fields=['approval_status', 'is_active', 'latitude', 'longitude']),  # Composite index for map queries
+            models.Index(fields=['user', 'views']),  # Owner dashboard top boards
+            # spec__<key> filters (JSONB @> containment)
+            GinIndex(fields=['specifications'], opclasses=['jsonb_path_ops'], name='billboards_specs_path_gin'),
         ]
 
 
@@ -298,7 +335,7 @@ class Wishlist(models.Model):
     billboard = models.ForeignKey(
         Billboard, on_delete=models.CASCADE, related_name='wishlisted_by'
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # Indexed for analytics rollups
 
     class Meta:
         unique_together = ['user', 'billboard']  # Prevent duplicate entries
@@ -330,7 +367,8 @@ class Lead(models.Model):
         null=True,
         help_text="Browser/device information"
     )
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Event time: the batch drain sets it from the buffered event (see tracking.record_tracking_batch).
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
 
     class Meta:
         ordering = ['-created_at']
@@ -368,7 +406,8 @@ class View(models.Model):
         null=True,
         help_text="Browser/device information"
     )
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Event time: the batch drain sets it from the buffered event (see tracking.record_tracking_batch).
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
 
     class Meta:
         ordering = ['-created_at']
@@ -381,4 +420,194 @@ class View(models.Model):
 
     def __str__(self):
         user_info = self.user.email if self.user else f"IP {self.user_ip}"
-        return f"{self.billboard.city} - View from {user_info} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"{self.billboard.city} - View from {user_info} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class BillboardStatsHourly(models.Model):
+    """Hourly view/lead/wishlist-add counts per billboard (filled by billboards.analytics)."""
+    billboard = models.ForeignKey(
+        Billboard, on_delete=models.CASCADE, related_name='stats_hourly'
+    )
+    bucket = models.DateTimeField(help_text="Start of the hour (UTC)")
+    views = models.PositiveIntegerField(default=0)
+    leads = models.PositiveIntegerField(default=0)
+    wishlists = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [('billboard', 'bucket')]
+        indexes = [
+            models.Index(fields=['bucket']),  # Retention pruning
+        ]
+
+    def __str__(self):
+        return f"Billboard {self.billboard_id} @ {self.bucket:%Y-%m-%d %H:00}"
+
+
+class BillboardStatsDaily(models.Model):
+    """Daily view/lead/wishlist-add counts per billboard (filled by billboards.analytics)."""
+    billboard = models.ForeignKey(
+        Billboard, on_delete=models.CASCADE, related_name='stats_daily'
+    )
+    day = models.DateField(help_text="UTC day")
+    views = models.PositiveIntegerField(default=0)
+    leads = models.PositiveIntegerField(default=0)
+    wishlists = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [('billboard', 'day')]
+
+    def __str__(self):
+        return f"Billboard {self.billboard_id} @ {self.day}"
+
+
+class AnalyticsRollupCursor(models.Model):
+    """High-water mark of raw rows (by created_at) already folded into the rollups."""
+    source = models.CharField(max_length=20, unique=True)
+    last_created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} rolled up to {self.last_created_at}"
+
+
+class OwnerDashboardStats(models.Model):
+    """Per-media-owner dashboard totals, kept current on write (see billboards.dashboard)."""
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='dashboard_stats'
+    )
+    views = models.PositiveIntegerField(default=0)
+    leads = models.PositiveIntegerField(default=0)
+    wishlists = models.PositiveIntegerField(default=0, help_text="Current wishlist entries on the owner's boards")
+    booking_requests = models.PositiveIntegerField(default=0, help_text="All booking requests ever received")
+    pending_bookings = models.PositiveIntegerField(default=0)
+    live_bookings = models.PositiveIntegerField(default=0)
+    booked_bookings = models.PositiveIntegerField(default=0, help_text="Requests accepted (accepted through completed)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard stats for user {self.owner_id}"
+
+
+class BillboardImportJob(models.Model):
+    """Background bulk import of billboards from an uploaded CSV / XLSX / NDJSON file."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    FORMAT_CSV = 'csv'
+    FORMAT_XLSX = 'xlsx'
+    FORMAT_NDJSON = 'ndjson'
+    FORMAT_CHOICES = [
+        (FORMAT_CSV, 'CSV'),
+        (FORMAT_XLSX, 'Excel (XLSX)'),
+        (FORMAT_NDJSON, 'NDJSON'),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='billboard_import_jobs'
+    )
+    file = models.FileField(upload_to='billboard_imports/')
+    original_filename = models.CharField(max_length=255, blank=True)
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="Per-row errors: [{row, errors}] (capped)")
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['owner', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Import {self.id} ({self.status}) by user {self.owner_id}"
+
+
+class SavedSearch(models.Model):
+    """
+    A user's saved map search; alerts fire when a newly approved board falls in it.
+    `area` is the search polygon (the bbox, or a polygon around the radius circle)
+    with a GiST index, so matching a board is one `area` contains-point lookup.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches'
+    )
+    name = models.CharField(max_length=100, blank=True)
+    area = gis_models.PolygonField(srid=4326, spatial_index=True)
+    # Radius searches keep their centre/radius for display; bbox searches leave them null.
+    center_latitude = models.FloatField(null=True, blank=True)
+    center_longitude = models.FloatField(null=True, blank=True)
+    radius_km = models.FloatField(null=True, blank=True)
+    media_type = models.ForeignKey(
+        OohMediaType, null=True, blank=True, on_delete=models.CASCADE, related_name='saved_searches'
+    )
+    board_type = models.CharField(max_length=50, blank=True, default='', help_text='Board tier filter (blank = any)')
+    min_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    notify = models.BooleanField(default=True, db_index=True)
+    last_notified_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Saved search {self.id} by user {self.user_id}"
+
+
+class BillboardNeighbour(models.Model):
+    """
+    One precomputed "similar nearby" entry: `neighbour` is the `rank`-th nearest
+    approved board to `billboard` with the same media type and price band
+    (see billboards.similar). Rebuilt per geohash cell by the refresh job.
+    """
+    billboard = models.ForeignKey(Billboard, on_delete=models.CASCADE, related_name='neighbour_links')
+    neighbour = models.ForeignKey(Billboard, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    distance_m = models.FloatField()
+
+    class Meta:
+        ordering = ['billboard', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['billboard', 'rank'], name='billboards_neighbour_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Billboard {self.billboard_id} neighbour #{self.rank}: {self.neighbour_id}"
+
+
+class SimilarRefreshCell(models.Model):
+    """A geohash cell whose boards' neighbour lists need recomputing (queue for billboards.similar)."""
+    cell = models.CharField(max_length=12, unique=True)
+    marked_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Similar refresh cell {self.cell}"
+
+
+class MediaBlob(models.Model):
+    """One stored file per distinct content (SHA-256), shared by every reference to it (see billboards.media_store)."""
+    digest = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True, help_text='Storage name under blobs/')
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
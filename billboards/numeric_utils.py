@@ -0,0 +1,179 @@
+"""
+Typed numeric columns derived from the free-text billboard fields.
+
+`price_range`, `average_daily_views`, `display_width` and `display_height` stay
+the owner-facing text; `Billboard.save()` mirrors them into indexed numeric
+columns (price_min / price_max / daily_views / width_m / height_m) so filters
+and ordering compare numbers instead of strings. Unparseable text gives NULL.
+`backfill_billboard_numbers` fills rows saved before the columns existed.
+"""
+
+from __future__ import annotations
+
+import re
+from decimal import Decimal, InvalidOperation
+
+MAX_PRICE = Decimal('9999999999.99')
+MAX_DAILY_VIEWS = 2_000_000_000
+MAX_DIMENSION_M = Decimal('9999.99')
+
+# Source text field -> numeric columns it drives (used to widen save(update_fields=...)).
+NUMERIC_SOURCE_FIELDS = {
+    'price_range': ('price_min', 'price_max'),
+    'average_daily_views': ('daily_views',),
+    'display_width': ('width_m',),
+    'display_height': ('height_m',),
+}
+NUMERIC_FIELDS = ('price_min', 'price_max', 'daily_views', 'width_m', 'height_m')
+
+# An amount with an optional multiplier word: '200k', '1.5M', '2 million', '5 lac', '1.2 crore'
+# (not the m of 'month'). Multipliers are listed longest first so 'mn' does not stop at 'm'.
+_AMOUNT_RE = re.compile(
+    r'(?<!\d)(?<!\d\.)(\d+(?:\.\d+)?)\s*'
+    r'(thousand|k|million|mn|m|lakhs?|lacs?|crores?|cr)?(?![a-z])',
+    re.IGNORECASE,
+)
+_MULTIPLIERS = {
+    'thousand': 1_000, 'k': 1_000,
+    'million': 1_000_000, 'mn': 1_000_000, 'm': 1_000_000,
+    'lakh': 100_000, 'lac': 100_000,
+    'crore': 10_000_000, 'cr': 10_000_000,
+}
+# A number directly followed by one of these is a period or a rate, not an amount.
+_NOT_AMOUNT_RE = re.compile(
+    r'\s*(?:%|(?:days?|weeks?|wks?|months?|mths?|mos?|years?|yrs?|hours?|hrs?|nights?)(?![a-z]))',
+    re.IGNORECASE,
+)
+# What may sit between the two ends of a price range ('30000 - Rs 50000', '30k to 50k').
+_RANGE_JOIN_RE = re.compile(r'\s*(?:-|–|—|to)\s*(?:(?:rs\.?|pkr)\s*)?', re.IGNORECASE)
+
+_DIMENSION_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)\s*')
+_DIMENSION_UNIT_RE = re.compile(
+    r"""(mm|cm|metres?|meters?|m|ft|feet|foot|inch(?:es)?|in|'|")(?![a-z])""",
+    re.IGNORECASE,
+)
+# '10 x 20 ft': the unit written after the second number applies to both.
+_DIMENSION_PAIR_RE = re.compile(r'(?:x|×|\*|by)\s*(\d+(?:\.\d+)?)\s*', re.IGNORECASE)
+_WORD_RE = re.compile(r'[a-z%]', re.IGNORECASE)
+
+# Metres per unit. Bare numbers are metres, matching the preview's display_size unit.
+_UNIT_TO_M = {
+    'mm': Decimal('0.001'),
+    'cm': Decimal('0.01'),
+    'm': Decimal('1'),
+    'ft': Decimal('0.3048'),
+    'in': Decimal('0.0254'),
+}
+BARE_DIMENSION_UNIT = 'm'
+
+
+def _normalize_unit(unit):
+    unit = (unit or BARE_DIMENSION_UNIT).lower()
+    if unit.startswith('met') or unit == 'm':
+        return 'm'
+    if unit in ('feet', 'foot', "'"):
+        return 'ft'
+    if unit.startswith('inch') or unit == '"':
+        return 'in'
+    return unit
+
+
+def _amounts(raw):
+    """[(match, Decimal)] for the numbers in `raw` that are amounts (periods and percentages skipped)."""
+    return [
+        (match, Decimal(match.group(1)) * _multiplier(match.group(2)))
+        for match in _AMOUNT_RE.finditer(raw.replace(',', ''))
+        if not _NOT_AMOUNT_RE.match(match.string, match.end())
+    ]
+
+
+def _multiplier(word):
+    return _MULTIPLIERS.get((word or '').lower().rstrip('s'), 1)
+
+
+def _price(value):
+    return value.quantize(Decimal('0.01')) if value <= MAX_PRICE else None
+
+
+def parse_price_range(raw):
+    """
+    (min, max) Decimals from text such as '8000', '30,000-50,000', '30k to 50k',
+    'PKR 5 lac' or '1.2 crore'. Numbers followed by a period ('30 days', '1 month')
+    are not prices. Two amounts form a range only when '-', '–' or 'to' joins them;
+    any other extra amount makes the text ambiguous and gives (None, None), as does
+    anything out of range.
+    """
+    amounts = _amounts(raw or '')
+    if len(amounts) == 1:
+        value = _price(amounts[0][1])
+        return value, value
+    if len(amounts) != 2:
+        return None, None
+
+    (low_match, low), (high_match, high) = amounts
+    if _RANGE_JOIN_RE.fullmatch(low_match.string, low_match.end(), high_match.start()) is None:
+        return None, None
+    if not low_match.group(2) and high_match.group(2):
+        # '30-50k' means 30k to 50k.
+        low = Decimal(low_match.group(1)) * _multiplier(high_match.group(2))
+    low, high = _price(min(low, high)), _price(max(low, high))
+    if low is None or high is None:
+        return None, None
+    return low, high
+
+
+def parse_daily_views(raw):
+    """
+    Integer audience from text such as '50000', '50,000', '50k', '1.2M', 'approx 2 million'
+    or '3 lakh' (the first amount). None when there is no amount, e.g. '12 months'.
+    """
+    amounts = _amounts(raw or '')
+    if not amounts:
+        return None
+    value = int(amounts[0][1])
+    return value if value <= MAX_DAILY_VIEWS else None
+
+
+def parse_dimension_m(raw):
+    """
+    Metres from text such as '6', '6 m', '600cm', '20ft', "20'" or '10 x 20 ft' (the
+    first number, in the unit written after it or after the pair). Bare numbers are
+    metres; a number followed by any other word ('12 months') gives None.
+    """
+    raw = (raw or '').strip().replace(',', '')
+    match = _DIMENSION_NUMBER_RE.search(raw)
+    if not match:
+        return None
+    unit = _DIMENSION_UNIT_RE.match(raw, match.end())
+    if unit is None:
+        pair = _DIMENSION_PAIR_RE.match(raw, match.end())
+        if pair is not None:
+            unit = _DIMENSION_UNIT_RE.match(raw, pair.end())
+            if unit is None and _WORD_RE.match(raw, pair.end()):
+                return None
+        elif _WORD_RE.match(raw, match.end()):
+            return None
+    metres = Decimal(match.group(1)) * _UNIT_TO_M[_normalize_unit(unit.group(1) if unit else None)]
+    metres = metres.quantize(Decimal('0.01'))
+    return metres if metres <= MAX_DIMENSION_M else None
+
+
+def sync_billboard_numbers(billboard):
+    """Set the numeric columns from their text source fields."""
+    billboard.price_min, billboard.price_max = parse_price_range(billboard.price_range)
+    billboard.daily_views = parse_daily_views(billboard.average_daily_views)
+    billboard.width_m = parse_dimension_m(billboard.display_width)
+    billboard.height_m = parse_dimension_m(billboard.display_height)
+
+
+def numeric_update_fields(update_fields):
+    """Extend save(update_fields=...) with the numeric columns its text fields drive."""
+    if update_fields is None:
+        return None
+    extra = [
+        column
+        for source, columns in NUMERIC_SOURCE_FIELDS.items()
+        if source in update_fields
+        for column in columns
+    ]
+    return list(dict.fromkeys([*update_fields, *extra]))
@@ -0,0 +1,185 @@
+"""
+Monthly range partitions on `created_at` for the View and Lead tables (PostgreSQL).
+
+Migration 0022 turns both tables into `PARTITION BY RANGE (created_at)` parents,
+attaching the pre-existing rows as one `<table>_legacy` partition. From then on:
+- `ensure_future_partitions()` creates `<table>_pYYYY_MM` a few months ahead,
+- `drop_expired_partitions()` detaches (and by default drops) partitions whose
+  whole range is older than the retention window — no row-by-row DELETE.
+`maintain_tracking_partitions_task` runs daily: it always creates partitions, and
+applies retention only when settings.TRACKING_PARTITION_RETENTION opts in
+('detach' or 'drop'; default 'off'), since unique view/lead dedup reads the raw
+rows for a visitor's whole history. `python manage.py manage_tracking_partitions`
+does either on demand. On other databases they are no-ops.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import namedtuple
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ('billboards_view', 'billboards_lead')
+DEFAULT_MONTHS_AHEAD = 3
+
+RETENTION_OFF = 'off'
+RETENTION_DETACH = 'detach'
+RETENTION_DROP = 'drop'
+
+Partition = namedtuple('Partition', 'name lower upper')
+
+_BOUND_RE = re.compile(r"FOR VALUES FROM \((?P<lower>[^)]*)\) TO \((?P<upper>[^)]*)\)")
+
+
+def month_start(value):
+    """First instant (UTC) of the month containing `value`."""
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(table, start):
+    return f'{table}_p{start:%Y_%m}'
+
+
+def _parse_bound(raw):
+    raw = raw.strip()
+    if raw in ('MINVALUE', 'MAXVALUE'):
+        return None
+    return datetime.fromisoformat(raw.strip("'"))
+
+
+def is_partitioned(connection, table):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [table])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def list_partitions(connection, table):
+    """Attached partitions of `table` ordered by lower bound (None = MINVALUE)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [table],
+        )
+        rows = cursor.fetchall()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound or '')
+        if not match:
+            continue  # DEFAULT partition
+        partitions.append(
+            Partition(name, _parse_bound(match['lower']), _parse_bound(match['upper']))
+        )
+    partitions.sort(key=lambda p: p.lower or datetime.min.replace(tzinfo=dt_timezone.utc))
+    return partitions
+
+
+def _overlaps(partition, start, end):
+    lower_ok = partition.lower is None or partition.lower < end
+    upper_ok = partition.upper is None or partition.upper > start
+    return lower_ok and upper_ok
+
+
+def ensure_future_partitions(months_ahead=DEFAULT_MONTHS_AHEAD, using='default'):
+    """Create any missing monthly partitions from this month to `months_ahead` months out."""
+    connection = connections[using]
+    this_month = month_start(timezone.now())
+    created = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(connection, table):
+            continue
+        existing = list_partitions(connection, table)
+        for offset in range(months_ahead + 1):
+            start = add_months(this_month, offset)
+            end = add_months(start, 1)
+            if any(_overlaps(p, start, end) for p in existing):
+                continue
+            name = partition_name(table, start)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            existing.append(Partition(name, start, end))
+            created.append(name)
+            logger.info('Created partition %s', name)
+    return created
+
+
+def expired_partitions(retention_months, using='default'):
+    """[(table, Partition)] whose upper bound is at or before the retention cutoff."""
+    connection = connections[using]
+    cutoff = add_months(month_start(timezone.now()), -retention_months)
+    expired = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(connection, table):
+            continue
+        for partition in list_partitions(connection, table):
+            if partition.upper is not None and partition.upper <= cutoff:
+                expired.append((table, partition))
+    return expired
+
+
+def drop_expired_partitions(retention_months=None, detach_only=False, tables=None, using='default'):
+    """
+    Detach (and unless `detach_only`, drop) partitions entirely older than
+    `retention_months` full months. Detached tables are left in place for
+    archiving; returns the partition names handled.
+    """
+    if retention_months is None:
+        retention_months = settings.TRACKING_RETENTION_MONTHS
+    connection = connections[using]
+    handled = []
+    for table, partition in expired_partitions(retention_months, using=using):
+        if tables and table not in tables:
+            continue
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {partition.name}')
+            if not detach_only:
+                cursor.execute(f'DROP TABLE {partition.name}')
+        handled.append(partition.name)
+        logger.info(
+            '%s partition %s (upper bound %s)',
+            'Detached' if detach_only else 'Dropped', partition.name, partition.upper,
+        )
+    return handled
+
+
+def retention_mode():
+    """settings.TRACKING_PARTITION_RETENTION, with unknown values treated as 'off'."""
+    mode = getattr(settings, 'TRACKING_PARTITION_RETENTION', RETENTION_OFF)
+    if mode not in (RETENTION_OFF, RETENTION_DETACH, RETENTION_DROP):
+        logger.warning('Unknown TRACKING_PARTITION_RETENTION %r; keeping all partitions', mode)
+        return RETENTION_OFF
+    return mode
+
+
+def apply_partition_retention(tables=None, using='default'):
+    """
+    Retention per settings.TRACKING_PARTITION_RETENTION (nothing when 'off');
+    the single entry point for the scheduled task and the admin actions.
+    Returns the partitions handled.
+    """
+    mode = retention_mode()
+    if mode == RETENTION_OFF:
+        return []
+    return drop_expired_partitions(detach_only=mode == RETENTION_DETACH, tables=tables, using=using)
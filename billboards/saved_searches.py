@@ -0,0 +1,129 @@
+"""
+Saved searches and new-board alerts.
+
+Each SavedSearch stores its area as a polygon (GiST indexed). When a board is
+approved, `matching_saved_searches` runs one reverse query: searches whose area
+contains the board's point and whose media type / tier / price filters accept
+it. `notify_saved_search_matches` (Celery, after commit) sends one inbox
+notification per matched user via create_inbox_notification. Boards are
+alerted once: `Billboard.saved_search_alerted_at` is claimed with a conditional
+UPDATE, so duplicate tasks from any process are no-ops.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import defaultdict
+
+from django.contrib.gis.geos import Point, Polygon
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.inbox_service import create_inbox_notification
+from notifications.models import NotificationType
+
+from .models import Billboard, SavedSearch
+
+logger = logging.getLogger(__name__)
+
+MAX_SAVED_SEARCHES_PER_USER = 20
+MAX_SEARCH_RADIUS_KM = 200
+MAX_SEARCH_SPAN_DEGREES = 10
+CIRCLE_SEGMENTS = 32
+_KM_PER_DEGREE_LAT = 111.32
+
+
+def bbox_polygon(west, south, east, north):
+    return Polygon.from_bbox((west, south, east, north))
+
+
+def circle_polygon(lat, lng, radius_km, segments=CIRCLE_SEGMENTS):
+    """
+    Polygon circumscribing a `radius_km` circle around (lat, lng). Degrees per km
+    are taken at the centre latitude, which is close enough at city scale.
+    """
+    # Scale vertices out so the polygon's edges, not its corners, touch the circle.
+    scale = 1 / math.cos(math.pi / segments)
+    dlat = radius_km / _KM_PER_DEGREE_LAT * scale
+    dlng = radius_km / (_KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01)) * scale
+    ring = [
+        (
+            lng + dlng * math.cos(2 * math.pi * i / segments),
+            max(-90.0, min(90.0, lat + dlat * math.sin(2 * math.pi * i / segments))),
+        )
+        for i in range(segments)
+    ]
+    ring.append(ring[0])
+    return Polygon(ring, srid=4326)
+
+
+def matching_saved_searches(billboard):
+    """Saved searches (other users, alerts on) whose area and filters accept `billboard`."""
+    if billboard.latitude is None or billboard.longitude is None:
+        return SavedSearch.objects.none()
+
+    point = Point(float(billboard.longitude), float(billboard.latitude), srid=4326)
+    queryset = SavedSearch.objects.filter(notify=True, area__intersects=point)
+
+    queryset = queryset.filter(Q(media_type__isnull=True) | Q(media_type_id=billboard.media_type_id))
+    queryset = queryset.filter(Q(board_type='') | Q(board_type__iexact=billboard.type or ''))
+    # Same semantics as the list filters: unknown prices only match searches without a bound.
+    if billboard.price_max is None:
+        queryset = queryset.filter(min_price__isnull=True)
+    else:
+        queryset = queryset.filter(Q(min_price__isnull=True) | Q(min_price__lte=billboard.price_max))
+    if billboard.price_min is None:
+        queryset = queryset.filter(max_price__isnull=True)
+    else:
+        queryset = queryset.filter(Q(max_price__isnull=True) | Q(max_price__gte=billboard.price_min))
+
+    if billboard.user_id:
+        queryset = queryset.exclude(user_id=billboard.user_id)
+    return queryset.select_related('user')
+
+
+def notify_saved_search_matches(billboard_id):
+    """Alert every user with a matching saved search about a newly approved board. Returns users notified."""
+    billboard = Billboard.objects.filter(
+        pk=billboard_id, approval_status='approved', is_active=True
+    ).first()
+    if billboard is None:
+        return 0
+    # A re-saved approval or a duplicate task must not alert twice.
+    claimed = Billboard.objects.filter(pk=billboard_id, saved_search_alerted_at__isnull=True).update(
+        saved_search_alerted_at=timezone.now()
+    )
+    if not claimed:
+        return 0
+
+    by_user = defaultdict(list)
+    users = {}
+    for search in matching_saved_searches(billboard):
+        by_user[search.user_id].append(search)
+        users[search.user_id] = search.user
+
+    notified = 0
+    for user_id, searches in by_user.items():
+        names = [s.name for s in searches if s.name]
+        label = f' "{names[0]}"' if len(names) == 1 else ''
+        notification = create_inbox_notification(
+            user=users[user_id],
+            notification_type=NotificationType.SAVED_SEARCH_MATCH,
+            title='New billboard in your area 📍',
+            body=f'A new billboard in {billboard.city} matches your saved search{label}.',
+            data={
+                'billboard_id': str(billboard.id),
+                'billboard_city': billboard.city,
+                'saved_search_ids': [str(s.id) for s in searches],
+            },
+            content_object=billboard,
+        )
+        if notification is not None:
+            notified += 1
+
+    if by_user:
+        SavedSearch.objects.filter(
+            id__in=[s.id for searches in by_user.values() for s in searches]
+        ).update(last_notified_at=timezone.now())
+    return notified
@@ -1,10 +1,14 @@
 from rest_framework import serializers
 from .availability_utils import build_availability_payload, normalize_booked_dates, get_availability_status
 from .specifications_utils import (
+    active_spec_attributes,
     normalize_specifications,
     validate_specifications_against_attributes,
 )
-from .models import Billboard, Wishlist, OohMediaType
+from .models import Billboard, BillboardImportJob, SavedSearch, Wishlist, OohMediaType
+from .images import SIZE_CARD, SIZE_THUMB, image_sizes, image_url, primary_image_url
+from .trending import trending_score
+from .saved_searches import MAX_SEARCH_RADIUS_KM, MAX_SEARCH_SPAN_DEGREES, bbox_polygon, circle_polygon
 from .media_type_serializers import OohMediaTypeAttributeSerializer
 
 
@@ -73,8 +77,7 @@ class BillboardPreviewSerializer(serializers.ModelSerializer):
         ]
 
     def get_image(self, obj):
-        images = obj.images or []
-        return images[0] if images else None
+        return primary_image_url(obj, SIZE_CARD, self.context.get('request'))
 
     def get_price(self, obj):
         period = (obj.exposure_time or '').strip() or 'per month'
@@ -127,6 +130,27 @@ class BillboardPreviewSerializer(serializers.ModelSerializer):
         return False
 
 
+class BillboardTrendingSerializer(BillboardPreviewSerializer):
+    """Preview card plus the board's current decayed trending score."""
+
+    trending_score = serializers.SerializerMethodField()
+
+    class Meta(BillboardPreviewSerializer.Meta):
+        fields = BillboardPreviewSerializer.Meta.fields + ['trending_score']
+
+    def get_trending_score(self, obj):
+        return trending_score(obj.trending_log, at=self.context.get('now'))
+
+
+class BillboardSimilarSerializer(BillboardPreviewSerializer):
+    """Preview card plus distance from the board being viewed (set as `distance_m` by the view)."""
+
+    distance_m = serializers.FloatField(read_only=True)
+
+    class Meta(BillboardPreviewSerializer.Meta):
+        fields = BillboardPreviewSerializer.Meta.fields + ['distance_m']
+
+
 class SpecificationsJSONField(serializers.JSONField):
     """Accept JSON object or string (multipart form-data) for type-specific billboard data."""
 
@@ -160,6 +184,7 @@ class BillboardSerializer(serializers.ModelSerializer):
         required=False,
     )
     media_type_detail = serializers.SerializerMethodField()
+    image_sizes = serializers.SerializerMethodField()
     
     class Meta:
         model = Billboard
@@ -169,7 +194,7 @@ class BillboardSerializer(serializers.ModelSerializer):
             'price_range', 'currency', 'display_height', 'display_width', 'advertiser_phone',
             'advertiser_whatsapp', 'company_name', 'company_website',
             'ooh_media_type', 'media_type_id', 'media_type_detail', 'ooh_media_id', 'type',
-            'images', 'specifications',
+            'images', 'image_sizes', 'specifications',
             'availability',
             'latitude', 'longitude', 'views', 'leads', 'is_active', 'address',
             'generator_backup', 'created_at', 'user_name',
@@ -190,6 +215,9 @@ class BillboardSerializer(serializers.ModelSerializer):
             return None
         return _media_type_detail_payload(obj.media_type)
 
+    def get_image_sizes(self, obj):
+        return image_sizes(obj, self.context.get('request'))
+
     def validate(self, attrs):
         media_type = attrs.get('media_type')
         ooh_media_type = self.initial_data.get('ooh_media_type') if hasattr(self, 'initial_data') else None
@@ -219,7 +247,11 @@ class BillboardSerializer(serializers.ModelSerializer):
                 specs = {}
             if specs is not None and resolved_type is not None:
                 spec_errors = validate_specifications_against_attributes(
-                    specs, resolved_type
+                    specs,
+                    resolved_type,
+                    attributes=active_spec_attributes(
+                        resolved_type, cache=self.context.get('spec_attributes_cache')
+                    ),
                 )
                 if spec_errors:
                     raise serializers.ValidationError({'specifications': spec_errors})
@@ -295,6 +327,8 @@ class BillboardListSerializer(serializers.ModelSerializer):
     availability = serializers.SerializerMethodField()
     specifications = SpecificationsJSONField(required=False)
     media_type_detail = serializers.SerializerMethodField()
+    # Thumbnails only; full sizes come from the detail endpoint.
+    images = serializers.SerializerMethodField()
     
     class Meta:
         model = Billboard
@@ -324,6 +358,10 @@ class BillboardListSerializer(serializers.ModelSerializer):
             return None
         return _media_type_detail_payload(obj.media_type)
 
+    def get_images(self, obj):
+        request = self.context.get('request')
+        return [image_url(obj, url, SIZE_THUMB, request) for url in obj.images or []]
+
     def get_availability(self, obj):
         payload = build_availability_payload(obj)
         return {
@@ -391,8 +429,7 @@ class BillboardOwnerTileSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_image(self, obj):
-        images = obj.images or []
-        return images[0] if images else None
+        return primary_image_url(obj, SIZE_THUMB, self.context.get('request'))
 
     def get_price(self, obj):
         period = (obj.exposure_time or '').strip() or 'per month'
@@ -485,3 +522,118 @@ class WishlistSerializer(serializers.ModelSerializer):
         except Billboard.DoesNotExist:
             raise serializers.ValidationError("Billboard does not exist")
         return value
+
+
+
+class _PreloadedMediaTypeField(serializers.PrimaryKeyRelatedField):
+    """media_type_id resolved from context['media_types'] ({id: OohMediaType}) without a query per row."""
+
+    def to_internal_value(self, data):
+        media_types = self.context.get('media_types')
+        if media_types is None:
+            return super().to_internal_value(data)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        media_type = media_types.get(pk)
+        if media_type is None:
+            self.fail('does_not_exist', pk_value=data)
+        return media_type
+
+
+class BillboardImportRowSerializer(BillboardSerializer):
+    """
+    Validates one bulk-import row with the same rules as create.
+    Media types and spec attributes come from per-job caches in the context
+    (`media_types`, `spec_attributes_cache`), so validating a row costs no queries.
+    """
+    media_type_id = _PreloadedMediaTypeField(
+        queryset=OohMediaType.objects.filter(is_active=True, is_selectable=True),
+        source='media_type',
+        write_only=True,
+        required=False,
+    )
+
+
+class BillboardImportJobSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = BillboardImportJob
+        fields = [
+            'id', 'status', 'status_display', 'file_format', 'original_filename',
+            'processed_rows', 'created_count', 'error_count', 'errors', 'message',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """
+    Saved search: either `bbox` [west, south, east, north] or `latitude` / `longitude` /
+    `radius_km`, plus optional media type, tier (`type`) and price bounds.
+    """
+    bbox = serializers.ListField(
+        child=serializers.FloatField(), min_length=4, max_length=4, required=False, write_only=True,
+    )
+    latitude = serializers.FloatField(source='center_latitude', required=False, allow_null=True,
+                                      min_value=-90, max_value=90)
+    longitude = serializers.FloatField(source='center_longitude', required=False, allow_null=True,
+                                       min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(required=False, allow_null=True, min_value=0.1,
+                                       max_value=MAX_SEARCH_RADIUS_KM)
+    media_type_id = serializers.PrimaryKeyRelatedField(
+        queryset=OohMediaType.objects.filter(is_active=True),
+        source='media_type',
+        required=False,
+        allow_null=True,
+    )
+    type = serializers.CharField(source='board_type', required=False, allow_blank=True, max_length=50)
+    area_bbox = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id', 'name', 'bbox', 'latitude', 'longitude', 'radius_km', 'area_bbox',
+            'media_type_id', 'type', 'min_price', 'max_price', 'notify',
+            'last_notified_at', 'created_at',
+        ]
+        read_only_fields = ('last_notified_at', 'created_at')
+
+    def get_area_bbox(self, obj):
+        return list(obj.area.extent) if obj.area else None
+
+    def validate(self, attrs):
+        bbox = attrs.pop('bbox', None)
+        lat = attrs.get('center_latitude')
+        lng = attrs.get('center_longitude')
+        radius = attrs.get('radius_km')
+        has_circle = lat is not None and lng is not None and radius is not None
+
+        if bbox is not None and has_circle:
+            raise serializers.ValidationError('Send either bbox or latitude/longitude/radius_km, not both.')
+        if bbox is not None:
+            west, south, east, north = bbox
+            west, east = min(west, east), max(west, east)
+            south, north = min(south, north), max(south, north)
+            if not (-180 <= west and east <= 180 and -90 <= south and north <= 90):
+                raise serializers.ValidationError({'bbox': 'bbox is out of range.'})
+            if east - west > MAX_SEARCH_SPAN_DEGREES or north - south > MAX_SEARCH_SPAN_DEGREES:
+                raise serializers.ValidationError(
+                    {'bbox': f'bbox cannot span more than {MAX_SEARCH_SPAN_DEGREES} degrees.'}
+                )
+            attrs['area'] = bbox_polygon(west, south, east, north)
+            attrs['center_latitude'] = attrs['center_longitude'] = attrs['radius_km'] = None
+        elif has_circle:
+            attrs['area'] = circle_polygon(lat, lng, radius)
+        elif self.instance is None or any(
+            key in attrs for key in ('center_latitude', 'center_longitude', 'radius_km')
+        ):
+            raise serializers.ValidationError('Send bbox or latitude/longitude/radius_km.')
+
+        min_price = attrs.get('min_price', getattr(self.instance, 'min_price', None))
+        max_price = attrs.get('max_price', getattr(self.instance, 'max_price', None))
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError({'max_price': 'max_price must be at least min_price.'})
+        return attrs
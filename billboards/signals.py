@@ -1,12 +1,25 @@
 """
 Django signals for billboard model to handle cache invalidation.
 Ensures cached map data is refreshed when billboards are created/updated/deleted.
+Also keeps the owner dashboard summary row (billboards.dashboard) in step with
+wishlist adds/removals and billboard deletes, queues saved-search alerts
+when a board is approved, queues "similar nearby" refreshes (billboards.similar)
+and image derivative generation (billboards.images), and holds the media_store
+references for the blobs a board's `images` point at.
 """
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
-from .models import Billboard
+from .dashboard import add_owner_counters, rebuild_owner_stats
+from .models import Billboard, Wishlist
+from .similar import SIMILAR_CELL_PRECISION, SIMILAR_SOURCE_FIELDS, mark_billboard_changed, mark_cells
+from .geo_utils import geohash_cells_around
+from .images import missing_variant_urls, release_variants, save_variants
+from .media_store import acquire_blobs, blob_names_from_urls, release_blobs
+from .trending import WEIGHT_WISHLIST, add_trending
 import logging
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
@@ -47,3 +60,117 @@ def invalidate_billboard_cache_on_delete(sender, instance, **kwargs):
     increment_cache_version()
     logger.info(f"Cache invalidated: Billboard {instance.id} deleted")
 
+
+
+def _billboard_owner_id(billboard_id):
+    return Billboard.objects.filter(pk=billboard_id).values_list('user_id', flat=True).first()
+
+
+@receiver(post_save, sender=Wishlist)
+def count_wishlist_add(sender, instance, created, **kwargs):
+    """Owner dashboard: one more wishlist entry on the owner's boards; bumps the trending score."""
+    if created:
+        add_owner_counters({_billboard_owner_id(instance.billboard_id): {'wishlists': 1}})
+        add_trending(Billboard.objects.filter(pk=instance.billboard_id), WEIGHT_WISHLIST)
+
+
+@receiver(post_delete, sender=Wishlist)
+def count_wishlist_remove(sender, instance, **kwargs):
+    """Owner dashboard: one wishlist entry fewer on the owner's boards."""
+    add_owner_counters({_billboard_owner_id(instance.billboard_id): {'wishlists': -1}})
+
+
+@receiver(post_save, sender=Billboard)
+def queue_saved_search_alerts(sender, instance, created, **kwargs):
+    """A board that just became approved + active: alert matching saved searches after commit."""
+    if instance.approval_status != 'approved' or not instance.is_active:
+        return
+    previous = getattr(instance, '_previous_approval_status', None)
+    if not created and previous in (None, 'approved'):
+        return
+    # Deferred: billboards.tasks imports modules that import this one.
+    from .tasks import notify_saved_search_matches_task
+
+    billboard_id = instance.id
+    transaction.on_commit(lambda: notify_saved_search_matches_task.delay(billboard_id))
+
+
+@receiver(post_delete, sender=Billboard)
+def rebuild_dashboard_on_billboard_delete(sender, instance, **kwargs):
+    """A deleted board takes its lifetime views/leads with it; recount the owner's row."""
+    owner_id = instance.user_id
+    if owner_id:
+        transaction.on_commit(lambda: rebuild_owner_stats(owner_id))
+
+
+@receiver(post_save, sender=Billboard)
+def queue_similar_refresh_on_save(sender, instance, update_fields=None, **kwargs):
+    """Location, media type, price or visibility changed: refresh the affected neighbour lists."""
+    if update_fields is not None and not SIMILAR_SOURCE_FIELDS & set(update_fields):
+        return
+    transaction.on_commit(lambda: mark_billboard_changed(instance))
+
+
+@receiver(post_delete, sender=Billboard)
+def queue_similar_refresh_on_delete(sender, instance, **kwargs):
+    """Boards that listed a deleted board are all within the search radius of it."""
+    if instance.latitude is None or instance.longitude is None:
+        return
+    cells = geohash_cells_around(float(instance.latitude), float(instance.longitude), SIMILAR_CELL_PRECISION)
+    transaction.on_commit(lambda: mark_cells(cells))
+
+
+@receiver(post_save, sender=Billboard)
+def queue_image_variants(sender, instance, update_fields=None, **kwargs):
+    """New images on a board: build their resized derivatives after commit."""
+    if update_fields is not None and 'images' not in update_fields:
+        return
+    if not missing_variant_urls(instance):
+        return
+    from .tasks import generate_billboard_image_variants_task
+
+    billboard_id = instance.id
+    transaction.on_commit(lambda: generate_billboard_image_variants_task.delay(billboard_id))
+
+
+def _images_saved(update_fields):
+    return update_fields is None or 'images' in update_fields
+
+
+@receiver(pre_save, sender=Billboard)
+def remember_stored_images(sender, instance, update_fields=None, **kwargs):
+    """Keep the images as stored so post_save can move blob references to the new list."""
+    if instance.pk and _images_saved(update_fields):
+        instance._stored_images = (
+            Billboard.objects.filter(pk=instance.pk).values_list('images', flat=True).first() or []
+        )
+
+
+@receiver(post_save, sender=Billboard)
+def move_image_blob_references(sender, instance, created, update_fields=None, **kwargs):
+    """One media_store reference per image occurrence: take new ones, then drop removed ones."""
+    if not _images_saved(update_fields):
+        return
+    old = Counter(blob_names_from_urls(getattr(instance, '_stored_images', [])))
+    new = Counter(blob_names_from_urls(instance.images))
+    acquire_blobs((new - old).elements())
+    release_blobs((old - new).elements())
+    if not created and list(getattr(instance, '_stored_images', [])) != list(instance.images or []):
+        # Derivatives of removed images go with them.
+        save_variants(instance.pk)
+    instance._stored_images = list(instance.images or [])
+
+
+@receiver(pre_delete, sender=Billboard)
+def remember_stored_variants(sender, instance, **kwargs):
+    """Read image_variants under the row lock: the variants task may have written it since `instance` was loaded."""
+    instance._stored_variants = (
+        Billboard.objects.select_for_update().filter(pk=instance.pk)
+        .values_list('image_variants', flat=True).first() or {}
+    )
+
+
+@receiver(post_delete, sender=Billboard)
+def release_image_blobs(sender, instance, **kwargs):
+    release_blobs(blob_names_from_urls(instance.images))
+    release_variants(getattr(instance, '_stored_variants', instance.image_variants or {}).values())
@@ -0,0 +1,159 @@
+"""
+"Similar boards nearby" — precomputed K-nearest neighbour lists.
+
+For every approved, active board the refresh job stores its SIMILAR_K nearest
+approved boards with the same media type and price band, within
+SIMILAR_MAX_DISTANCE_KM, as BillboardNeighbour rows. On PostgreSQL the nearest
+candidates come from an index-assisted KNN scan (`location <-> point`); the
+detail screen then reads one indexed list instead of running a spatial query.
+
+Lists are refreshed per geohash cell (SIMILAR_CELL_PRECISION, ~5 km). A board
+write queues its own cell, the eight around it (everything within the search
+radius) and the cells of boards currently listing it (covers moves). The
+beat-scheduled task `refresh_similar_billboards_task` drains that queue.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
+from django.db import connections, transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from .geo_utils import geohash_cells_around
+from .models import Billboard, BillboardNeighbour, SimilarRefreshCell
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_K = 10
+SIMILAR_MAX_DISTANCE_KM = 2
+# A precision-5 cell is ~4.9 km tall and ~4.9 km * cos(lat) wide, so the 3x3
+# block around a board covers the search radius up to ~60° latitude.
+SIMILAR_CELL_PRECISION = 5
+# Candidates priced within this factor of the board (either way) share its band.
+PRICE_BAND_RATIO = 2
+SIMILAR_REFRESH_BATCH_CELLS = 200
+
+# Billboard fields whose change can alter a neighbour list.
+SIMILAR_SOURCE_FIELDS = frozenset({
+    'latitude', 'longitude', 'media_type', 'price_range', 'approval_status', 'is_active',
+})
+
+
+def _is_listed(billboard):
+    return billboard.is_active and billboard.approval_status == 'approved'
+
+
+def nearest_similar(billboard, k=SIMILAR_K):
+    """[(neighbour_id, distance_m)] nearest first; empty without a location or media type."""
+    if billboard.location is None or not billboard.media_type_id:
+        return []
+    point = billboard.location
+    queryset = (
+        Billboard.objects.filter(
+            is_active=True,
+            approval_status='approved',
+            media_type_id=billboard.media_type_id,
+            location__dwithin=(point, D(km=SIMILAR_MAX_DISTANCE_KM)),
+        )
+        .exclude(pk=billboard.pk)
+        .annotate(distance_m=Distance('location', point))
+    )
+    # Boards with no parseable price have no band: they match on location and type alone.
+    if billboard.price_min is not None:
+        queryset = queryset.filter(
+            price_min__gte=billboard.price_min / PRICE_BAND_RATIO,
+            price_min__lte=billboard.price_min * PRICE_BAND_RATIO,
+        )
+
+    if connections[queryset.db].vendor == 'postgresql':
+        # `<->` lets the GiST index return rows in distance order.
+        queryset = queryset.order_by(RawSQL('location <-> ST_GeogFromText(%s)', (point.ewkt,)), 'id')
+    else:
+        queryset = queryset.order_by('distance_m', 'id')
+    return [(row['id'], row['distance_m'].m) for row in queryset.values('id', 'distance_m')[:k]]
+
+
+def rebuild_neighbours(billboards):
+    """Replace the neighbour rows of `billboards`; unlisted boards end up with none."""
+    billboards = list(billboards)
+    rows = []
+    for billboard in billboards:
+        if not _is_listed(billboard):
+            continue
+        rows.extend(
+            BillboardNeighbour(billboard=billboard, neighbour_id=neighbour_id, rank=rank, distance_m=distance_m)
+            for rank, (neighbour_id, distance_m) in enumerate(nearest_similar(billboard), start=1)
+        )
+    with transaction.atomic():
+        BillboardNeighbour.objects.filter(billboard__in=billboards).delete()
+        BillboardNeighbour.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_cell(cell):
+    """Recompute the neighbour list of every board whose geohash lies in `cell`."""
+    return rebuild_neighbours(Billboard.objects.filter(geohash__startswith=cell))
+
+
+def mark_cells(cells):
+    """Queue geohash cells for the refresh job (re-marking bumps `marked_at`)."""
+    cells = {cell for cell in cells if cell}
+    if not cells:
+        return
+    now = timezone.now()
+    SimilarRefreshCell.objects.bulk_create(
+        [SimilarRefreshCell(cell=cell, marked_at=now) for cell in cells],
+        update_conflicts=True,
+        unique_fields=['cell'],
+        update_fields=['marked_at'],
+    )
+
+
+def cells_around(billboard):
+    """The board's cell and the eight around it (everything within the search radius)."""
+    if billboard.latitude is None or billboard.longitude is None:
+        return set()
+    return geohash_cells_around(float(billboard.latitude), float(billboard.longitude), SIMILAR_CELL_PRECISION)
+
+
+def cells_touched_by(billboard):
+    """Cells whose lists may change when `billboard` is written or deleted."""
+    cells = set(
+        BillboardNeighbour.objects.filter(neighbour_id=billboard.pk)
+        .values_list('billboard__geohash', flat=True)
+    )
+    cells |= cells_around(billboard)
+    return {cell[:SIMILAR_CELL_PRECISION] for cell in cells if cell}
+
+
+def mark_billboard_changed(billboard):
+    """Queue the cells a board write touches; drops the board's own list when it left the index."""
+    if billboard.geohash is None:
+        BillboardNeighbour.objects.filter(billboard_id=billboard.pk).delete()
+    mark_cells(cells_touched_by(billboard))
+
+
+def refresh_dirty_cells(limit=SIMILAR_REFRESH_BATCH_CELLS):
+    """Drain up to `limit` queued cells, oldest first. Returns the number refreshed."""
+    queued = list(SimilarRefreshCell.objects.order_by('marked_at')[:limit])
+    for entry in queued:
+        refresh_cell(entry.cell)
+        # A cell re-marked while it was being rebuilt stays queued.
+        SimilarRefreshCell.objects.filter(pk=entry.pk, marked_at__lte=entry.marked_at).delete()
+    return len(queued)
+
+
+def similar_billboards(billboard_id, limit=SIMILAR_K):
+    """[(Billboard, distance_m)] from the stored list, skipping boards no longer listed."""
+    links = list(
+        BillboardNeighbour.objects.filter(billboard_id=billboard_id)
+        .order_by('rank').values_list('neighbour_id', 'distance_m')[:limit]
+    )
+    boards = Billboard.objects.filter(
+        id__in=[neighbour_id for neighbour_id, _ in links], is_active=True, approval_status='approved'
+    ).in_bulk()
+    return [(boards[neighbour_id], distance_m) for neighbour_id, distance_m in links if neighbour_id in boards]
@@ -5,6 +5,9 @@ from __future__ import annotations
 import json
 
 MAX_SPECIFICATIONS_BYTES = 20_480  # 20 KB
+SPEC_FILTER_PREFIX = 'spec__'
+MAX_SPEC_FILTERS = 10
+MAX_SPEC_FILTER_VALUES = 20
 
 
 def normalize_specifications(value):
@@ -137,19 +140,33 @@ def _validate_field_value(attr, value):
     return None
 
 
-def validate_specifications_against_attributes(specifications, media_type):
+def active_spec_attributes(media_type, cache=None):
+    """
+    Active OohMediaTypeAttribute rows for media_type, in display order.
+    Pass a dict as `cache` to reuse the lookup across many rows (bulk import).
+    """
+    if cache is not None and media_type.id in cache:
+        return cache[media_type.id]
+    attributes = list(
+        media_type.attributes.filter(is_active=True).order_by('order', 'id')
+    )
+    if cache is not None:
+        cache[media_type.id] = attributes
+    return attributes
+
+
+def validate_specifications_against_attributes(specifications, media_type, attributes=None):
     """
     Validate specs against active OohMediaTypeAttribute rows for media_type.
 
     Returns a dict of field errors (empty if valid). Caller should raise under
-    the `specifications` key.
+    the `specifications` key. `attributes` skips the lookup when already loaded.
     """
     if media_type is None:
         return {}
 
-    attributes = list(
-        media_type.attributes.filter(is_active=True).order_by('order', 'id')
-    )
+    if attributes is None:
+        attributes = active_spec_attributes(media_type)
     if not attributes:
         return {}
 
@@ -176,3 +193,97 @@ def validate_specifications_against_attributes(specifications, media_type):
             errors[attr.key] = msg
 
     return errors
+
+
+def _spec_filter_candidates(attr, raw):
+    """
+    JSON values a stored spec may hold for one query-string token under `attr`.
+    Numbers also match their string form, since validation accepts numeric strings.
+    Returns None when the token is not valid for the attribute type.
+    """
+    raw = raw.strip()
+    field_type = attr.field_type
+
+    if field_type == 'boolean':
+        lowered = raw.lower()
+        if lowered in ('true', '1', 'yes'):
+            return [True]
+        if lowered in ('false', '0', 'no'):
+            return [False]
+        return None
+
+    if field_type in ('integer', 'number'):
+        num = _coerce_number(raw)
+        if num is None:
+            return None
+        if field_type == 'integer':
+            if not num.is_integer():
+                return None
+            return [int(num), str(int(num))]
+        value = int(num) if num.is_integer() else num
+        return [value, raw] if raw != str(value) else [value]
+
+    if field_type in ('select', 'multiselect'):
+        options = attr.options if isinstance(attr.options, list) else []
+        # Options can be numbers in the schema; match the query token against their text.
+        matches = [option for option in options if str(option) == raw]
+        return matches or None
+
+    return [raw] if raw else None
+
+
+def build_spec_filter_values(params, attributes):
+    """
+    Parse `spec__<key>=<v1>,<v2>` query params against attribute definitions.
+
+    `attributes` are the candidate OohMediaTypeAttribute rows (several media types
+    may define the same key). Returns ({key: [(field_type, json_value), ...]}, errors);
+    values for one key are OR-ed, keys are AND-ed by the caller.
+    """
+    by_key = {}
+    for attr in attributes:
+        by_key.setdefault(attr.key, []).append(attr)
+
+    wanted = {
+        name[len(SPEC_FILTER_PREFIX):]: value
+        for name, value in params.items()
+        if name.startswith(SPEC_FILTER_PREFIX)
+    }
+    errors = {}
+    if len(wanted) > MAX_SPEC_FILTERS:
+        errors['specifications'] = f'At most {MAX_SPEC_FILTERS} spec__ filters are allowed.'
+        return {}, errors
+
+    parsed = {}
+    for key, raw in wanted.items():
+        param = f'{SPEC_FILTER_PREFIX}{key}'
+        definitions = by_key.get(key)
+        if not definitions:
+            errors[param] = 'Unknown specification key.'
+            continue
+        tokens = [token for token in str(raw).split(',') if token.strip()]
+        if not tokens:
+            errors[param] = 'A value is required.'
+            continue
+        if len(tokens) > MAX_SPEC_FILTER_VALUES:
+            errors[param] = f'At most {MAX_SPEC_FILTER_VALUES} values are allowed.'
+            continue
+
+        values = []
+        for token in tokens:
+            matched = False
+            for attr in definitions:
+                candidates = _spec_filter_candidates(attr, token)
+                if candidates is None:
+                    continue
+                matched = True
+                for candidate in candidates:
+                    if (attr.field_type, candidate) not in values:
+                        values.append((attr.field_type, candidate))
+            if not matched:
+                errors[param] = f'Invalid value {token.strip()!r} for this specification.'
+                break
+        if param not in errors:
+            parsed[key] = values
+
+    return parsed, errors
@@ -2,7 +2,14 @@ import logging
 
 from celery import shared_task
 
+from .analytics import rollup_billboard_analytics
+from .bulk_import import fail_stale_import_jobs, run_import_job
+from .images import generate_billboard_image_variants
+from .partitions import apply_partition_retention, ensure_future_partitions
+from .saved_searches import notify_saved_search_matches
+from .similar import refresh_dirty_cells
 from .tracking import record_billboard_lead, record_billboard_view
+from .tracking_buffer import drain_tracking_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -37,3 +44,79 @@ def track_billboard_lead_task(self, billboard_id, user_id=None, user_ip=None, us
     except Exception as exc:
         logger.exception('track_billboard_lead_task failed billboard=%s', billboard_id)
         raise self.retry(exc=exc) from exc
+
+
+@shared_task(ignore_result=True)
+def drain_tracking_buffer_task():
+    """Beat-scheduled: bulk-persist buffered view/lead events (see tracking_buffer)."""
+    processed = drain_tracking_buffer()
+    if processed:
+        logger.info('drain_tracking_buffer_task processed=%s', processed)
+    return processed
+
+
+@shared_task(ignore_result=True)
+def rollup_billboard_analytics_task():
+    """Beat-scheduled: fold new View/Lead/Wishlist rows into the hourly/daily rollups."""
+    processed = rollup_billboard_analytics()
+    if any(processed.values()):
+        logger.info('rollup_billboard_analytics_task processed=%s', processed)
+    return processed
+
+
+@shared_task(ignore_result=True)
+def maintain_tracking_partitions_task():
+    """Beat-scheduled (daily): create upcoming View/Lead partitions; apply retention if enabled."""
+    created = ensure_future_partitions()
+    dropped = apply_partition_retention()
+    if created or dropped:
+        logger.info('maintain_tracking_partitions_task created=%s dropped=%s', created, dropped)
+    return {'created': created, 'dropped': dropped}
+
+
+@shared_task(ignore_result=True)
+def import_billboards_task(job_id):
+    """Run a queued BillboardImportJob (see billboards/bulk_import.py)."""
+    job_pk = run_import_job(job_id)
+    logger.info('import_billboards_task job=%s ran=%s', job_id, job_pk is not None)
+    return job_pk
+
+
+@shared_task(ignore_result=True)
+def fail_stale_import_jobs_task():
+    """Beat-scheduled: fail import jobs whose worker died while RUNNING."""
+    failed = fail_stale_import_jobs()
+    if failed:
+        logger.warning('fail_stale_import_jobs_task failed=%s', failed)
+    return failed
+
+
+@shared_task(ignore_result=True)
+def notify_saved_search_matches_task(billboard_id):
+    """Alert users whose saved search contains a newly approved billboard."""
+    notified = notify_saved_search_matches(billboard_id)
+    if notified:
+        logger.info('notify_saved_search_matches_task billboard=%s users=%s', billboard_id, notified)
+    return notified
+
+
+@shared_task(ignore_result=True)
+def refresh_similar_billboards_task():
+    """Beat-scheduled: rebuild "similar nearby" lists for geohash cells touched by board writes."""
+    refreshed = refresh_dirty_cells()
+    if refreshed:
+        logger.info('refresh_similar_billboards_task cells=%s', refreshed)
+    return refreshed
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30, ignore_result=True)
+def generate_billboard_image_variants_task(self, billboard_id):
+    """Write 256/768/1600 px WebP + JPEG derivatives for a board's new images."""
+    try:
+        processed = generate_billboard_image_variants(billboard_id)
+    except Exception as exc:
+        logger.exception('generate_billboard_image_variants_task failed billboard=%s', billboard_id)
+        raise self.retry(exc=exc) from exc
+    if processed:
+        logger.info('generate_billboard_image_variants_task billboard=%s images=%s', billboard_id, processed)
+    return processed
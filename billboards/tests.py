@@ -1,3 +1,92 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .numeric_utils import parse_daily_views, parse_dimension_m, parse_price_range
+
+
+class ParsePriceRangeTests(SimpleTestCase):
+    def assertRange(self, raw, low, high):
+        expected = (
+            Decimal(low) if low is not None else None,
+            Decimal(high) if high is not None else None,
+        )
+        self.assertEqual(parse_price_range(raw), expected, raw)
+
+    def test_single_amount(self):
+        self.assertRange('8000', '8000', '8000')
+        self.assertRange('PKR 120000', '120000', '120000')
+
+    def test_explicit_ranges(self):
+        self.assertRange('30,000-50,000', '30000', '50000')
+        self.assertRange('30000 – 50000', '30000', '50000')
+        self.assertRange('PKR 30k to 50k per month', '30000', '50000')
+        self.assertRange('50000-30000', '30000', '50000')
+        self.assertRange('30-50k', '30000', '50000')
+
+    def test_periods_are_not_prices(self):
+        self.assertRange('PKR 150,000 / 30 days', '150000', '150000')
+        self.assertRange('100000/month (3 months min)', '100000', '100000')
+        self.assertRange('PKR 200k for 2 weeks', '200000', '200000')
+        self.assertRange('Rs. 75,000 per month, 6 months', '75000', '75000')
+
+    def test_suffixes(self):
+        self.assertRange('1.5M', '1500000', '1500000')
+        self.assertRange('250K monthly', '250000', '250000')
+        self.assertRange('120000 monthly', '120000', '120000')
+
+    def test_lakh_and_crore(self):
+        self.assertRange('PKR 5 lac', '500000', '500000')
+        self.assertRange('2.5 lakh', '250000', '250000')
+        self.assertRange('3 lakhs per month', '300000', '300000')
+        self.assertRange('1.2 crore', '12000000', '12000000')
+        self.assertRange('5-10 lac', '500000', '1000000')
+
+    def test_duration_is_not_a_range_end(self):
+        self.assertRange('Rs 50000 - 1 month', '50000', '50000')
+        self.assertRange('Rs 30,000 - Rs 50,000', '30000', '50000')
+
+    def test_ambiguous_text_is_null(self):
+        self.assertRange('50000 or 60000', None, None)
+        self.assertRange('30000-50000 for 3 boards', None, None)
+
+    def test_unparseable(self):
+        self.assertRange('', None, None)
+        self.assertRange(None, None, None)
+        self.assertRange('on request', None, None)
+        self.assertRange('6 months', None, None)
+        self.assertRange('99999999999', None, None)
+
+
+class ParseDailyViewsTests(SimpleTestCase):
+    def test_counts(self):
+        self.assertEqual(parse_daily_views('50,000'), 50000)
+        self.assertEqual(parse_daily_views('50k'), 50000)
+        self.assertEqual(parse_daily_views('1.2M'), 1200000)
+        self.assertEqual(parse_daily_views('approx 2 million'), 2000000)
+        self.assertEqual(parse_daily_views('3 lakh daily'), 300000)
+
+    def test_not_counts(self):
+        self.assertIsNone(parse_daily_views('12 months'))
+        self.assertIsNone(parse_daily_views('high'))
+        self.assertIsNone(parse_daily_views(''))
+
+
+class ParseDimensionTests(SimpleTestCase):
+    def test_units(self):
+        self.assertEqual(parse_dimension_m('6'), Decimal('6.00'))
+        self.assertEqual(parse_dimension_m('6 m'), Decimal('6.00'))
+        self.assertEqual(parse_dimension_m('600cm'), Decimal('6.00'))
+        self.assertEqual(parse_dimension_m('20ft'), Decimal('6.10'))
+        self.assertEqual(parse_dimension_m("20'"), Decimal('6.10'))
+        self.assertEqual(parse_dimension_m('6 metres'), Decimal('6.00'))
+
+    def test_pair_takes_trailing_unit(self):
+        self.assertEqual(parse_dimension_m('10 x 20 ft'), Decimal('3.05'))
+        self.assertEqual(parse_dimension_m('10x20'), Decimal('10.00'))
+        self.assertEqual(parse_dimension_m('6m x 3m'), Decimal('6.00'))
+
+    def test_other_words(self):
+        self.assertIsNone(parse_dimension_m('12 months'))
+        self.assertIsNone(parse_dimension_m('10 x 20 panels'))
+        self.assertIsNone(parse_dimension_m('large'))
@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
 
 from django.db import transaction
 from django.db.models import F
+from django.utils import timezone
 
 from notifications.models import NotificationType
 from notifications.inbox_service import create_inbox_notification
 
+from .dashboard import add_owner_counters, add_tracking_counts
 from .models import Billboard, Lead, View
+from .trending import WEIGHT_LEAD, WEIGHT_VIEW, trending_increment
+from .tracking_dedup import mark_seen_many, maybe_seen, maybe_seen_many, member_for
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +27,9 @@ TRACK_NOT_FOUND = 'not_found'
 
 
 def _interaction_exists(model, billboard_id, user_id, user_ip):
+    member = member_for(user_id, user_ip)
+    if member is not None and not maybe_seen(model, billboard_id, member):
+        return False
     if user_id:
         return model.objects.filter(billboard_id=billboard_id, user_id=user_id).exists()
     if user_ip:
@@ -87,7 +96,11 @@ def record_billboard_view(billboard_id, user_id=None, user_ip=None, user_agent='
         user_ip=user_ip,
         user_agent=user_agent or '',
     )
-    Billboard.objects.filter(pk=billboard_id).update(views=F('views') + 1)
+    mark_seen_many(View, [(billboard_id, user_id, user_ip)])
+    Billboard.objects.filter(pk=billboard_id).update(
+        views=F('views') + 1, trending_log=trending_increment(WEIGHT_VIEW)
+    )
+    add_owner_counters({billboard.user_id: {'views': 1}})
     view_count = (
         Billboard.objects.filter(pk=billboard_id).values_list('views', flat=True).first()
     )
@@ -115,7 +128,201 @@ def record_billboard_lead(billboard_id, user_id=None, user_ip=None, user_agent='
         user_ip=user_ip,
         user_agent=user_agent or '',
     )
-    Billboard.objects.filter(pk=billboard_id).update(leads=F('leads') + 1)
+    mark_seen_many(Lead, [(billboard_id, user_id, user_ip)])
+    Billboard.objects.filter(pk=billboard_id).update(
+        leads=F('leads') + 1, trending_log=trending_increment(WEIGHT_LEAD)
+    )
+    add_owner_counters({billboard.user_id: {'leads': 1}})
     billboard_for_notify = Billboard.objects.select_related('user').get(pk=billboard_id)
     _send_lead_notification(billboard_for_notify)
     return TRACK_RECORDED
+
+
+def _dedup_key(event):
+    """Same identity rule as _interaction_exists: user first, then IP; None = no dedup."""
+    if event.get('user_id'):
+        return ('user', event['user_id'])
+    if event.get('user_ip'):
+        return ('ip', event['user_ip'])
+    return None
+
+
+def _member(key):
+    kind, value = key
+    return f'{kind}:{value}'
+
+
+def _existing_interaction_keys(model, candidates):
+    """
+    Set of (billboard_id, dedup_key) already stored, in two set-based queries
+    (by user and by IP) instead of one EXISTS per event. Pairs the Bloom filter
+    rules out are never sent to the DB.
+    """
+    candidates = list(candidates)
+    flags = maybe_seen_many(model, [(b, _member(key)) for b, key in candidates])
+    candidates = {pair for pair, maybe in zip(candidates, flags) if maybe}
+    if not candidates:
+        return set()
+
+    billboard_ids = {billboard_id for billboard_id, _ in candidates}
+    user_ids = {value for _, (kind, value) in candidates if kind == 'user'}
+    ips = {value for _, (kind, value) in candidates if kind == 'ip'}
+
+    existing = set()
+    if user_ids:
+        rows = model.objects.filter(
+            billboard_id__in=billboard_ids,
+            user_id__in=user_ids,
+        ).values_list('billboard_id', 'user_id').distinct()
+        existing.update((billboard_id, ('user', user_id)) for billboard_id, user_id in rows)
+    if ips:
+        rows = model.objects.filter(
+            billboard_id__in=billboard_ids,
+            user_ip__in=ips,
+        ).values_list('billboard_id', 'user_ip').distinct()
+        existing.update((billboard_id, ('ip', user_ip)) for billboard_id, user_ip in rows)
+    return existing & candidates
+
+
+def _select_new_interactions(model, events, owners):
+    """Drop unknown billboards, owner self-events and duplicates (in batch and in DB)."""
+    fresh = []
+    seen = set()
+    for event in events:
+        billboard_id = event['billboard_id']
+        if billboard_id not in owners:
+            continue
+        owner_id = owners[billboard_id]
+        if owner_id and event.get('user_id') and owner_id == event['user_id']:
+            continue
+        key = _dedup_key(event)
+        if key is not None:
+            if (billboard_id, key) in seen:
+                continue
+            seen.add((billboard_id, key))
+        fresh.append((event, key))
+
+    keyed = {(event['billboard_id'], key) for event, key in fresh if key is not None}
+    already_stored = _existing_interaction_keys(model, keyed) if keyed else set()
+    return [
+        event for event, key in fresh
+        if key is None or (event['billboard_id'], key) not in already_stored
+    ]
+
+
+def _event_time(event, now):
+    """When the event happened (it is drained later); never after `now`, against web-node clock skew."""
+    try:
+        happened = datetime.fromtimestamp(float(event['ts']), tz=dt_timezone.utc)
+    except (KeyError, TypeError, ValueError, OverflowError, OSError):
+        return now
+    return min(happened, now)
+
+
+_TRENDING_WEIGHTS = {'views': WEIGHT_VIEW, 'leads': WEIGHT_LEAD}
+
+
+def _apply_counter_increments(field, counts):
+    """
+    One F() UPDATE per billboard (counter + trending score);
+    returns {billboard_id: (old_value, new_value)}.
+    """
+    for billboard_id, n in counts.items():
+        Billboard.objects.filter(pk=billboard_id).update(**{
+            field: F(field) + n,
+            'trending_log': trending_increment(_TRENDING_WEIGHTS[field] * n),
+        })
+    current = dict(
+        Billboard.objects.filter(pk__in=counts).values_list('id', field)
+    )
+    return {
+        billboard_id: (current.get(billboard_id, 0) - n, current.get(billboard_id, 0))
+        for billboard_id, n in counts.items()
+    }
+
+
+def _send_batch_notifications(view_totals, lead_counts):
+    notify_ids = set(lead_counts)
+    milestones = {}
+    for billboard_id, (old, new) in view_totals.items():
+        if new // 10 > old // 10:
+            milestones[billboard_id] = new // 10 * 10
+            notify_ids.add(billboard_id)
+    if not notify_ids:
+        return
+
+    billboards = Billboard.objects.select_related('user').in_bulk(notify_ids)
+    for billboard_id, milestone in milestones.items():
+        billboard = billboards.get(billboard_id)
+        if billboard is not None:
+            _send_view_milestone_notification(billboard, milestone)
+    for billboard_id in lead_counts:
+        billboard = billboards.get(billboard_id)
+        if billboard is not None:
+            _send_lead_notification(billboard)
+
+
+def record_tracking_batch(events, acknowledge=None):
+    """
+    Persist a drained batch of buffered view/lead events (see tracking_buffer).
+
+    Per batch: one owner lookup, two dedup queries per interaction type, one
+    bulk_create per model, one F() UPDATE per touched billboard and one per
+    touched owner's dashboard row. `acknowledge` runs right after the commit,
+    before notifications are sent.
+    Returns {'views': n, 'leads': n} actually recorded.
+    """
+    events = [e for e in events if e.get('billboard_id')]
+    if not events:
+        if acknowledge:
+            acknowledge()
+        return {'views': 0, 'leads': 0}
+
+    owners = dict(
+        Billboard.objects.filter(pk__in={e['billboard_id'] for e in events})
+        .values_list('id', 'user_id')
+    )
+    view_events = [e for e in events if e.get('kind') == 'view']
+    lead_events = [e for e in events if e.get('kind') == 'lead']
+
+    with transaction.atomic():
+        if acknowledge:
+            transaction.on_commit(acknowledge)
+        new_views = _select_new_interactions(View, view_events, owners)
+        new_leads = _select_new_interactions(Lead, lead_events, owners)
+
+        now = timezone.now()
+        View.objects.bulk_create([
+            View(
+                billboard_id=e['billboard_id'],
+                user_id=e.get('user_id'),
+                user_ip=e.get('user_ip'),
+                user_agent=e.get('user_agent') or '',
+                created_at=_event_time(e, now),
+            )
+            for e in new_views
+        ])
+        Lead.objects.bulk_create([
+            Lead(
+                billboard_id=e['billboard_id'],
+                user_id=e.get('user_id'),
+                user_ip=e.get('user_ip'),
+                user_agent=e.get('user_agent') or '',
+                created_at=_event_time(e, now),
+            )
+            for e in new_leads
+        ])
+
+        mark_seen_many(View, [(e['billboard_id'], e.get('user_id'), e.get('user_ip')) for e in new_views])
+        mark_seen_many(Lead, [(e['billboard_id'], e.get('user_id'), e.get('user_ip')) for e in new_leads])
+
+        view_counts = Counter(e['billboard_id'] for e in new_views)
+        lead_counts = Counter(e['billboard_id'] for e in new_leads)
+        view_totals = _apply_counter_increments('views', view_counts) if view_counts else {}
+        if lead_counts:
+            _apply_counter_increments('leads', lead_counts)
+        add_tracking_counts('views', view_counts, owners)
+        add_tracking_counts('leads', lead_counts, owners)
+
+    _send_batch_notifications(view_totals, lead_counts)
+    return {'views': len(new_views), 'leads': len(new_leads)}
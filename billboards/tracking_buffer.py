@@ -0,0 +1,168 @@
+"""
+Redis buffer for view/lead tracking events.
+
+The track-view / track-lead endpoints RPUSH one small JSON event; a beat-scheduled
+Celery task drains the list in batches and hands them to
+`billboards.tracking.record_tracking_batch` (bulk insert + aggregated counters).
+If Redis is unavailable the event falls back to the per-event Celery task.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = 'billboards:tracking:events'
+PROCESSING_KEY = 'billboards:tracking:processing'
+DRAIN_LOCK_KEY = 'billboards:tracking:drain_lock'
+DRAIN_BATCH_SIZE = 2000
+DRAIN_MAX_BATCHES = 10
+
+# KEYS[1] buffer, KEYS[2] processing; ARGV[1] batch size. Returns the moved events.
+_CLAIM_SCRIPT = """
+local moved = {}
+for i = 1, tonumber(ARGV[1]) do
+    local event = redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT')
+    if not event then break end
+    moved[i] = event
+end
+return moved
+"""
+
+# KEYS[1] processing, KEYS[2] buffer. Returns the number of events moved back.
+_REQUEUE_SCRIPT = """
+local count = 0
+while redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT') do
+    count = count + 1
+end
+return count
+"""
+
+EVENT_VIEW = 'view'
+EVENT_LEAD = 'lead'
+
+_client = None
+
+
+def get_tracking_redis():
+    """Shared redis-py client for the tracking buffer (lazy, per process)."""
+    global _client
+    if _client is None:
+        import redis
+
+        _client = redis.Redis.from_url(
+            settings.TRACKING_REDIS_URL,
+            socket_timeout=2,
+            socket_connect_timeout=2,
+        )
+    return _client
+
+
+def _enqueue_fallback(kind, billboard_id, user_id, user_ip, user_agent):
+    from .tasks import track_billboard_lead_task, track_billboard_view_task
+
+    task = track_billboard_lead_task if kind == EVENT_LEAD else track_billboard_view_task
+    task.delay(
+        billboard_id=billboard_id,
+        user_id=user_id,
+        user_ip=user_ip,
+        user_agent=user_agent,
+    )
+
+
+def buffer_tracking_event(kind, billboard_id, user_id=None, user_ip=None, user_agent=''):
+    """Queue one view/lead event for the next batch drain."""
+    if not getattr(settings, 'TRACKING_BUFFER_ENABLED', True):
+        _enqueue_fallback(kind, billboard_id, user_id, user_ip, user_agent)
+        return
+
+    event = json.dumps({
+        'kind': kind,
+        'billboard_id': int(billboard_id),
+        'user_id': user_id,
+        'user_ip': user_ip,
+        'user_agent': (user_agent or '')[:512],
+        'ts': time.time(),
+    }, separators=(',', ':'))
+    try:
+        get_tracking_redis().rpush(BUFFER_KEY, event)
+    except Exception as exc:
+        logger.warning('Tracking buffer unavailable, falling back to task: %s', exc)
+        _enqueue_fallback(kind, billboard_id, user_id, user_ip, user_agent)
+
+
+def _claim_batch(client, size):
+    """
+    Move up to `size` events from the head of the buffer to the processing list
+    (atomically) and return them parsed. They stay there until acknowledged.
+    """
+    raw_events = client.register_script(_CLAIM_SCRIPT)(keys=[BUFFER_KEY, PROCESSING_KEY], args=[size])
+
+    events = []
+    for raw in raw_events:
+        try:
+            events.append(json.loads(raw))
+        except (TypeError, ValueError):
+            logger.warning('Dropping malformed tracking event: %r', raw[:200])
+    return len(raw_events), events
+
+
+def _requeue_unacknowledged(client):
+    """Put events claimed but never committed back at the head of the buffer, in order."""
+    restored = client.register_script(_REQUEUE_SCRIPT)(keys=[PROCESSING_KEY, BUFFER_KEY])
+    if restored:
+        logger.warning('Re-queued %s unacknowledged tracking events', restored)
+    return restored
+
+
+def drain_tracking_buffer(batch_size=DRAIN_BATCH_SIZE, max_batches=DRAIN_MAX_BATCHES):
+    """
+    Drain buffered events into the DB. One drainer at a time (Redis lock), so
+    in-memory dedup within a batch is not raced by another worker.
+
+    Reliable-queue handoff: a batch is LMOVEd to a processing list and removed
+    from it only once its DB transaction commits. A failure before the commit
+    (or a crash, recovered by the next drain) puts the batch back; a failure
+    after it (notifications) does not, so events are never recorded twice.
+    Returns the number of events processed.
+    """
+    from .tracking import record_tracking_batch
+
+    client = get_tracking_redis()
+    lock = client.lock(DRAIN_LOCK_KEY, timeout=120, blocking_timeout=0)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    processed = 0
+    try:
+        _requeue_unacknowledged(client)
+        for _ in range(max_batches):
+            claimed, events = _claim_batch(client, batch_size)
+            if not claimed:
+                break
+            committed = []
+
+            def acknowledge():
+                committed.append(True)
+                client.delete(PROCESSING_KEY)
+
+            try:
+                record_tracking_batch(events, acknowledge=acknowledge)
+            except Exception:
+                if not committed:
+                    _requeue_unacknowledged(client)
+                raise
+            processed += len(events)
+            if claimed < batch_size:
+                break
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+    return processed
@@ -0,0 +1,186 @@
+"""
+Per-billboard Bloom filters (Redis bitmaps) in front of View/Lead dedup queries.
+
+A filter answers "definitely not seen" or "maybe seen" for a (billboard, user/IP)
+pair. Only "maybe seen" pairs fall through to the indexed EXISTS / IN query.
+Filters are trusted only after `rebuild_tracking_filters` has populated them from
+history (per-kind ready flag); until then, and whenever Redis is unavailable,
+every pair is reported as "maybe seen" so the DB stays authoritative.
+
+Dedup is lifetime (not windowed), so filter keys do not expire; a false positive
+only costs the DB check that would have run anyway. Partition retention
+(settings.TRACKING_PARTITION_RETENTION, off by default) narrows "lifetime" to the
+retained months for the DB check and for filter rebuilds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+FILTER_BITS = 1 << 14  # 2 KB per billboard and kind (~0.5% FP at 1k unique visitors)
+FILTER_HASHES = 3
+KEY_PREFIX = 'billboards:seen'
+# Rebuild: rows this far before the start are marked again at the end (in-flight writes).
+REBUILD_CATCHUP = timedelta(minutes=5)
+REBUILD_LOCK_TIMEOUT = 6 * 60 * 60
+REBUILD_LOCK_WAIT = 300
+
+
+def _kind(model):
+    return model._meta.model_name  # 'view' / 'lead'
+
+
+def filter_key(kind, billboard_id):
+    return f'{KEY_PREFIX}:{kind}:{billboard_id}'
+
+
+def ready_key(kind):
+    return f'{KEY_PREFIX}:{kind}:ready'
+
+
+def member_for(user_id=None, user_ip=None):
+    """Dedup identity, same precedence as tracking._interaction_exists (user, then IP)."""
+    if user_id:
+        return f'user:{user_id}'
+    if user_ip:
+        return f'ip:{user_ip}'
+    return None
+
+
+def members_to_mark(user_id=None, user_ip=None):
+    """
+    Identities a stored row answers for: an IP-only lookup matches any row with
+    that IP (even if it also has a user), so both are marked.
+    """
+    members = []
+    if user_id:
+        members.append(f'user:{user_id}')
+    if user_ip:
+        members.append(f'ip:{user_ip}')
+    return members
+
+
+def _offsets(member):
+    digest = hashlib.blake2b(member.encode(), digest_size=4 * FILTER_HASHES).digest()
+    return [
+        int.from_bytes(digest[i * 4:(i + 1) * 4], 'big') % FILTER_BITS
+        for i in range(FILTER_HASHES)
+    ]
+
+
+def _client():
+    from .tracking_buffer import get_tracking_redis
+
+    return get_tracking_redis()
+
+
+def maybe_seen_many(model, pairs):
+    """
+    pairs: iterable of (billboard_id, member). Returns a list of bools aligned with
+    pairs; False means "definitely never recorded" and the DB check can be skipped.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    kind = _kind(model)
+    try:
+        client = _client()
+        if not client.exists(ready_key(kind)):
+            return [True] * len(pairs)
+        pipe = client.pipeline(transaction=False)
+        for billboard_id, member in pairs:
+            key = filter_key(kind, billboard_id)
+            for offset in _offsets(member):
+                pipe.getbit(key, offset)
+        bits = pipe.execute()
+    except Exception as exc:
+        logger.warning('Tracking dedup filter unavailable: %s', exc)
+        return [True] * len(pairs)
+
+    return [
+        all(bits[i * FILTER_HASHES:(i + 1) * FILTER_HASHES])
+        for i in range(len(pairs))
+    ]
+
+
+def maybe_seen(model, billboard_id, member):
+    return maybe_seen_many(model, [(billboard_id, member)])[0]
+
+
+def _write_marks(client, kind, rows):
+    pipe = client.pipeline(transaction=False)
+    for billboard_id, user_id, user_ip in rows:
+        key = filter_key(kind, billboard_id)
+        for member in members_to_mark(user_id, user_ip):
+            for offset in _offsets(member):
+                pipe.setbit(key, offset, 1)
+    pipe.execute()
+
+
+def mark_seen_many(model, rows):
+    """Add (billboard_id, user_id, user_ip) rows to the filters. Best effort."""
+    rows = list(rows)
+    if not rows:
+        return
+    try:
+        _write_marks(_client(), _kind(model), rows)
+    except Exception as exc:
+        logger.warning('Tracking dedup filter update failed: %s', exc)
+
+
+def _load_rows(client, kind, queryset, chunk_size):
+    loaded = 0
+    batch = []
+    for row in queryset.values_list('billboard_id', 'user_id', 'user_ip').iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            _write_marks(client, kind, batch)
+            loaded += len(batch)
+            batch.clear()
+    if batch:
+        _write_marks(client, kind, batch)
+        loaded += len(batch)
+    return loaded
+
+
+def rebuild_filters(model, chunk_size=5000):
+    """
+    Rebuild all filters for `model` from stored rows. The ready flag is cleared
+    first, so dedup falls back to the DB until the rebuild finishes.
+
+    Marks written during the rebuild must survive it: the buffered drain (the
+    bulk writer) is paused by holding its lock, and rows stored meanwhile by the
+    per-event path, or by transactions in flight when the keys were cleared,
+    are marked again from `created_at` before the flag is set.
+    Returns the number of rows loaded.
+    """
+    from .tracking_buffer import DRAIN_LOCK_KEY
+
+    kind = _kind(model)
+    client = _client()
+    lock = client.lock(DRAIN_LOCK_KEY, timeout=REBUILD_LOCK_TIMEOUT, blocking_timeout=REBUILD_LOCK_WAIT)
+    if not lock.acquire():
+        raise RuntimeError('Tracking buffer drain is still running; try the rebuild again.')
+    try:
+        started = timezone.now()
+        client.delete(ready_key(kind))
+        for key in client.scan_iter(match=f'{KEY_PREFIX}:{kind}:*', count=1000):
+            client.delete(key)
+
+        loaded = _load_rows(client, kind, model.objects.all(), chunk_size)
+        loaded += _load_rows(
+            client, kind, model.objects.filter(created_at__gte=started - REBUILD_CATCHUP), chunk_size
+        )
+        client.set(ready_key(kind), 1)
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+    return loaded
@@ -0,0 +1,67 @@
+"""
+Trending billboards — exponentially time-decayed views, leads and wishlists.
+
+Each interaction of weight w at time t adds w * 2^((t - EPOCH) / half-life) to a
+board's score. Since every score is scaled by the same factor as time passes,
+ranking by that undecayed sum equals ranking by the decayed score "now", so
+the column can be indexed and never needs a periodic rewrite. It is stored as
+log2 (`Billboard.trending_log`) so it grows linearly rather than exponentially:
+
+    new = max(old, x) + log2(1 + 2^-|old - x|),   x = log2(w) + (t - EPOCH) / half-life
+
+The tracking pipeline (per-event and batched) and the wishlist signal apply
+that update with one F() UPDATE per touched board.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Abs, Greatest, Least, Log, Power
+from django.utils import timezone
+
+TRENDING_EPOCH = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+TRENDING_HALF_LIFE_HOURS = 72
+
+WEIGHT_VIEW = 1.0
+WEIGHT_LEAD = 5.0
+WEIGHT_WISHLIST = 3.0
+
+TRENDING_DEFAULT_LIMIT = 20
+TRENDING_MAX_LIMIT = 50
+TRENDING_CACHE_TIMEOUT = 60
+
+
+def _elapsed_half_lives(at):
+    return (at - TRENDING_EPOCH).total_seconds() / 3600 / TRENDING_HALF_LIFE_HOURS
+
+
+def trending_increment(weight, at=None):
+    """Expression for `trending_log` after adding `weight` at `at` (default now)."""
+    at = at or timezone.now()
+    x = math.log2(weight) + _elapsed_half_lives(at)
+    current = F('trending_log')
+    # Gap capped so 2^-gap cannot underflow a float; beyond ~50 it adds nothing anyway.
+    gap = Least(Abs(current - Value(x)), Value(1000.0))
+    merged = Greatest(current, Value(x)) + Log(Value(2.0), Value(1.0) + Power(Value(2.0), -gap))
+    return Case(
+        When(trending_log__isnull=True, then=Value(x)),
+        default=merged,
+        output_field=FloatField(),
+    )
+
+
+def trending_score(trending_log, at=None):
+    """Decayed score at `at` (default now) for a stored `trending_log`; 0 when never touched."""
+    if trending_log is None:
+        return 0.0
+    at = at or timezone.now()
+    return round(2 ** (trending_log - _elapsed_half_lives(at)), 4)
+
+
+def add_trending(queryset, weight):
+    """Apply one interaction of `weight` to every board in `queryset`."""
+    if weight > 0:
+        queryset.update(trending_log=trending_increment(weight))
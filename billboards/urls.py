@@ -1,10 +1,19 @@
 from django.urls import path
 from .views import (
     BillboardListCreateView,
+    BillboardHeatmapView,
+    BillboardTrendingView,
     BillboardDetailView,
     MyBillboardsView,
+    OwnerAnalyticsView,
+    OwnerDashboardView,
+    BillboardImportView,
+    BillboardImportJobDetailView,
+    BillboardDataExportView,
     OohMediaTypeListView,
     OohMediaTypeSchemaView,
+    SavedSearchListCreateView,
+    SavedSearchDetailView,
     WishlistView,
     WishlistRemoveView,
     WishlistToggleView,
@@ -13,6 +22,7 @@ from .views import (
     toggle_billboard_active,
     BillboardAvailabilityView,
     BillboardPreviewView,
+    BillboardSimilarView,
     update_billboard_approval_status,
     get_pending_billboards,
 )
@@ -26,8 +36,16 @@ urlpatterns = [
         name='billboard-media-type-schema',
     ),
     path('', BillboardListCreateView.as_view(), name='billboard-list-create'),
+    path('trending/', BillboardTrendingView.as_view(), name='billboard-trending'),
+    path('heatmap/', BillboardHeatmapView.as_view(), name='billboard-heatmap'),
     path('my-billboards/', MyBillboardsView.as_view(), name='my-billboards'),
+    path('analytics/', OwnerAnalyticsView.as_view(), name='billboard-owner-analytics'),
+    path('dashboard/', OwnerDashboardView.as_view(), name='billboard-owner-dashboard'),
+    path('import/', BillboardImportView.as_view(), name='billboard-import'),
+    path('import/<int:job_id>/', BillboardImportJobDetailView.as_view(), name='billboard-import-detail'),
+    path('export/<str:dataset>/', BillboardDataExportView.as_view(), name='billboard-data-export'),
     path('<int:billboard_id>/preview/', BillboardPreviewView.as_view(), name='billboard-preview'),
+    path('<int:billboard_id>/similar/', BillboardSimilarView.as_view(), name='billboard-similar'),
     path('<int:billboard_id>/calendar/', BillboardCalendarView.as_view(), name='billboard-calendar'),
     path('<int:pk>/', BillboardDetailView.as_view(), name='billboard-detail'),
     path('<int:billboard_id>/track-view/', track_billboard_view, name='track-billboard-view'),
@@ -36,6 +54,8 @@ urlpatterns = [
     path('<int:billboard_id>/availability/', BillboardAvailabilityView.as_view(), name='billboard-availability'),
     path('pending/', get_pending_billboards, name='get-pending-billboards'),
     path('<int:billboard_id>/approval-status/', update_billboard_approval_status, name='update-billboard-approval-status'),
+    path('saved-searches/', SavedSearchListCreateView.as_view(), name='saved-search-list-create'),
+    path('saved-searches/<int:search_id>/', SavedSearchDetailView.as_view(), name='saved-search-detail'),
     path('wishlist/', WishlistView.as_view(), name='wishlist'),
     path('wishlist/<int:billboard_id>/remove/', WishlistRemoveView.as_view(), name='wishlist-remove'),
     path('wishlist/<int:billboard_id>/toggle/', WishlistToggleView.as_view(), name='wishlist-toggle'),
@@ -5,14 +5,18 @@ from .serializers import (
     BillboardListSerializer,
     BillboardPublicSummarySerializer,
     BillboardPreviewSerializer,
+    BillboardTrendingSerializer,
+    BillboardSimilarSerializer,
     BillboardAvailabilityUpdateSerializer,
+    BillboardImportJobSerializer,
     BillboardOwnerTileSerializer,
     MyBillboardsListRequestSerializer,
+    SavedSearchSerializer,
     WishlistSerializer,
 )
-from .availability_utils import build_availability_payload, parse_date_param
+from .availability_utils import build_availability_payload, has_availability_filter, parse_date_param
 from .specifications_utils import parse_specifications_from_payload
-from .filters import BillboardFilter
+from .filters import BillboardFilter, BillboardOrderingFilter
 from .clustering import cluster_billboards, should_use_clustering
 from django.core.cache import cache
 from .signals import get_cache_version
@@ -21,19 +25,19 @@ from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
 from django.conf import settings
-from django.core.files.storage import default_storage
-from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from core.pagination import CustomPagination
 from core.responses import action_response, accepted_response
+from core.exports import filter_created_range, parse_export_params, streaming_export
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_cookie
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny, IsAuthenticatedOrReadOnly
 from django.core.paginator import Paginator, EmptyPage
+from django.db import connections, transaction
 from django.db.models import Prefetch, Q
 from django.utils import timezone
 from drf_yasg.utils import swagger_auto_schema
@@ -41,11 +45,40 @@ from drf_yasg import openapi
 from .permissions import IsMediaOwner, IsBillboardOwner
 from .media_types_data import CATEGORY_LABELS
 from .media_type_serializers import OohMediaTypePickerSerializer, OohMediaTypeSchemaSerializer
-from .models import Billboard, Wishlist, OohMediaType, OohMediaTypeAttribute
+from .models import (
+    Billboard, BillboardImportJob, Lead, SavedSearch, View, Wishlist, OohMediaType, OohMediaTypeAttribute,
+)
+from .saved_searches import MAX_SAVED_SEARCHES_PER_USER
+from .bulk_import import MAX_IMPORT_FILE_BYTES, detect_format, fail_stale_import_jobs
+from .media_store import blob_names_from_urls, release_blobs, store_blob
+from .tasks import import_billboards_task
+from .tracking_buffer import EVENT_LEAD, EVENT_VIEW, buffer_tracking_event
+from .dashboard import get_owner_dashboard
+from .facets import get_facets
+from .similar import SIMILAR_K, similar_billboards
+from .trending import TRENDING_CACHE_TIMEOUT, TRENDING_DEFAULT_LIMIT, TRENDING_MAX_LIMIT
+from .heatmap import (
+    HEATMAP_MAX_ZOOM,
+    HEATMAP_METRICS,
+    HEATMAP_MIN_ZOOM,
+    METRIC_SUPPLY,
+    get_heatmap,
+    parse_bbox,
+)
+from .analytics import (
+    GRANULARITY_DAY,
+    GRANULARITY_HOUR,
+    MAX_DAILY_RANGE_DAYS,
+    MAX_HOURLY_RANGE_DAYS,
+    get_owner_analytics,
+    rolled_up_until,
+)
+from bookings.services import bump_calendar_version
 # WebSocket imports removed
 import os
-import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 
 logger = logging.getLogger(__name__)
 
@@ -69,51 +102,79 @@ def _parse_images_form_field(raw):
     return []
 
 
+_ALLOWED_IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/jpg')
+_IMAGE_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+MAX_UPLOAD_IMAGE_BYTES = 10 * 1024 * 1024
+# Storage writes run in parallel so a multi-image create costs about one round trip.
+IMAGE_UPLOAD_WORKERS = 4
+
+
+def _save_uploaded_image(file_obj):
+    """Store one upload as a content-addressed blob; returns (storage path, None) or (None, exception)."""
+    file_extension = os.path.splitext(file_obj.name)[1] if file_obj.name else ''
+    if not file_extension:
+        file_extension = _IMAGE_EXTENSIONS.get(file_obj.content_type, '.jpg')
+    try:
+        return store_blob(file_obj, name_hint=file_extension), None
+    except Exception as exc:
+        return None, exc
+    finally:
+        # Worker threads open their own DB connections; don't leave them behind.
+        connections.close_all()
+
+
+def release_uploaded_images(image_urls):
+    """
+    Drop the request's references to files from upload_billboard_images_from_request.
+    Call once the request is done: the saved board holds its own references
+    (billboards.signals), and on failure the new files are deleted.
+    """
+    release_blobs(blob_names_from_urls(image_urls))
+
+
 def upload_billboard_images_from_request(request):
-    """Upload images_0, images_1, … from multipart request. Returns (urls, error_response)."""
-    image_urls = []
-    if not request.FILES:
-        return image_urls, None
+    """
+    Upload images_0, images_1, … from multipart request. Returns (urls, error_response).
+    Every file is validated before any is stored; stores run on a bounded thread pool
+    and, if any fails, the ones that succeeded are released. The request holds one
+    media_store reference per returned URL; pass them to release_uploaded_images.
+    """
+    files = [
+        (file_key, file_obj)
+        for file_key, file_obj in request.FILES.items()
+        if file_key.startswith('images')
+    ]
+    if not files:
+        return [], None
 
-    for file_key, file_obj in request.FILES.items():
-        if not file_key.startswith('images'):
-            continue
-        try:
-            allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/jpg']
-            if file_obj.content_type not in allowed_types:
-                return None, Response({
-                    'detail': f'Invalid file type for {file_key}: {file_obj.content_type}',
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-            max_size = 10 * 1024 * 1024
-            if file_obj.size > max_size:
-                return None, Response({
-                    'detail': f'File too large for {file_key}. Maximum size is 10MB.',
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-            file_extension = os.path.splitext(file_obj.name)[1] if file_obj.name else '.jpg'
-            if not file_extension:
-                if file_obj.content_type == 'image/png':
-                    file_extension = '.png'
-                elif file_obj.content_type in ['image/jpeg', 'image/jpg']:
-                    file_extension = '.jpg'
-                elif file_obj.content_type == 'image/gif':
-                    file_extension = '.gif'
-                elif file_obj.content_type == 'image/webp':
-                    file_extension = '.webp'
-                else:
-                    file_extension = '.jpg'
-
-            unique_filename = f"{uuid.uuid4().hex}{file_extension}"
-            file_path = f'billboards/{unique_filename}'
-            path = default_storage.save(file_path, file_obj)
-            image_urls.append(request.build_absolute_uri(f'{settings.MEDIA_URL}{path}'))
-        except Exception as exc:
+    for file_key, file_obj in files:
+        if file_obj.content_type not in _ALLOWED_IMAGE_TYPES:
             return None, Response({
-                'detail': f'Upload failed for {file_key}: {exc}',
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                'detail': f'Invalid file type for {file_key}: {file_obj.content_type}',
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if file_obj.size > MAX_UPLOAD_IMAGE_BYTES:
+            return None, Response({
+                'detail': f'File too large for {file_key}. Maximum size is 10MB.',
+            }, status=status.HTTP_400_BAD_REQUEST)
 
-    return image_urls, None
+    with ThreadPoolExecutor(max_workers=min(IMAGE_UPLOAD_WORKERS, len(files))) as pool:
+        results = list(pool.map(_save_uploaded_image, [file_obj for _, file_obj in files]))
+
+    failed = [(file_key, exc) for (file_key, _), (_, exc) in zip(files, results) if exc is not None]
+    if failed:
+        release_blobs([path for path, _ in results if path])
+        file_key, exc = failed[0]
+        return None, Response({
+            'detail': f'Upload failed for {file_key}: {exc}',
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    return [request.build_absolute_uri(f'{settings.MEDIA_URL}{path}') for path, _ in results], None
 
 
 def build_billboard_write_payload(request, uploaded_image_urls, *, is_update=False, existing_images=None):
@@ -263,10 +324,13 @@ class BillboardListCreateView(generics.ListCreateAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = CustomPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, BillboardOrderingFilter]
     filterset_class = BillboardFilter  # Use simple filter
     search_fields = ['city', 'description', 'company_name', 'road_name']
-    ordering_fields = ['created_at', 'price_range', 'city', 'views']
+    ordering_fields = [
+        'created_at', 'price_range', 'city', 'views',
+        'price_min', 'price_max', 'daily_views', 'width_m', 'height_m', 'trending',
+    ]
     ordering = ['-created_at']
     parser_classes = (MultiPartParser, FormParser)  # Add parsers for file uploads
 
@@ -319,6 +383,10 @@ class BillboardListCreateView(generics.ListCreateAPIView):
           ne_lat, ne_lng,
           sw_lat, sw_lng          — visible map bounds; disables pagination and
                                     restricts clustering to the viewport
+          available_from,
+          available_to            — YYYY-MM-DD; only boards free for the whole window
+          facets=true             — map mode only: add `facets` counts per media_type_id,
+                                    type and city for the viewport + filters
 
         Clustering response shape:
           { count, clustered_count, clusters: [...], clustering_enabled, zoom_level }
@@ -358,11 +426,19 @@ class BillboardListCreateView(generics.ListCreateAPIView):
             )
 
             cache_version = get_cache_version()
+            # Filters (media type, availability window, …) change the result set too.
+            filter_params = '&'.join(
+                f'{key}={value}'
+                for key, value in sorted(request.query_params.items())
+                if key not in ('ne_lat', 'ne_lng', 'sw_lat', 'sw_lng', 'zoom', 'cluster')
+            )
             cache_key = hashlib.md5(
-                f"bbc_v{cache_version}_{ne_lat}_{ne_lng}_{sw_lat}_{sw_lng}_{zoom_level}_{use_clustering}".encode()
+                f"bbc_v{cache_version}_{ne_lat}_{ne_lng}_{sw_lat}_{sw_lng}_{zoom_level}_{use_clustering}_{filter_params}".encode()
             ).hexdigest()
 
-            if has_bounds:
+            # Availability depends on bookings, which do not bump the map cache version.
+            cacheable = has_bounds and not has_availability_filter(request.query_params)
+            if cacheable:
                 cached = cache.get(cache_key)
                 if cached:
                     logger.debug("Cache HIT billboard map: %s", cache_key[:12])
@@ -388,7 +464,15 @@ class BillboardListCreateView(generics.ListCreateAPIView):
                     'clustering_enabled': False,
                 }
 
-            if has_bounds:
+            if request.query_params.get('facets', 'false').lower() == 'true':
+                facet_params = '&'.join(
+                    part for part in filter_params.split('&') if not part.startswith('facets=')
+                )
+                response_data['facets'] = get_facets(
+                    queryset, (ne_lat, ne_lng, sw_lat, sw_lng), facet_params, use_cache=cacheable
+                )
+
+            if cacheable:
                 cache.set(cache_key, response_data, 120)
 
             return Response(response_data)
@@ -428,9 +512,12 @@ class BillboardListCreateView(generics.ListCreateAPIView):
         # Build payload: uploaded files become URL list; never pass raw multipart `images` to JSONField.
         payload = build_billboard_write_payload(request, image_urls)
 
-        serializer = self.get_serializer(data=payload)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        try:
+            serializer = self.get_serializer(data=payload)
+            serializer.is_valid(raise_exception=True)
+            self.perform_create(serializer)
+        finally:
+            release_uploaded_images(image_urls)
         return action_response('Billboard created successfully', status.HTTP_201_CREATED)
     
     def perform_create(self, serializer):
@@ -456,6 +543,117 @@ class BillboardListCreateView(generics.ListCreateAPIView):
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+class BillboardHeatmapView(APIView):
+    """
+    GET /api/billboards/heatmap/?bbox=west,south,east,north&zoom=&metric=supply|views|leads
+
+    Density grid for the viewport (see billboards/heatmap.py). Accepts the same filters
+    as the map list (media_type_id, type, city, available_from/to, spec__*, ranges).
+    `supply` is public; `views` / `leads` are staff-only.
+    """
+
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = BillboardFilter
+
+    def get_queryset(self):
+        return Billboard.objects.filter(
+            is_active=True,
+            approval_status='approved',
+            location__isnull=False,
+            latitude__isnull=False,
+            longitude__isnull=False,
+        )
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            bbox = parse_bbox(params.get('bbox'))
+        except ValueError as exc:
+            return action_response(str(exc), status.HTTP_400_BAD_REQUEST)
+        try:
+            zoom = int(float(params.get('zoom', 10)))
+        except (TypeError, ValueError):
+            return action_response('zoom must be a number.', status.HTTP_400_BAD_REQUEST)
+        zoom = max(HEATMAP_MIN_ZOOM, min(HEATMAP_MAX_ZOOM, zoom))
+
+        metric = (params.get('metric') or METRIC_SUPPLY).strip().lower()
+        if metric not in HEATMAP_METRICS:
+            return action_response(
+                f"metric must be one of: {', '.join(HEATMAP_METRICS)}.", status.HTTP_400_BAD_REQUEST
+            )
+        if metric != METRIC_SUPPLY and not request.user.is_staff:
+            return action_response('Only staff can view this metric.', status.HTTP_403_FORBIDDEN)
+
+        queryset = self.get_queryset()
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        filter_params = '&'.join(
+            f'{key}={value}'
+            for key, value in sorted(params.items())
+            if key not in ('bbox', 'zoom', 'metric')
+        )
+        data = get_heatmap(
+            queryset, bbox, zoom, metric, filter_params, use_cache=not has_availability_filter(params)
+        )
+        return Response({
+            'status_code': 200,
+            'message': 'Heatmap retrieved successfully',
+            **data,
+        })
+
+
+class BillboardTrendingView(APIView):
+    """
+    GET /api/billboards/trending/?limit=&city=&media_type_id=&…
+    Top approved boards by time-decayed views/leads/wishlists (billboards/trending.py):
+    an index scan on `trending_log`, with the ranked ids cached briefly.
+    Accepts the list filters.
+    """
+
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = BillboardFilter
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', TRENDING_DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            return action_response('limit must be an integer.', status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(TRENDING_MAX_LIMIT, limit))
+
+        filter_params = '&'.join(
+            f'{key}={value}' for key, value in sorted(request.query_params.items()) if key != 'limit'
+        )
+        cache_key = 'bb_trending_v{}_{}'.format(
+            get_cache_version(), hashlib.md5(f'{limit}_{filter_params}'.encode()).hexdigest()
+        )
+        cacheable = not has_availability_filter(request.query_params)
+        ids = cache.get(cache_key) if cacheable else None
+        if ids is None:
+            queryset = Billboard.objects.filter(
+                is_active=True, approval_status='approved', trending_log__isnull=False,
+            )
+            for backend in self.filter_backends:
+                queryset = backend().filter_queryset(request, queryset, self)
+            ids = list(queryset.order_by('-trending_log', '-id').values_list('id', flat=True)[:limit])
+            if cacheable:
+                cache.set(cache_key, ids, TRENDING_CACHE_TIMEOUT)
+
+        boards = Billboard.objects.in_bulk(ids)
+        ranked = [boards[pk] for pk in ids if pk in boards]
+        wishlist_ids = (
+            frozenset(Wishlist.objects.filter(user=request.user).values_list('billboard_id', flat=True))
+            if request.user.is_authenticated else frozenset()
+        )
+        context = {'request': request, 'wishlist_billboard_ids': wishlist_ids, 'now': timezone.now()}
+        return Response({
+            'status_code': 200,
+            'message': 'Trending billboards retrieved successfully',
+            'results': BillboardTrendingSerializer(ranked, many=True, context=context).data,
+        }, status=status.HTTP_200_OK)
+
+
 class BillboardAvailabilityView(APIView):
     """Get or set booked dates for a billboard calendar."""
 
@@ -515,6 +713,7 @@ class BillboardAvailabilityView(APIView):
 
         billboard.unavailable_dates = booked_dates
         billboard.save(update_fields=['unavailable_dates'])
+        bump_calendar_version(billboard.id)
 
         payload = build_availability_payload(billboard)
         return Response(
@@ -559,6 +758,45 @@ class BillboardPreviewView(generics.RetrieveAPIView):
         return context
 
 
+class BillboardSimilarView(APIView):
+    """
+    GET /api/billboards/<id>/similar/?limit=
+    "Similar boards nearby" for the detail screen: same media type and price band,
+    nearest first, read from the precomputed lists in billboards/similar.py.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request, billboard_id):
+        public_qs = Q(is_active=True, approval_status='approved')
+        user = request.user
+        if user.is_authenticated and user.user_type == 'media_owner':
+            public_qs |= Q(user=user)
+        if not Billboard.objects.filter(public_qs, pk=billboard_id).exists():
+            return action_response('Billboard not found.', status.HTTP_404_NOT_FOUND)
+
+        try:
+            limit = int(request.query_params.get('limit', SIMILAR_K))
+        except (TypeError, ValueError):
+            return action_response('limit must be an integer.', status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(SIMILAR_K, limit))
+
+        boards = []
+        for board, distance_m in similar_billboards(billboard_id, limit=limit):
+            board.distance_m = round(distance_m, 1)
+            boards.append(board)
+        wishlist_ids = (
+            frozenset(Wishlist.objects.filter(user=user).values_list('billboard_id', flat=True))
+            if user.is_authenticated else frozenset()
+        )
+        context = {'request': request, 'wishlist_billboard_ids': wishlist_ids}
+        return Response({
+            'status_code': 200,
+            'message': 'Similar billboards retrieved successfully',
+            'results': BillboardSimilarSerializer(boards, many=True, context=context).data,
+        }, status=status.HTTP_200_OK)
+
+
 class BillboardDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         qs = Billboard.objects.select_related(
@@ -630,9 +868,12 @@ class BillboardDetailView(generics.RetrieveUpdateDestroyAPIView):
             is_update=True,
             existing_images=instance.images or [],
         )
-        serializer = self.get_serializer(instance, data=payload, partial=partial)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        try:
+            serializer = self.get_serializer(instance, data=payload, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        finally:
+            release_uploaded_images(image_urls)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def update(self, request, *args, **kwargs):
@@ -786,6 +1027,213 @@ class MyBillboardsView(APIView):
         return post_my_billboards_by_status(request)
 
 
+class OwnerAnalyticsView(APIView):
+    """
+    GET /api/billboards/analytics/?from=&to=&granularity=day|hour&billboard_id=
+    Media owner trends (views / leads / wishlist adds) read from the rollup tables
+    only — see billboards/analytics.py. Defaults to the last 30 days, daily.
+    """
+
+    permission_classes = [IsAuthenticated, IsMediaOwner]
+
+    def get(self, request):
+        params = request.query_params
+        granularity = (params.get('granularity') or GRANULARITY_DAY).strip().lower()
+        if granularity not in (GRANULARITY_DAY, GRANULARITY_HOUR):
+            return action_response("granularity must be 'day' or 'hour'.", status.HTTP_400_BAD_REQUEST)
+
+        try:
+            from_str = parse_date_param(params.get('from'))
+            to_str = parse_date_param(params.get('to'))
+        except ValueError as exc:
+            return action_response(str(exc), status.HTTP_400_BAD_REQUEST)
+
+        to_date = date.fromisoformat(to_str) if to_str else timezone.localdate()
+        from_date = date.fromisoformat(from_str) if from_str else to_date - timedelta(days=29)
+        if from_date > to_date:
+            return action_response('from must be on or before to.', status.HTTP_400_BAD_REQUEST)
+        max_days = MAX_HOURLY_RANGE_DAYS if granularity == GRANULARITY_HOUR else MAX_DAILY_RANGE_DAYS
+        if (to_date - from_date).days + 1 > max_days:
+            return action_response(
+                f'Range too long for {granularity} granularity (max {max_days} days).',
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        billboard_id = params.get('billboard_id')
+        if billboard_id:
+            try:
+                billboard_id = int(billboard_id)
+            except (TypeError, ValueError):
+                return action_response('billboard_id must be an integer.', status.HTTP_400_BAD_REQUEST)
+            if not Billboard.objects.filter(pk=billboard_id, user=request.user).exists():
+                return action_response('Billboard not found', status.HTTP_404_NOT_FOUND)
+        else:
+            billboard_id = None
+
+        series, totals = get_owner_analytics(
+            request.user, from_date, to_date, granularity, billboard_id=billboard_id
+        )
+        until = rolled_up_until()
+        return Response({
+            'status_code': 200,
+            'message': 'Analytics retrieved successfully',
+            'granularity': granularity,
+            'from': from_date.isoformat(),
+            'to': to_date.isoformat(),
+            'billboard_id': billboard_id,
+            'timezone': settings.TIME_ZONE,
+            'rolled_up_until': until.isoformat() if until else None,
+            'totals': totals,
+            'series': series,
+        }, status=status.HTTP_200_OK)
+
+
+class OwnerDashboardView(APIView):
+    """
+    GET /api/billboards/dashboard/ — media owner totals, conversion rates and top boards.
+    Served from the owner's OwnerDashboardStats row (see billboards/dashboard.py).
+    """
+
+    permission_classes = [IsAuthenticated, IsMediaOwner]
+
+    def get(self, request):
+        return Response({
+            'status_code': 200,
+            'message': 'Dashboard retrieved successfully',
+            **get_owner_dashboard(request.user),
+        }, status=status.HTTP_200_OK)
+
+
+class BillboardImportView(APIView):
+    """
+    POST /api/billboards/import/ — multipart `file` (.csv / .xlsx / .ndjson, optional `format`).
+    Queues a background import and returns 202 with the job; rows are streamed,
+    validated and bulk-created in chunks (see billboards/bulk_import.py).
+    GET lists the caller's recent import jobs.
+    """
+
+    permission_classes = [IsAuthenticated, IsMediaOwner]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def get(self, request):
+        fail_stale_import_jobs(BillboardImportJob.objects.filter(owner=request.user))
+        jobs = BillboardImportJob.objects.filter(owner=request.user)[:20]
+        return Response({
+            'status_code': 200,
+            'message': 'Import jobs retrieved successfully',
+            'results': BillboardImportJobSerializer(jobs, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return action_response('file is required.', status.HTTP_400_BAD_REQUEST)
+        if upload.size > MAX_IMPORT_FILE_BYTES:
+            return action_response(
+                f'File too large. Maximum size is {MAX_IMPORT_FILE_BYTES // (1024 * 1024)}MB.',
+                status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = detect_format(upload.name, request.data.get('format'))
+        if file_format is None:
+            return action_response(
+                'Unsupported file format. Use .csv, .xlsx or .ndjson (or pass format).',
+                status.HTTP_400_BAD_REQUEST,
+            )
+        if not (getattr(request.user, 'preferred_currency', None) or '').strip():
+            return action_response(
+                'Set your currency in profile before importing billboards.',
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        job = BillboardImportJob.objects.create(
+            owner=request.user,
+            file=upload,
+            original_filename=(upload.name or '')[:255],
+            file_format=file_format,
+        )
+        transaction.on_commit(lambda: import_billboards_task.delay(job.id))
+        return Response({
+            'status_code': 202,
+            'message': 'Import accepted for processing',
+            'job': BillboardImportJobSerializer(job).data,
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class BillboardImportJobDetailView(APIView):
+    """GET /api/billboards/import/{job_id}/ — progress, counts and per-row errors."""
+
+    permission_classes = [IsAuthenticated, IsMediaOwner]
+
+    def get(self, request, job_id):
+        fail_stale_import_jobs(BillboardImportJob.objects.filter(pk=job_id, owner=request.user))
+        job = BillboardImportJob.objects.filter(pk=job_id, owner=request.user).first()
+        if job is None:
+            return action_response('Import job not found', status.HTTP_404_NOT_FOUND)
+        return Response({
+            'status_code': 200,
+            'message': 'Import job retrieved successfully',
+            'job': BillboardImportJobSerializer(job).data,
+        }, status=status.HTTP_200_OK)
+
+
+_BILLBOARD_EXPORT_COLUMNS = [
+    ('id', 'id'), ('user_id', 'owner_id'), ('city', 'city'), ('road_name', 'road_name'),
+    ('address', 'address'), ('media_type_id', 'media_type_id'), ('ooh_media_type', 'ooh_media_type'),
+    ('type', 'type'), ('price_range', 'price_range'), ('currency', 'currency'),
+    ('latitude', 'latitude'), ('longitude', 'longitude'), ('approval_status', 'approval_status'),
+    ('is_active', 'is_active'), ('views', 'views'), ('leads', 'leads'), ('created_at', 'created_at'),
+]
+_INTERACTION_EXPORT_COLUMNS = [
+    ('id', 'id'), ('billboard_id', 'billboard_id'), ('billboard__city', 'billboard_city'),
+    ('billboard__company_name', 'billboard_company'), ('user_id', 'user_id'), ('created_at', 'created_at'),
+]
+# Visitor IPs / user agents are only exported for staff.
+_INTERACTION_STAFF_COLUMNS = [('user_ip', 'user_ip'), ('user_agent', 'user_agent')]
+
+
+class BillboardDataExportView(APIView):
+    """
+    GET /api/billboards/export/{billboards|leads|views}/?output=csv|ndjson|geojson&from=&to=
+    Streams rows with a server-side cursor (core/exports.py). Media owners get their own
+    boards and the leads/views on them; staff get everything.
+    """
+
+    permission_classes = [IsAuthenticated]
+    DATASETS = ('billboards', 'leads', 'views')
+
+    def get(self, request, dataset):
+        user = request.user
+        if dataset not in self.DATASETS:
+            return action_response('Unknown export.', status.HTTP_404_NOT_FOUND)
+        if not user.is_staff and user.user_type != 'media_owner':
+            return action_response('Only media owners can export data.', status.HTTP_403_FORBIDDEN)
+
+        try:
+            output, from_date, to_date = parse_export_params(request.query_params)
+        except ValueError as exc:
+            return action_response(str(exc), status.HTTP_400_BAD_REQUEST)
+
+        if dataset == 'billboards':
+            queryset = Billboard.objects.all()
+            if not user.is_staff:
+                queryset = queryset.filter(user=user)
+            columns = _BILLBOARD_EXPORT_COLUMNS
+            lat_key, lng_key = 'latitude', 'longitude'
+        else:
+            model = Lead if dataset == 'leads' else View
+            queryset = model.objects.all()
+            if not user.is_staff:
+                queryset = queryset.filter(billboard__user=user)
+            columns = _INTERACTION_EXPORT_COLUMNS + (_INTERACTION_STAFF_COLUMNS if user.is_staff else [])
+            lat_key, lng_key = 'billboard__latitude', 'billboard__longitude'
+
+        queryset = filter_created_range(queryset, from_date, to_date).order_by('id')
+        filename = f'{dataset}_export_{timezone.now():%Y%m%d_%H%M%S}'
+        return streaming_export(
+            queryset, columns, output, filename, lat_key=lat_key, lng_key=lng_key
+        )
+
+
 class WishlistView(generics.ListCreateAPIView):
     """View for managing user's wishlist"""
     serializer_class = WishlistSerializer
@@ -825,6 +1273,66 @@ class WishlistView(generics.ListCreateAPIView):
         return action_response('Added to wishlist successfully', status.HTTP_201_CREATED)
 
 
+class SavedSearchListCreateView(APIView):
+    """
+    GET /api/billboards/saved-searches/ — the caller's saved searches.
+    POST — save a bbox or radius search; newly approved boards inside it trigger
+    an inbox/push alert (see billboards/saved_searches.py).
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
+
+    def get(self, request):
+        searches = SavedSearch.objects.filter(user=request.user)
+        return Response({
+            'status_code': 200,
+            'message': 'Saved searches retrieved successfully',
+            'results': SavedSearchSerializer(searches, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        if SavedSearch.objects.filter(user=request.user).count() >= MAX_SAVED_SEARCHES_PER_USER:
+            return action_response(
+                f'You can save up to {MAX_SAVED_SEARCHES_PER_USER} searches.',
+                status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = SavedSearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        search = serializer.save(user=request.user)
+        return Response({
+            'status_code': 201,
+            'message': 'Search saved successfully',
+            'saved_search': SavedSearchSerializer(search).data,
+        }, status=status.HTTP_201_CREATED)
+
+
+class SavedSearchDetailView(APIView):
+    """PATCH /api/billboards/saved-searches/{id}/ (e.g. name, notify) and DELETE."""
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
+
+    def patch(self, request, search_id):
+        search = SavedSearch.objects.filter(pk=search_id, user=request.user).first()
+        if search is None:
+            return action_response('Saved search not found.', status.HTTP_404_NOT_FOUND)
+        serializer = SavedSearchSerializer(search, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        search = serializer.save()
+        return Response({
+            'status_code': 200,
+            'message': 'Saved search updated successfully',
+            'saved_search': SavedSearchSerializer(search).data,
+        }, status=status.HTTP_200_OK)
+
+    def delete(self, request, search_id):
+        deleted, _ = SavedSearch.objects.filter(pk=search_id, user=request.user).delete()
+        if not deleted:
+            return action_response('Saved search not found.', status.HTTP_404_NOT_FOUND)
+        return action_response('Saved search deleted successfully', status.HTTP_200_OK)
+
+
 class WishlistRemoveView(APIView):
     """View for removing items from wishlist"""
     permission_classes = [permissions.IsAuthenticated]
@@ -879,20 +1387,20 @@ def _client_ip_and_agent(request):
     return user_ip, user_agent
 
 
-# View / lead tracking — 202 Accepted; Celery worker does DB + FCM
+# View / lead tracking — 202 Accepted; events are buffered in Redis and
+# bulk-persisted by drain_tracking_buffer_task (see billboards/tracking_buffer.py)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def track_billboard_lead(request, billboard_id):
     """
     Queue lead tracking (phone/WhatsApp click). Returns immediately;
-    worker handles dedup, F() counter increment, and owner push notification.
+    the batch drain handles dedup, F() counter increment, and owner push notification.
     """
-    from .tasks import track_billboard_lead_task
-
     user_ip, user_agent = _client_ip_and_agent(request)
     user_id = request.user.id if request.user.is_authenticated else None
 
-    track_billboard_lead_task.delay(
+    buffer_tracking_event(
+        EVENT_LEAD,
         billboard_id=billboard_id,
         user_id=user_id,
         user_ip=user_ip,
@@ -906,15 +1414,14 @@ def track_billboard_lead(request, billboard_id):
 def track_billboard_view(request, billboard_id):
     """
     Queue view tracking. Returns immediately;
-    worker handles dedup and F() counter increment.
+    the batch drain handles dedup and F() counter increment.
     Guests may track views (IP-based dedup when unauthenticated).
     """
-    from .tasks import track_billboard_view_task
-
     user_ip, user_agent = _client_ip_and_agent(request)
     user_id = request.user.id if request.user.is_authenticated else None
 
-    track_billboard_view_task.delay(
+    buffer_tracking_event(
+        EVENT_VIEW,
         billboard_id=billboard_id,
         user_id=user_id,
         user_ip=user_ip,
@@ -926,116 +1433,6 @@ def track_billboard_view(request, billboard_id):
 # Legacy block removed — synchronous tracking replaced by Celery (see billboards/tasks.py)
 
 
-@method_decorator(csrf_exempt, name='dispatch')
-class BillboardImageUploadView(APIView):
-    parser_classes = (MultiPartParser, FormParser)
-    permission_classes = [permissions.IsAuthenticated]
-
-    def post(self, request, format=None):
-        # Check if user is a media owner
-        if request.user.user_type != 'media_owner':
-            return Response({
-                'detail': 'Only media owners can upload billboard images.'
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        try:
-            file_obj = request.FILES.get('image')
-            if not file_obj:
-                return Response({'detail': 'No image provided.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate file type
-            allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/jpg']
-            if file_obj.content_type not in allowed_types:
-                return Response({'detail': f'Invalid file type: {file_obj.content_type}'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate file size (10MB limit)
-            max_size = 10 * 1024 * 1024
-            if file_obj.size > max_size:
-                return Response({'detail': 'File too large. Maximum size is 10MB.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Generate unique filename
-            file_extension = os.path.splitext(file_obj.name)[1] if file_obj.name else '.jpg'
-            if not file_extension:
-                if file_obj.content_type == 'image/png':
-                    file_extension = '.png'
-                elif file_obj.content_type in ['image/jpeg', 'image/jpg']:
-                    file_extension = '.jpg'
-                elif file_obj.content_type == 'image/gif':
-                    file_extension = '.gif'
-                elif file_obj.content_type == 'image/webp':
-                    file_extension = '.webp'
-                else:
-                    file_extension = '.jpg'
-            
-            unique_filename = f"{uuid.uuid4().hex}{file_extension}"
-            file_path = f'billboards/{unique_filename}'
-            
-            # Save file
-            path = default_storage.save(file_path, file_obj)
-            
-            # Generate URL
-            image_url = request.build_absolute_uri(f'{settings.MEDIA_URL}{path}')
-            
-            return Response({'url': image_url}, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response({'detail': f'Upload failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-@method_decorator(csrf_exempt, name='dispatch')
-class BillboardImageUploadView(APIView):
-    parser_classes = (MultiPartParser, FormParser)
-    permission_classes = [permissions.IsAuthenticated]
-
-    def post(self, request, format=None):
-        # Check if user is a media owner
-        if request.user.user_type != 'media_owner':
-            return Response({
-                'detail': 'Only media owners can upload billboard images.'
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        try:
-            file_obj = request.FILES.get('image')
-            if not file_obj:
-                return Response({'detail': 'No image provided.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate file type
-            allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/jpg']
-            if file_obj.content_type not in allowed_types:
-                return Response({'detail': f'Invalid file type: {file_obj.content_type}'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate file size (10MB limit)
-            max_size = 10 * 1024 * 1024
-            if file_obj.size > max_size:
-                return Response({'detail': 'File too large. Maximum size is 10MB.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Generate unique filename
-            file_extension = os.path.splitext(file_obj.name)[1] if file_obj.name else '.jpg'
-            if not file_extension:
-                if file_obj.content_type == 'image/png':
-                    file_extension = '.png'
-                elif file_obj.content_type in ['image/jpeg', 'image/jpg']:
-                    file_extension = '.jpg'
-                elif file_obj.content_type == 'image/gif':
-                    file_extension = '.gif'
-                elif file_obj.content_type == 'image/webp':
-                    file_extension = '.webp'
-                else:
-                    file_extension = '.jpg'
-            
-            unique_filename = f"{uuid.uuid4().hex}{file_extension}"
-            file_path = f'billboards/{unique_filename}'
-            
-            # Save file
-            path = default_storage.save(file_path, file_obj)
-            
-            # Generate URL
-            image_url = request.build_absolute_uri(f'{settings.MEDIA_URL}{path}')
-            
-            return Response({'url': image_url}, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response({'detail': f'Upload failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
 # NEW: Toggle active status endpoint
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
@@ -5,3 +5,7 @@ class BookingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bookings'
     verbose_name = 'Bookings'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import bookings.signals  # noqa
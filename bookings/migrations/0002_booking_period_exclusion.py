@@ -0,0 +1,80 @@
+# Postgres-only: generated daterange column + GiST EXCLUDE so overlapping
+# blocking bookings are rejected by the database (no Billboard row lock).
+
+from django.db import migrations
+
+from core.migration_helpers import column_exists
+
+TABLE = 'bookings_booking'
+CONSTRAINT = 'bookings_booking_no_blocking_overlap'
+BLOCKING_STATUSES = ('pending', 'accepted', 'paid', 'confirmed', 'live')
+
+
+def _status_list_sql():
+    return ', '.join(f"'{status}'" for status in BLOCKING_STATUSES)
+
+
+def add_period_exclusion(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    statuses = _status_list_sql()
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        if not column_exists(schema_editor, TABLE, 'period'):
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ADD COLUMN period daterange "
+                f"GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED"
+            )
+
+        cursor.execute('SELECT 1 FROM pg_constraint WHERE conname = %s', [CONSTRAINT])
+        if cursor.fetchone() is not None:
+            return
+
+        cursor.execute(
+            f"""
+            SELECT a.id, b.id
+            FROM {TABLE} a
+            JOIN {TABLE} b
+              ON a.billboard_id = b.billboard_id
+             AND a.id < b.id
+             AND a.period && b.period
+            WHERE a.status IN ({statuses}) AND b.status IN ({statuses})
+            LIMIT 20
+            """
+        )
+        conflicts = cursor.fetchall()
+        if conflicts:
+            raise RuntimeError(
+                'Cannot add booking overlap constraint; resolve overlapping '
+                f'blocking bookings first (id pairs): {conflicts}'
+            )
+
+        cursor.execute(
+            f"""
+            ALTER TABLE {TABLE}
+              ADD CONSTRAINT {CONSTRAINT}
+              EXCLUDE USING gist (billboard_id WITH =, period WITH &&)
+              WHERE (status IN ({statuses}))
+            """
+        )
+
+
+def remove_period_exclusion(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {TABLE} DROP CONSTRAINT IF EXISTS {CONSTRAINT}')
+        cursor.execute(f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS period')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_period_exclusion, remove_period_exclusion),
+    ]
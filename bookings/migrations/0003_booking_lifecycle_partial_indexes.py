@@ -0,0 +1,37 @@
+# Partial indexes for the scheduled booking lifecycle sweep.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_period_exclusion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(
+                condition=models.Q(status='confirmed'),
+                fields=['status', 'start_date'],
+                name='booking_confirmed_start_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(
+                condition=models.Q(status__in=('confirmed', 'live')),
+                fields=['status', 'end_date'],
+                name='booking_running_end_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(
+                condition=models.Q(status='pending', expires_at__isnull=False),
+                fields=['status', 'expires_at'],
+                name='booking_pending_expiry_idx',
+            ),
+        ),
+    ]
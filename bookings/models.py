@@ -34,6 +34,10 @@ class Booking(models.Model):
         STATUS_LIVE,
     )
 
+    # Postgres GiST EXCLUDE on (billboard_id, period) for BLOCKING_STATUSES.
+    # `period` is a generated daterange column (see migration 0002), not a model field.
+    OVERLAP_CONSTRAINT = 'bookings_booking_no_blocking_overlap'
+
     billboard = models.ForeignKey(
         'billboards.Billboard',
         on_delete=models.CASCADE,
@@ -77,6 +81,22 @@ class Booking(models.Model):
             models.Index(fields=['billboard', 'status', 'start_date', 'end_date']),
             models.Index(fields=['advertiser', 'status']),
             models.Index(fields=['media_owner', 'status']),
+            # Partial indexes for the scheduled lifecycle sweep (bookings.tasks).
+            models.Index(
+                fields=['status', 'start_date'],
+                condition=models.Q(status='confirmed'),
+                name='booking_confirmed_start_idx',
+            ),
+            models.Index(
+                fields=['status', 'end_date'],
+                condition=models.Q(status__in=('confirmed', 'live')),
+                name='booking_running_end_idx',
+            ),
+            models.Index(
+                fields=['status', 'expires_at'],
+                condition=models.Q(status='pending', expires_at__isnull=False),
+                name='booking_pending_expiry_idx',
+            ),
         ]
 
     def __str__(self):
@@ -86,6 +106,26 @@ class Booking(models.Model):
     def is_blocking(self):
         return self.status in self.BLOCKING_STATUSES
 
+    @property
+    def effective_status(self):
+        """
+        Status as of now, without waiting for the lifecycle sweep to persist it:
+        confirmed→live→completed by date, expired pending→cancelled.
+        """
+        today = timezone.localdate()
+        if self.status in (self.STATUS_CONFIRMED, self.STATUS_LIVE):
+            if self.end_date < today:
+                return self.STATUS_COMPLETED
+            if self.start_date <= today:
+                return self.STATUS_LIVE
+            return self.status
+        if self.status == self.STATUS_PENDING and self.expires_at and self.expires_at < timezone.now():
+            return self.STATUS_CANCELLED
+        return self.status
+
+    def get_effective_status_display(self):
+        return dict(self.STATUS_CHOICES).get(self.effective_status, self.effective_status)
+
 
 class BookingContent(models.Model):
     """Creative / install package — created only after booking is accepted."""
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 
+from billboards.images import SIZE_THUMB, primary_image_url
+
 from .models import Booking, BookingContent, Payment
-from .services import content_capabilities
+from .services import CAMPAIGN_MAX_BILLBOARDS, content_capabilities
 
 
 class PaymentSerializer(serializers.ModelSerializer):
@@ -56,8 +58,7 @@ class BillboardMiniSerializer(serializers.Serializer):
     content_capabilities = serializers.SerializerMethodField()
 
     def get_image(self, obj):
-        images = obj.images or []
-        return images[0] if images else None
+        return primary_image_url(obj, SIZE_THUMB, self.context.get('request'))
 
     def get_content_capabilities(self, obj):
         return content_capabilities(obj)
@@ -71,7 +72,9 @@ class UserMiniSerializer(serializers.Serializer):
 
 
 class BookingSerializer(serializers.ModelSerializer):
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    # Lifecycle is persisted by a scheduled task; expose the date-derived status.
+    status = serializers.CharField(source='effective_status', read_only=True)
+    status_display = serializers.CharField(source='get_effective_status_display', read_only=True)
     billboard = serializers.SerializerMethodField()
     advertiser = serializers.SerializerMethodField()
     media_owner = serializers.SerializerMethodField()
@@ -146,6 +149,17 @@ class BookingCreateSerializer(serializers.Serializer):
     message = serializers.CharField(required=False, allow_blank=True, default='')
 
 
+class BookingCampaignCreateSerializer(serializers.Serializer):
+    billboard_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        min_length=1,
+        max_length=CAMPAIGN_MAX_BILLBOARDS,
+    )
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    message = serializers.CharField(required=False, allow_blank=True, default='')
+
+
 class BookingRejectSerializer(serializers.Serializer):
     reason = serializers.CharField(required=False, allow_blank=True, default='')
 
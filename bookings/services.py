@@ -2,23 +2,28 @@
 
 from __future__ import annotations
 
-import re
+import logging
 from datetime import timedelta
-from decimal import Decimal, InvalidOperation
 
-from django.db import transaction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.utils import timezone
 
 from billboards.availability_utils import normalize_booked_dates
+from billboards.dashboard import refresh_owner_booking_counts
+from billboards.media_store import release_blobs, store_blob
 from billboards.models import Billboard
+from billboards.numeric_utils import parse_price_range
 
 from .models import Booking, BookingContent, Payment
 
+logger = logging.getLogger(__name__)
+
 PENDING_EXPIRY_HOURS = 48
-# DecimalField(max_digits=12, decimal_places=2) → abs value < 10^10
-_MAX_PRICE = Decimal('9999999999.99')
-_PRICE_TOKEN_RE = re.compile(r'\d+(?:\.\d+)?')
+# Busy ranges are invalidated by version bumps; TTL only bounds memory.
+CALENDAR_CACHE_TIMEOUT = 60 * 60
 
 
 class BookingError(Exception):
@@ -58,21 +63,11 @@ def content_capabilities(billboard: Billboard) -> dict:
 
 
 def _parse_price(billboard: Billboard):
-    """Extract a storeable price from free-text price_range (e.g. '300000-50000')."""
-    raw = (billboard.price_range or '').strip()
-    if not raw:
-        return None
-    # Don't concatenate range ends ('300000-50000' → 30000050000 overflow).
-    # Use the first numeric token as the booking quote.
-    tokens = _PRICE_TOKEN_RE.findall(raw.replace(',', ''))
-    if not tokens:
-        return None
-    try:
-        value = Decimal(tokens[0])
-    except (InvalidOperation, ValueError):
-        return None
-    if value > _MAX_PRICE:
-        return None
+    """Booking quote: the lower end of the billboard price range (e.g. '30000-50000' → 30000)."""
+    if billboard.price_min is not None:
+        return billboard.price_min
+    # Rows not yet backfilled (backfill_billboard_numbers) still parse the text.
+    value, _ = parse_price_range(billboard.price_range)
     return value
 
 
@@ -80,6 +75,15 @@ def ranges_overlap(start_a, end_a, start_b, end_b) -> bool:
     return start_a <= end_b and end_a >= start_b
 
 
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    """True when the IntegrityError comes from the booking overlap EXCLUDE constraint."""
+    diag = getattr(getattr(exc, '__cause__', None), 'diag', None)
+    constraint = getattr(diag, 'constraint_name', None)
+    if constraint:
+        return constraint == Booking.OVERLAP_CONSTRAINT
+    return Booking.OVERLAP_CONSTRAINT in str(exc)
+
+
 def find_overlapping_bookings(billboard_id, start_date, end_date, exclude_booking_id=None):
     qs = Booking.objects.filter(
         billboard_id=billboard_id,
@@ -132,8 +136,77 @@ def build_calendar_busy(billboard: Billboard, from_date=None, to_date=None) -> l
     return busy
 
 
-@transaction.atomic
-def create_booking_request(advertiser, billboard_id, start_date, end_date, message=''):
+def _calendar_version_key(billboard_id):
+    return f'billboard_calendar_version:{billboard_id}'
+
+
+_calendar_redis = None
+
+
+def _calendar_version_store():
+    """Redis client shared by web and worker processes; None means use the local cache."""
+    global _calendar_redis
+    url = getattr(settings, 'CALENDAR_VERSION_REDIS_URL', '')
+    if not url:
+        return None
+    if _calendar_redis is None:
+        import redis
+
+        _calendar_redis = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+    return _calendar_redis
+
+
+def get_calendar_version(billboard_id):
+    """Current calendar cache version for a billboard; None when the shared store is unreachable."""
+    key = _calendar_version_key(billboard_id)
+    store = _calendar_version_store()
+    if store is None:
+        return cache.get(key, 1)
+    try:
+        return int(store.get(key) or 0)
+    except Exception as exc:
+        logger.warning('Calendar version store unavailable: %s', exc)
+        return None
+
+
+def bump_calendar_version(billboard_id):
+    """
+    Invalidate cached calendar busy ranges for a billboard.
+    Deferred to on_commit so readers never cache pre-commit state under the new version.
+    """
+    key = _calendar_version_key(billboard_id)
+
+    def _bump():
+        store = _calendar_version_store()
+        if store is not None:
+            try:
+                store.incr(key)
+            except Exception as exc:
+                logger.warning('Calendar version bump failed for billboard %s: %s', billboard_id, exc)
+            return
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, get_calendar_version(billboard_id) + 1, timeout=None)
+
+    transaction.on_commit(_bump)
+
+
+def get_calendar_busy_cached(billboard: Billboard, from_date=None, to_date=None) -> list[dict]:
+    """build_calendar_busy() cached per billboard + date window under the calendar version."""
+    version = get_calendar_version(billboard.id)
+    if version is None:
+        # Without the shared version a cached entry could outlive a worker-side change.
+        return build_calendar_busy(billboard, from_date=from_date, to_date=to_date)
+    cache_key = f'billboard_calendar:{billboard.id}:v{version}:{from_date or ""}:{to_date or ""}'
+    busy = cache.get(cache_key)
+    if busy is None:
+        busy = build_calendar_busy(billboard, from_date=from_date, to_date=to_date)
+        cache.set(cache_key, busy, CALENDAR_CACHE_TIMEOUT)
+    return busy
+
+
+def _validate_request_window(advertiser, start_date, end_date):
     if advertiser.user_type != 'advertiser':
         raise BookingError('Only advertisers can request bookings.', 403)
 
@@ -144,17 +217,8 @@ def create_booking_request(advertiser, billboard_id, start_date, end_date, messa
     if start_date < today:
         raise BookingError('start_date cannot be in the past.', 400)
 
-    # of=('self',): Postgres forbids FOR UPDATE on nullable outer joins
-    # (user / media_type are null=True → LEFT OUTER JOIN via select_related).
-    billboard = (
-        Billboard.objects.select_for_update(of=('self',))
-        .select_related('user', 'media_type')
-        .filter(pk=billboard_id)
-        .first()
-    )
-    if not billboard:
-        raise BookingError('Billboard not found.', 404)
 
+def _check_bookable(billboard, advertiser):
     if not billboard.is_active or billboard.approval_status != 'approved':
         raise BookingError('This billboard is not available for booking.', 400)
 
@@ -164,10 +228,9 @@ def create_booking_request(advertiser, billboard_id, start_date, end_date, messa
     if billboard.user_id == advertiser.id:
         raise BookingError('You cannot book your own billboard.', 400)
 
-    if find_overlapping_bookings(billboard.id, start_date, end_date).exists():
-        raise BookingError('Selected dates overlap an existing booking or hold.', 409)
 
-    booking = Booking.objects.create(
+def _new_pending_booking(billboard, advertiser, start_date, end_date, message):
+    return Booking(
         billboard=billboard,
         advertiser=advertiser,
         media_owner=billboard.user,
@@ -179,16 +242,163 @@ def create_booking_request(advertiser, billboard_id, start_date, end_date, messa
         advertiser_message=(message or '').strip(),
         expires_at=timezone.now() + timedelta(hours=PENDING_EXPIRY_HOURS),
     )
-    Payment.objects.create(
+
+
+def _new_payment(booking):
+    return Payment(
         booking=booking,
         amount=booking.total_price,
         currency=booking.currency,
         status=Payment.STATUS_SKIPPED,
     )
+
+
+@transaction.atomic
+def create_booking_request(advertiser, billboard_id, start_date, end_date, message=''):
+    _validate_request_window(advertiser, start_date, end_date)
+
+    # No Billboard row lock: concurrent overlapping inserts are rejected by the
+    # Postgres EXCLUDE constraint (Booking.OVERLAP_CONSTRAINT) and mapped to 409.
+    billboard = (
+        Billboard.objects.select_related('user', 'media_type')
+        .filter(pk=billboard_id)
+        .first()
+    )
+    if not billboard:
+        raise BookingError('Billboard not found.', 404)
+
+    _check_bookable(billboard, advertiser)
+
+    # Cheap indexed read for the common case; the constraint covers the race.
+    if find_overlapping_bookings(billboard.id, start_date, end_date).exists():
+        raise BookingError('Selected dates overlap an existing booking or hold.', 409)
+
+    booking = _new_pending_booking(billboard, advertiser, start_date, end_date, message)
+    try:
+        with transaction.atomic():
+            booking.save()
+    except IntegrityError as exc:
+        if not is_overlap_violation(exc):
+            raise
+        raise BookingError('Selected dates overlap an existing booking or hold.', 409) from exc
+    bump_calendar_version(billboard.id)
+    refresh_owner_booking_counts({booking.media_owner_id})
+    _new_payment(booking).save()
     _notify_owner_new_request(booking)
     return booking
 
 
+CAMPAIGN_MAX_BILLBOARDS = 200
+CAMPAIGN_INSERT_ATTEMPTS = 3
+
+CAMPAIGN_RESULT_CREATED = 'created'
+CAMPAIGN_RESULT_CONFLICT = 'conflict'
+CAMPAIGN_RESULT_ERROR = 'error'
+
+
+def _campaign_result(billboard_id, result, message, status_code, booking=None):
+    return {
+        'billboard_id': billboard_id,
+        'result': result,
+        'status_code': status_code,
+        'message': message,
+        'booking_id': booking.id if booking is not None else None,
+    }
+
+
+@transaction.atomic
+def create_campaign_booking_requests(advertiser, billboard_ids, start_date, end_date, message=''):
+    """
+    Book many billboards for one flight in a single transaction.
+
+    One query loads the boards, one set-based overlap query finds conflicts, and
+    Booking / Payment rows are inserted with bulk_create. Media owners get one
+    grouped notification each. Returns (created_bookings, per-board results in
+    request order).
+    """
+    _validate_request_window(advertiser, start_date, end_date)
+
+    billboard_ids = list(dict.fromkeys(billboard_ids))
+    if not billboard_ids:
+        raise BookingError('billboard_ids must not be empty.', 400)
+    if len(billboard_ids) > CAMPAIGN_MAX_BILLBOARDS:
+        raise BookingError(f'A campaign can include at most {CAMPAIGN_MAX_BILLBOARDS} billboards.', 400)
+
+    billboards = Billboard.objects.select_related('user', 'media_type').in_bulk(billboard_ids)
+
+    results = {}
+    candidates = []
+    for billboard_id in billboard_ids:
+        billboard = billboards.get(billboard_id)
+        if billboard is None:
+            results[billboard_id] = _campaign_result(
+                billboard_id, CAMPAIGN_RESULT_ERROR, 'Billboard not found.', 404,
+            )
+            continue
+        try:
+            _check_bookable(billboard, advertiser)
+        except BookingError as exc:
+            results[billboard_id] = _campaign_result(
+                billboard_id, CAMPAIGN_RESULT_ERROR, exc.message, exc.status_code,
+            )
+            continue
+        candidates.append(billboard)
+
+    created = []
+    for _attempt in range(CAMPAIGN_INSERT_ATTEMPTS):
+        conflicting_ids = set(
+            Booking.objects.filter(
+                billboard_id__in=[b.id for b in candidates],
+                status__in=Booking.BLOCKING_STATUSES,
+                start_date__lte=end_date,
+                end_date__gte=start_date,
+            ).values_list('billboard_id', flat=True)
+        )
+        for billboard in candidates:
+            if billboard.id in conflicting_ids:
+                results[billboard.id] = _campaign_result(
+                    billboard.id,
+                    CAMPAIGN_RESULT_CONFLICT,
+                    'Selected dates overlap an existing booking or hold.',
+                    409,
+                )
+        candidates = [b for b in candidates if b.id not in conflicting_ids]
+        if not candidates:
+            break
+
+        bookings = [
+            _new_pending_booking(billboard, advertiser, start_date, end_date, message)
+            for billboard in candidates
+        ]
+        try:
+            with transaction.atomic():
+                created = Booking.objects.bulk_create(bookings)
+            break
+        except IntegrityError as exc:
+            # A concurrent request won a date range between the check and insert; re-check.
+            if not is_overlap_violation(exc):
+                raise
+    else:
+        raise BookingError('Could not reserve dates; please retry.', 409)
+
+    if created:
+        Payment.objects.bulk_create([_new_payment(booking) for booking in created])
+
+    for booking in created:
+        results[booking.billboard_id] = _campaign_result(
+            booking.billboard_id,
+            CAMPAIGN_RESULT_CREATED,
+            'Booking request created.',
+            201,
+            booking,
+        )
+        bump_calendar_version(booking.billboard_id)
+    refresh_owner_booking_counts({booking.media_owner_id for booking in created})
+
+    _notify_owners_campaign_request(created, advertiser, start_date, end_date)
+    return created, [results[billboard_id] for billboard_id in billboard_ids]
+
+
 @transaction.atomic
 def accept_booking(owner, booking_id, owner_note=''):
     booking = (
@@ -203,6 +413,8 @@ def accept_booking(owner, booking_id, owner_note=''):
         raise BookingError('Only the media owner can accept this booking.', 403)
     if booking.status != Booking.STATUS_PENDING:
         raise BookingError(f'Cannot accept a booking in status "{booking.status}".', 400)
+    if booking.effective_status != Booking.STATUS_PENDING:
+        raise BookingError('This booking request has expired.', 400)
 
     if find_overlapping_bookings(
         booking.billboard_id,
@@ -215,7 +427,15 @@ def accept_booking(owner, booking_id, owner_note=''):
     booking.status = Booking.STATUS_ACCEPTED
     booking.owner_note = (owner_note or '').strip()
     booking.expires_at = None
-    booking.save(update_fields=['status', 'owner_note', 'expires_at', 'updated_at'])
+    try:
+        with transaction.atomic():
+            booking.save(update_fields=['status', 'owner_note', 'expires_at', 'updated_at'])
+    except IntegrityError as exc:
+        if not is_overlap_violation(exc):
+            raise
+        raise BookingError('Dates are no longer available.', 409) from exc
+    bump_calendar_version(booking.billboard_id)
+    refresh_owner_booking_counts({booking.media_owner_id})
 
     content_type = resolve_content_type(booking.billboard)
     content, _ = BookingContent.objects.get_or_create(
@@ -245,6 +465,8 @@ def reject_booking(owner, booking_id, reason=''):
     booking.rejection_reason = (reason or '').strip() or 'Rejected by media owner'
     booking.expires_at = None
     booking.save(update_fields=['status', 'rejection_reason', 'expires_at', 'updated_at'])
+    bump_calendar_version(booking.billboard_id)
+    refresh_owner_booking_counts({booking.media_owner_id})
     _notify_advertiser_rejected(booking)
     return booking
 
@@ -270,6 +492,8 @@ def cancel_booking(user, booking_id):
     booking.status = Booking.STATUS_CANCELLED
     booking.expires_at = None
     booking.save(update_fields=['status', 'expires_at', 'updated_at'])
+    bump_calendar_version(booking.billboard_id)
+    refresh_owner_booking_counts({booking.media_owner_id})
     return booking
 
 
@@ -302,7 +526,11 @@ def submit_content(advertiser, booking_id, *, data, media_file=None):
     if content.content_type == BookingContent.CONTENT_DIGITAL:
         video_url = (data.get('video_url') or '').strip()
         if media_file:
-            content.media_file = media_file
+            # Content-addressed: the row owns one reference; the replaced creative's is dropped.
+            replaced = content.media_file.name if content.media_file else None
+            content.media_file.name = store_blob(media_file, name_hint=media_file.name)
+            if replaced:
+                release_blobs([replaced])
         if video_url:
             content.video_url = video_url
         if not content.media_file and not content.video_url:
@@ -364,6 +592,8 @@ def approve_content(owner, booking_id, *, install_confirmed=False):
     else:
         booking.status = Booking.STATUS_COMPLETED
     booking.save(update_fields=['status', 'updated_at'])
+    bump_calendar_version(booking.billboard_id)
+    refresh_owner_booking_counts({booking.media_owner_id})
     _notify_booking_confirmed(booking)
     return booking, content
 
@@ -393,38 +623,85 @@ def reject_content(owner, booking_id, feedback=''):
     return content
 
 
+def effective_status_q(status_value):
+    """
+    Filter for Booking.effective_status == status_value, so list filters agree
+    with what the serializer shows before the lifecycle sweep has run.
+    """
+    today = timezone.localdate()
+    now = timezone.now()
+    running = (Booking.STATUS_CONFIRMED, Booking.STATUS_LIVE)
+    expired_pending = Q(
+        status=Booking.STATUS_PENDING,
+        expires_at__isnull=False,
+        expires_at__lt=now,
+    )
+
+    if status_value == Booking.STATUS_PENDING:
+        return Q(status=Booking.STATUS_PENDING) & ~expired_pending
+    if status_value == Booking.STATUS_CANCELLED:
+        return Q(status=Booking.STATUS_CANCELLED) | expired_pending
+    if status_value == Booking.STATUS_CONFIRMED:
+        return Q(status=Booking.STATUS_CONFIRMED, start_date__gt=today)
+    if status_value == Booking.STATUS_LIVE:
+        return Q(status__in=running, start_date__lte=today, end_date__gte=today)
+    if status_value == Booking.STATUS_COMPLETED:
+        return Q(status=Booking.STATUS_COMPLETED) | Q(status__in=running, end_date__lt=today)
+    return Q(status=status_value)
+
+
 def maybe_advance_live_and_completed():
-    """Cron-friendly: confirmed→live, live→completed, expire pending."""
+    """
+    Persist lifecycle transitions: confirmed→live, live→completed, expire pending.
+
+    Run by the Celery beat task `bookings.tasks.advance_booking_lifecycle_task`
+    (each UPDATE is served by a partial index on Booking); reads use
+    Booking.effective_status and never write.
+    """
     today = timezone.localdate()
     now = timezone.now()
 
-    Booking.objects.filter(
-        status=Booking.STATUS_CONFIRMED,
-        start_date__lte=today,
-        end_date__gte=today,
-    ).update(status=Booking.STATUS_LIVE, updated_at=now)
+    sweeps = (
+        (
+            Booking.objects.filter(
+                status=Booking.STATUS_CONFIRMED,
+                start_date__lte=today,
+                end_date__gte=today,
+            ),
+            Booking.STATUS_LIVE,
+        ),
+        (
+            Booking.objects.filter(
+                status__in=(Booking.STATUS_CONFIRMED, Booking.STATUS_LIVE),
+                end_date__lt=today,
+            ),
+            Booking.STATUS_COMPLETED,
+        ),
+        (
+            Booking.objects.filter(
+                status=Booking.STATUS_PENDING,
+                expires_at__isnull=False,
+                expires_at__lt=now,
+            ),
+            Booking.STATUS_CANCELLED,
+        ),
+    )
 
-    Booking.objects.filter(
-        status__in=(Booking.STATUS_CONFIRMED, Booking.STATUS_LIVE),
-        end_date__lt=today,
-    ).update(status=Booking.STATUS_COMPLETED, updated_at=now)
+    touched_billboard_ids = set()
+    touched_owner_ids = set()
+    for qs, new_status in sweeps:
+        for billboard_id, owner_id in qs.values_list('billboard_id', 'media_owner_id').distinct():
+            touched_billboard_ids.add(billboard_id)
+            touched_owner_ids.add(owner_id)
+        qs.update(status=new_status, updated_at=now)
 
-    Booking.objects.filter(
-        status=Booking.STATUS_PENDING,
-        expires_at__isnull=False,
-        expires_at__lt=now,
-    ).update(status=Booking.STATUS_CANCELLED, updated_at=now)
+    for billboard_id in touched_billboard_ids:
+        bump_calendar_version(billboard_id)
+    refresh_owner_booking_counts(touched_owner_ids)
 
 
-def _notify(user, ntype, title, body, booking):
-    """Queue inbox/push after commit so a notify failure cannot roll back the booking."""
-    user_id = getattr(user, 'id', None)
-    booking_id = booking.id
-    billboard_id = booking.billboard_id
-    status_value = booking.status
-    start_date = booking.start_date.isoformat()
-    end_date = booking.end_date.isoformat()
-    type_value = ntype
+def _queue_inbox(user_id, ntype, title, body, data, booking_id):
+    """Create the inbox/push after commit so a notify failure cannot roll back the booking."""
 
     def _send():
         try:
@@ -436,16 +713,10 @@ def _notify(user, ntype, title, body, booking):
                 return
             create_inbox_notification(
                 user=recipient,
-                notification_type=type_value,
+                notification_type=ntype,
                 title=title,
                 body=body,
-                data={
-                    'booking_id': booking_id,
-                    'billboard_id': billboard_id,
-                    'status': status_value,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                },
+                data=data,
                 related_object_type='booking',
                 related_object_id=booking_id,
             )
@@ -455,6 +726,24 @@ def _notify(user, ntype, title, body, booking):
     transaction.on_commit(_send)
 
 
+def _notify(user, ntype, title, body, booking):
+    """Queue one booking's inbox/push for `user` (after commit)."""
+    _queue_inbox(
+        getattr(user, 'id', None),
+        ntype,
+        title,
+        body,
+        {
+            'booking_id': booking.id,
+            'billboard_id': booking.billboard_id,
+            'status': booking.status,
+            'start_date': booking.start_date.isoformat(),
+            'end_date': booking.end_date.isoformat(),
+        },
+        booking.id,
+    )
+
+
 def _notify_owner_new_request(booking):
     from notifications.models import NotificationType
 
@@ -468,6 +757,46 @@ def _notify_owner_new_request(booking):
     )
 
 
+def _notify_owners_campaign_request(bookings, advertiser, start_date, end_date):
+    """One inbox/push per media owner for a multi-billboard request (after commit)."""
+    from notifications.models import NotificationType
+
+    by_owner = {}
+    for booking in bookings:
+        by_owner.setdefault(booking.media_owner_id, []).append(booking)
+
+    requester = advertiser.full_name or advertiser.email
+    type_value = NotificationType.BOOKING_REQUESTED
+    start_iso = start_date.isoformat()
+    end_iso = end_date.isoformat()
+
+    for owner_id, owner_bookings in by_owner.items():
+        count = len(owner_bookings)
+        booking_ids = [b.id for b in owner_bookings]
+        billboard_ids = [b.billboard_id for b in owner_bookings]
+        title = 'New booking request' if count == 1 else f'{count} new booking requests'
+        body = (
+            f'{requester} requested {count} of your billboard{"s" if count != 1 else ""} '
+            f'for {start_date} → {end_date}.'
+        )
+
+        _queue_inbox(
+            owner_id,
+            type_value,
+            title,
+            body,
+            {
+                'booking_id': booking_ids[0],
+                'booking_ids': booking_ids,
+                'billboard_ids': billboard_ids,
+                'status': Booking.STATUS_PENDING,
+                'start_date': start_iso,
+                'end_date': end_iso,
+            },
+            booking_ids[0],
+        )
+
+
 def _notify_advertiser_accepted(booking):
     from notifications.models import NotificationType
 
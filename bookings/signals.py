@@ -0,0 +1,13 @@
+"""Release the media_store reference held by a booking creative when it is deleted."""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from billboards.media_store import release_blobs
+
+from .models import BookingContent
+
+
+@receiver(post_delete, sender=BookingContent)
+def release_creative_blob(sender, instance, **kwargs):
+    if instance.media_file:
+        release_blobs([instance.media_file.name])
@@ -0,0 +1,14 @@
+import logging
+
+from celery import shared_task
+
+from .services import maybe_advance_live_and_completed
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def advance_booking_lifecycle_task():
+    """Beat-scheduled: persist confirmed→live→completed and expire stale pending holds."""
+    maybe_advance_live_and_completed()
+    logger.info('advance_booking_lifecycle_task done')
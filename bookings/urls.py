@@ -2,17 +2,21 @@ from django.urls import path
 
 from .views import (
     BookingAcceptView,
+    BookingCampaignCreateView,
     BookingCancelView,
     BookingContentApproveView,
     BookingContentRejectView,
     BookingContentSubmitView,
     BookingDetailView,
+    BookingExportView,
     BookingListCreateView,
     BookingRejectView,
 )
 
 urlpatterns = [
     path('', BookingListCreateView.as_view(), name='booking-list-create'),
+    path('campaign/', BookingCampaignCreateView.as_view(), name='booking-campaign-create'),
+    path('export/', BookingExportView.as_view(), name='booking-export'),
     path('<int:booking_id>/', BookingDetailView.as_view(), name='booking-detail'),
     path('<int:booking_id>/accept/', BookingAcceptView.as_view(), name='booking-accept'),
     path('<int:booking_id>/reject/', BookingRejectView.as_view(), name='booking-reject'),
@@ -4,14 +4,17 @@ from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from billboards.availability_utils import parse_date_param
 from billboards.models import Billboard
+from core.exports import filter_created_range, parse_export_params, streaming_export
 from core.pagination import CustomPagination
 
 from .models import Booking
 from .serializers import (
     BookingAcceptSerializer,
+    BookingCampaignCreateSerializer,
     BookingCreateSerializer,
     BookingRejectSerializer,
     BookingSerializer,
@@ -22,11 +25,12 @@ from .services import (
     BookingError,
     accept_booking,
     approve_content,
-    build_calendar_busy,
     cancel_booking,
     content_capabilities,
     create_booking_request,
-    maybe_advance_live_and_completed,
+    create_campaign_booking_requests,
+    effective_status_q,
+    get_calendar_busy_cached,
     reject_booking,
     reject_content,
     submit_content,
@@ -41,7 +45,10 @@ def _err(exc: BookingError):
 
 
 class BillboardCalendarView(APIView):
-    """GET /api/billboards/{id}/calendar/?from=&to= — busy ranges (guest OK)."""
+    """
+    GET /api/billboards/{id}/calendar/?from=&to= — busy ranges (guest OK).
+    Busy ranges are cached per billboard + window; see get_calendar_busy_cached().
+    """
 
     permission_classes = [permissions.AllowAny]
 
@@ -62,7 +69,7 @@ class BillboardCalendarView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        busy = build_calendar_busy(billboard, from_date=from_date, to_date=to_date)
+        busy = get_calendar_busy_cached(billboard, from_date=from_date, to_date=to_date)
         payload = {
             'status_code': 200,
             'message': 'Calendar retrieved successfully',
@@ -84,7 +91,6 @@ class BookingListCreateView(APIView):
     pagination_class = CustomPagination
 
     def get(self, request):
-        maybe_advance_live_and_completed()
         user = request.user
         role = (request.query_params.get('role') or '').strip().lower()
         status_filter = (request.query_params.get('status') or '').strip().lower()
@@ -104,7 +110,7 @@ class BookingListCreateView(APIView):
             qs = qs.filter(Q(advertiser=user) | Q(media_owner=user))
 
         if status_filter:
-            qs = qs.filter(status=status_filter)
+            qs = qs.filter(effective_status_q(status_filter))
 
         qs = qs.order_by('-created_at')
         paginator = self.pagination_class()
@@ -146,11 +152,94 @@ class BookingListCreateView(APIView):
         )
 
 
+_BOOKING_EXPORT_COLUMNS = [
+    ('id', 'id'), ('billboard_id', 'billboard_id'), ('billboard__city', 'billboard_city'),
+    ('advertiser_id', 'advertiser_id'), ('media_owner_id', 'media_owner_id'), ('status', 'status'),
+    ('start_date', 'start_date'), ('end_date', 'end_date'), ('total_price', 'total_price'),
+    ('currency', 'currency'), ('created_at', 'created_at'),
+]
+
+
+class BookingExportView(APIView):
+    """
+    GET /api/bookings/export/?output=csv|ndjson|geojson&from=&to= — streamed export of the
+    caller's bookings (as advertiser or media owner; staff get all), filtered on created_at.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            output, from_date, to_date = parse_export_params(request.query_params)
+        except ValueError as exc:
+            return Response(
+                {'status_code': 400, 'message': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        qs = Booking.objects.all()
+        if not user.is_staff:
+            qs = qs.filter(Q(advertiser=user) | Q(media_owner=user))
+        qs = filter_created_range(qs, from_date, to_date).order_by('id')
+        return streaming_export(
+            qs,
+            _BOOKING_EXPORT_COLUMNS,
+            output,
+            f'bookings_export_{timezone.now():%Y%m%d_%H%M%S}',
+            lat_key='billboard__latitude',
+            lng_key='billboard__longitude',
+        )
+
+
+class BookingCampaignCreateView(APIView):
+    """
+    POST one flight across many billboards (agencies).
+    Returns per-board results: created / conflict / error.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BookingCampaignCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            created, results = create_campaign_booking_requests(
+                advertiser=request.user,
+                billboard_ids=serializer.validated_data['billboard_ids'],
+                start_date=serializer.validated_data['start_date'],
+                end_date=serializer.validated_data['end_date'],
+                message=serializer.validated_data.get('message') or '',
+            )
+        except BookingError as exc:
+            return _err(exc)
+
+        if created:
+            status_code = status.HTTP_201_CREATED
+            message = f'{len(created)} of {len(results)} booking requests created'
+        elif any(r['status_code'] == 409 for r in results):
+            status_code = status.HTTP_409_CONFLICT
+            message = 'No booking requests created; selected dates are unavailable'
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
+            message = 'No booking requests created'
+
+        return Response(
+            {
+                'status_code': status_code,
+                'message': message,
+                'created_count': len(created),
+                'failed_count': len(results) - len(created),
+                'results': results,
+            },
+            status=status_code,
+        )
+
+
 class BookingDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, booking_id):
-        maybe_advance_live_and_completed()
         booking = (
             Booking.objects.select_related(
                 'billboard', 'billboard__media_type', 'advertiser', 'media_owner'
@@ -0,0 +1,42 @@
+# Denormalized per-participant unread counter, backfilled from the read cursors.
+
+from django.db import migrations, models
+
+
+def backfill_unread_counts(apps, schema_editor):
+    ChatMessage = apps.get_model('chat', 'ChatMessage')
+    ChatRoomParticipant = apps.get_model('chat', 'ChatRoomParticipant')
+    participants = ChatRoomParticipant.objects.select_related('last_read_message').order_by('id')
+    batch = []
+    for participant in participants.iterator(chunk_size=500):
+        unread = ChatMessage.objects.filter(room_id=participant.room_id).exclude(sender_id=participant.user_id)
+        if participant.last_read_message_id:
+            unread = unread.filter(created_at__gt=participant.last_read_message.created_at)
+        participant.unread_count = unread.count()
+        if participant.unread_count:
+            batch.append(participant)
+        if len(batch) >= 500:
+            ChatRoomParticipant.objects.bulk_update(batch, ['unread_count'])
+            batch.clear()
+    if batch:
+        ChatRoomParticipant.objects.bulk_update(batch, ['unread_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroomparticipant',
+            name='unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='chatroomparticipant',
+            index=models.Index(fields=['user', 'unread_count'], name='chat_chatro_user_id_bb9f4e_idx'),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Denormalized newest-message pointer and preview snippet on ChatRoom, backfilled per room.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+PREVIEW_LENGTH = 160
+ATTACHMENT_PREVIEW = 'Sent an attachment'
+
+
+def backfill_last_messages(apps, schema_editor):
+    ChatMessage = apps.get_model('chat', 'ChatMessage')
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    batch = []
+    for room in ChatRoom.objects.order_by('id').iterator(chunk_size=500):
+        message = ChatMessage.objects.filter(room_id=room.id).order_by('-created_at', '-id').first()
+        if message is None:
+            continue
+        room.last_message = message
+        room.last_message_preview = (message.body or '').strip()[:PREVIEW_LENGTH] or ATTACHMENT_PREVIEW
+        batch.append(room)
+        if len(batch) >= 500:
+            ChatRoom.objects.bulk_update(batch, ['last_message', 'last_message_preview'])
+            batch.clear()
+    if batch:
+        ChatRoom.objects.bulk_update(batch, ['last_message', 'last_message_preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_chatroomparticipant_unread_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.chatmessage'),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', max_length=160),
+        ),
+        migrations.RunPython(backfill_last_messages, migrations.RunPython.noop),
+    ]
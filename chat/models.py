@@ -23,6 +23,15 @@ class ChatRoom(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Newest message and its inbox snippet, set by chat.services.create_message.
+    last_message = models.ForeignKey(
+        'ChatMessage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    last_message_preview = models.CharField(max_length=160, blank=True, default='')
 
     class Meta:
         ordering = ['-updated_at']
@@ -55,7 +64,7 @@ class ChatRoom(models.Model):
 
 
 class ChatRoomParticipant(models.Model):
-    """Per-user read cursor and typing is socket-only (not stored)."""
+    """Per-user read cursor and unread counter; typing is socket-only (not stored)."""
 
     room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='participants')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chat_participations')
@@ -67,11 +76,16 @@ class ChatRoomParticipant(models.Model):
         related_name='+',
     )
     last_read_at = models.DateTimeField(null=True, blank=True)
+    # Messages from the other side after last_read_message; kept by chat.services on write.
+    unread_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['room', 'user'], name='uniq_chat_participant_room_user'),
         ]
+        indexes = [
+            models.Index(fields=['user', 'unread_count']),  # Unread badge summary
+        ]
 
     def __str__(self):
         return f'Participant user={self.user_id} room={self.room_id}'
@@ -4,18 +4,22 @@ from __future__ import annotations
 
 import math
 import os
-import uuid
 
 from django.conf import settings
-from django.core.files.storage import default_storage
 from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from billboards.images import SIZE_THUMB, primary_image_url
+from billboards.media_store import release_blobs, store_blob
 from billboards.models import Billboard
 
 from .models import ChatAttachment, ChatMessage, ChatRoom, ChatRoomParticipant
 
 MAX_ATTACHMENT_BYTES = 15 * 1024 * 1024  # 15 MB
+PREVIEW_LENGTH = 160
+ATTACHMENT_PREVIEW = 'Sent an attachment'
 ALLOWED_ATTACHMENT_TYPES = {
     'application/pdf',
     'application/msword',
@@ -41,7 +45,7 @@ class ChatError(Exception):
 def get_room_for_user(room_id, user):
     try:
         room = ChatRoom.objects.select_related(
-            'billboard', 'advertiser', 'media_owner'
+            'billboard', 'advertiser', 'media_owner', 'last_message__sender'
         ).get(pk=room_id)
     except ChatRoom.DoesNotExist as exc:
         raise ChatError('Chat room not found.', 404) from exc
@@ -122,11 +126,22 @@ def _clamp_page(page, page_size, default_size):
 
 
 def paginate_rooms(user, page=1, page_size=20):
-    """Paginated inbox for socket get_inbox / chat_sync."""
+    """
+    Paginated inbox for socket get_inbox / chat_sync. Rooms, billboard, users,
+    last message, its sender and the viewer's unread count come from one joined
+    query; the last messages' attachments from one prefetch.
+    """
     page, page_size = _clamp_page(page, page_size, 20)
     qs = (
         list_rooms_for_user(user)
-        .select_related('billboard', 'advertiser', 'media_owner')
+        .select_related('billboard', 'advertiser', 'media_owner', 'last_message__sender')
+        .prefetch_related('last_message__attachments')
+        .annotate(viewer_unread_count=Coalesce(
+            Subquery(
+                ChatRoomParticipant.objects.filter(room=OuterRef('pk'), user=user).values('unread_count')[:1]
+            ),
+            0,
+        ))
         .order_by('-updated_at')
     )
     total = qs.count()
@@ -190,17 +205,22 @@ def _absolute_file_url(file_url, request=None):
     return f'{base}{file_url}'
 
 
-def _save_uploaded_file(file_obj, request=None):
+def _validate_uploaded_file(file_obj):
+    """Content type of an acceptable attachment; raises ChatError otherwise."""
     content_type = getattr(file_obj, 'content_type', '') or 'application/octet-stream'
     if content_type not in ALLOWED_ATTACHMENT_TYPES:
         raise ChatError(f'File type not allowed: {content_type}', 400)
 
-    size = file_obj.size
-    if size > MAX_ATTACHMENT_BYTES:
+    if file_obj.size > MAX_ATTACHMENT_BYTES:
         raise ChatError('Attachment exceeds 15 MB limit.', 400)
+    return content_type
 
+
+def _save_uploaded_file(file_obj, content_type, request=None):
+    size = file_obj.size
     ext = os.path.splitext(file_obj.name or '')[1] or ''
-    path = default_storage.save(f'chat_attachments/{uuid.uuid4().hex}{ext}', file_obj)
+    # Content-addressed: the attachment row owns this reference (released in chat.signals).
+    path = store_blob(file_obj, name_hint=ext)
     media_path = f'{settings.MEDIA_URL.rstrip("/")}/{path}'
     if not media_path.startswith('/'):
         media_path = f'/{media_path}'
@@ -208,6 +228,11 @@ def _save_uploaded_file(file_obj, request=None):
     return path, url, file_obj.name or 'file', content_type, size
 
 
+def message_preview(body):
+    """Inbox / notification snippet for a message body."""
+    return (body or '').strip()[:PREVIEW_LENGTH] or ATTACHMENT_PREVIEW
+
+
 def create_message(room, sender, body='', files=None, request=None):
     files = files or []
     body = (body or '').strip()
@@ -222,30 +247,43 @@ def create_message(room, sender, body='', files=None, request=None):
     else:
         message_type = ChatMessage.MESSAGE_TYPE_TEXT
 
-    with transaction.atomic():
-        message = ChatMessage.objects.create(
-            room=room,
-            sender=sender,
-            body=body,
-            message_type=message_type,
-            status=ChatMessage.STATUS_SENT,
-        )
-        attachment_rows = []
-        for file_obj in files:
-            stored_path, url, original_name, content_type, size = _save_uploaded_file(
-                file_obj, request=request
+    # Every file is checked before any is stored, so a rejected upload leaves nothing on disk.
+    content_types = [_validate_uploaded_file(file_obj) for file_obj in files]
+    saved = []
+    try:
+        for file_obj, content_type in zip(files, content_types):
+            saved.append(_save_uploaded_file(file_obj, content_type, request=request))
+
+        with transaction.atomic():
+            message = ChatMessage.objects.create(
+                room=room,
+                sender=sender,
+                body=body,
+                message_type=message_type,
+                status=ChatMessage.STATUS_SENT,
             )
-            att = ChatAttachment.objects.create(
-                message=message,
-                file=stored_path,
-                original_name=original_name,
-                content_type=content_type,
-                file_size=size,
+            attachment_rows = []
+            for stored_path, url, original_name, content_type, size in saved:
+                att = ChatAttachment.objects.create(
+                    message=message,
+                    file=stored_path,
+                    original_name=original_name,
+                    content_type=content_type,
+                    file_size=size,
+                )
+                attachment_rows.append((att, url))
+
+            room.updated_at = timezone.now()
+            room.last_message = message
+            room.last_message_preview = message_preview(body)
+            room.save(update_fields=['updated_at', 'last_message', 'last_message_preview'])
+            ChatRoomParticipant.objects.filter(room=room).exclude(user=sender).update(
+                unread_count=F('unread_count') + 1
             )
-            attachment_rows.append((att, url))
-
-        room.updated_at = timezone.now()
-        room.save(update_fields=['updated_at'])
+    except Exception:
+        # The attachment rows never committed; drop the references taken by store_blob.
+        release_blobs([stored_path for stored_path, *_ in saved])
+        raise
 
     return message, attachment_rows
 
@@ -259,11 +297,7 @@ def notify_recipient_of_chat_message(room, sender, message):
     from notifications.models import NotificationType
     from notifications.inbox_service import create_inbox_notification
 
-    body = (message.body or '').strip()
-    if not body:
-        body = 'Sent an attachment'
-    else:
-        body = body[:160]
+    body = message_preview(message.body)
 
     sender_name = (getattr(sender, 'full_name', None) or '').strip() or getattr(sender, 'email', 'Someone')
     return create_inbox_notification(
@@ -300,10 +334,19 @@ def mark_messages_seen(room, user, up_to_message_id):
     except ChatMessage.DoesNotExist as exc:
         raise ChatError('Message not found in this room.', 404) from exc
 
-    participant, _ = ChatRoomParticipant.objects.get_or_create(room=room, user=user)
-    participant.last_read_message = last_message
-    participant.last_read_at = timezone.now()
-    participant.save(update_fields=['last_read_message', 'last_read_at'])
+    ChatRoomParticipant.objects.get_or_create(room=room, user=user)
+    with transaction.atomic():
+        # Row lock: a concurrent create_message's unread_count + 1 lands after this recount, not under it.
+        participant = ChatRoomParticipant.objects.select_for_update().get(room=room, user=user)
+        participant.last_read_message = last_message
+        participant.last_read_at = timezone.now()
+        # Usually 0; non-zero when the client marks an older message than the newest as seen.
+        participant.unread_count = (
+            ChatMessage.objects.filter(room=room, created_at__gt=last_message.created_at)
+            .exclude(sender=user)
+            .count()
+        )
+        participant.save(update_fields=['last_read_message', 'last_read_at', 'unread_count'])
 
     # Mark incoming messages as seen (not own messages)
     ChatMessage.objects.filter(
@@ -343,44 +386,42 @@ def serialize_message(message, request=None):
 
 
 def get_room_unread_count(room, user):
-    """Count messages in room not sent by user and not yet read by user."""
-    unread_qs = ChatMessage.objects.filter(room=room).exclude(sender=user)
-    participant = ChatRoomParticipant.objects.filter(room=room, user=user).first()
-    if participant and participant.last_read_message_id:
-        unread_qs = unread_qs.filter(created_at__gt=participant.last_read_message.created_at)
-    return unread_qs.count()
+    """Messages in room not sent by user and not yet read by user (ChatRoomParticipant.unread_count)."""
+    count = (
+        ChatRoomParticipant.objects.filter(room=room, user=user)
+        .values_list('unread_count', flat=True)
+        .first()
+    )
+    return count or 0
 
 
 def get_unread_summary(user):
-    """Badge summary for advertiser and media owner inbox tabs."""
-    rooms = list_rooms_for_user(user).only('id')
-    by_room = []
-    total = 0
-    for room in rooms:
-        count = get_room_unread_count(room, user)
-        total += count
-        if count > 0:
-            by_room.append({'room_id': room.id, 'unread_count': count})
+    """Badge summary for advertiser and media owner inbox tabs (one indexed query)."""
+    by_room = [
+        {'room_id': room_id, 'unread_count': count}
+        for room_id, count in ChatRoomParticipant.objects.filter(
+            user=user,
+            unread_count__gt=0,
+            room__in=list_rooms_for_user(user),
+        ).order_by('-room__updated_at').values_list('room_id', 'unread_count')
+    ]
     return {
-        'total_unread': total,
+        'total_unread': sum(row['unread_count'] for row in by_room),
         'rooms_with_unread': len(by_room),
         'rooms': by_room,
     }
 
 
 def serialize_room(room, user, request=None):
+    """Inbox row; uses paginate_rooms' joins and `viewer_unread_count` annotation when present."""
     other = room.other_user(user)
-    last_message = (
-        ChatMessage.objects.filter(room=room)
-        .select_related('sender')
-        .prefetch_related('attachments')
-        .order_by('-created_at')
-        .first()
-    )
-    unread_count = get_room_unread_count(room, user)
+    last_message = room.last_message
+    unread_count = getattr(room, 'viewer_unread_count', None)
+    if unread_count is None:
+        unread_count = get_room_unread_count(room, user)
 
     billboard = room.billboard
-    image = (billboard.images or [None])[0] if billboard.images else None
+    image = primary_image_url(billboard, SIZE_THUMB, request)
 
     return {
         'id': room.id,
@@ -401,6 +442,7 @@ def serialize_room(room, user, request=None):
             'user_type': other.user_type if other else None,
         },
         'last_message': serialize_message(last_message, request) if last_message else None,
+        'last_message_preview': room.last_message_preview,
         'unread_count': unread_count,
         'created_at': room.created_at.isoformat(),
         'updated_at': room.updated_at.isoformat(),
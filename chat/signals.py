@@ -0,0 +1,12 @@
+"""Release the media_store reference held by a chat attachment when it is deleted."""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from billboards.media_store import release_blobs
+
+from .models import ChatAttachment
+
+
+@receiver(post_delete, sender=ChatAttachment)
+def release_attachment_blob(sender, instance, **kwargs):
+    release_blobs([instance.file.name])
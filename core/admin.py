@@ -6,6 +6,7 @@ from django.shortcuts import render
 from django.db.models import Count, Sum
 from django.utils import timezone
 from datetime import datetime, timedelta
+from billboards.images import SIZE_THUMB, primary_image_url
 from billboards.models import Billboard, Wishlist
 from users.models import User
 
@@ -62,7 +63,10 @@ class BillboardAdmin(admin.ModelAdmin):
     def image_preview(self, obj):
         """Display image preview"""
         if obj.images and len(obj.images) > 0:
-            return format_html('<img src="{}" style="max-width: 100px; max-height: 100px; border-radius: 8px;" />', obj.images[0])
+            return format_html(
+                '<img src="{}" style="max-width: 100px; max-height: 100px; border-radius: 8px;" />',
+                primary_image_url(obj, SIZE_THUMB),
+            )
         return "No image"
     image_preview.short_description = 'Image Preview'
     
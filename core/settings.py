@@ -246,6 +246,12 @@ os.makedirs(MEDIA_ROOT / 'chat_attachments', exist_ok=True)
 # False = new billboards stay pending until admin uses /api/billboards/pending/ + approval-status/.
 BYPASS_BILLBOARD_APPROVAL = True
 
+# Bulk import: hosts remote image URLs may come from (subdomains included).
+# Empty = any host that resolves to a public address; private/loopback/link-local are always refused.
+BILLBOARD_IMPORT_IMAGE_HOSTS = [
+    h.strip().lower() for h in os.environ.get('BILLBOARD_IMPORT_IMAGE_HOSTS', '').split(',') if h.strip()
+]
+
 # Celery (view/lead tracking + push notifications in background)
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://127.0.0.1:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
@@ -256,4 +262,54 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', '0') == '1'
 
+# View/lead tracking buffer (Redis list drained in bulk by beat; see billboards/tracking_buffer.py).
+# Disabled by default in eager mode, where no beat runs to drain it.
+TRACKING_REDIS_URL = os.environ.get('TRACKING_REDIS_URL', CELERY_BROKER_URL)
+TRACKING_BUFFER_ENABLED = os.environ.get(
+    'TRACKING_BUFFER_ENABLED', '0' if CELERY_TASK_ALWAYS_EAGER else '1'
+) == '1'
+
+# Booking calendar cache versions (bookings/services.py) must be shared by web and
+# Celery processes, so they live in Redis. Empty = process-local cache (eager mode,
+# where tasks run in the web process).
+CALENDAR_VERSION_REDIS_URL = os.environ.get(
+    'CALENDAR_VERSION_REDIS_URL', '' if CELERY_TASK_ALWAYS_EAGER else TRACKING_REDIS_URL
+)
+
+# Raw View/Lead rows live in monthly partitions (billboards/partitions.py). Retention is
+# opt-in: unique view/lead dedup (billboards/tracking_dedup.py) is lifetime and uses these
+# rows as its authority, so removing old partitions lets returning visitors count as new.
+# 'off' = keep all rows; 'detach' = detach partitions older than TRACKING_RETENTION_MONTHS
+# full months (kept as standalone tables for archiving); 'drop' = detach and drop them.
+TRACKING_PARTITION_RETENTION = os.environ.get('TRACKING_PARTITION_RETENTION', 'off').lower()
+TRACKING_RETENTION_MONTHS = int(os.environ.get('TRACKING_RETENTION_MONTHS', '12'))
+
+# Periodic jobs (run `celery -A core beat`, see deploy/reachtolet-celery-beat.service)
+CELERY_BEAT_SCHEDULE = {
+    'advance-booking-lifecycle': {
+        'task': 'bookings.tasks.advance_booking_lifecycle_task',
+        'schedule': 300.0,
+    },
+    'drain-tracking-buffer': {
+        'task': 'billboards.tasks.drain_tracking_buffer_task',
+        'schedule': 5.0,
+    },
+    'rollup-billboard-analytics': {
+        'task': 'billboards.tasks.rollup_billboard_analytics_task',
+        'schedule': 300.0,
+    },
+    'maintain-tracking-partitions': {
+        'task': 'billboards.tasks.maintain_tracking_partitions_task',
+        'schedule': 86400.0,
+    },
+    'refresh-similar-billboards': {
+        'task': 'billboards.tasks.refresh_similar_billboards_task',
+        'schedule': 60.0,
+    },
+    'fail-stale-import-jobs': {
+        'task': 'billboards.tasks.fail_stale_import_jobs_task',
+        'schedule': 600.0,
+    },
+}
+
 # Channels Configuration removed
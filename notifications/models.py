@@ -24,6 +24,7 @@ class NotificationType(models.TextChoices):
     BOOKING_CONTENT_SUBMITTED = 'booking_content_submitted', 'Booking Content Submitted'
     BOOKING_CONTENT_REJECTED = 'booking_content_rejected', 'Booking Content Rejected'
     BOOKING_CONFIRMED = 'booking_confirmed', 'Booking Confirmed'
+    SAVED_SEARCH_MATCH = 'saved_search_match', 'Saved Search Match'
 
 
 class UserNotification(models.Model):